@@ -0,0 +1,80 @@
+"""Measure per-run agent setup: a fresh ``strands.Agent`` vs. a pooled lease.
+
+Each iteration either builds a new agent for a role (with ``AGENT_POOL_SIZE=0``
+every lease misses) or leases a warm one, then runs one fake-model turn so
+the reset between uses is part of the measurement. Tavily tool calls go to
+the local stub server.
+
+    PYTHONPATH=. python benchmarks/agent_pool.py --runs 200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.fake_model import FakeModel
+from benchmarks.harness import PROFILES, configure_environment
+from benchmarks.stubs import StubServer
+from orchestrator.agents.models import set_model_factory
+from orchestrator.agents.perplexity_agent import perplexity_agent_pool
+from orchestrator.agents.pool import AgentPool
+from orchestrator.agents.tavily_agent import tavily_agent_pool
+from orchestrator.batch import percentile
+
+POOLS = {"perplexity": perplexity_agent_pool, "tavily": tavily_agent_pool}
+
+
+def _time(pool: AgentPool, runs: int) -> Dict[str, Any]:
+    setup: List[float] = []
+    for _ in range(runs):
+        begin = time.perf_counter()
+        with pool.lease([]) as agent:
+            setup.append((time.perf_counter() - begin) * 1000)
+            agent("Target domain: bench.example.com")
+    return {
+        "mean_setup_ms": round(sum(setup) / len(setup), 3),
+        "p50_setup_ms": round(percentile(setup, 50), 3),
+        "p95_setup_ms": round(percentile(setup, 95), 3),
+        **pool.stats(),
+    }
+
+
+def run_benchmark(role: str, runs: int) -> Dict[str, Any]:
+    # A fresh model factory gives each mode its own pool.
+    os.environ["AGENT_POOL_SIZE"] = "0"
+    set_model_factory(lambda name: FakeModel(name, turn_latency_ms=0))
+    cold = _time(POOLS[role](), runs)
+
+    os.environ["AGENT_POOL_SIZE"] = "1"
+    set_model_factory(lambda name: FakeModel(name, turn_latency_ms=0))
+    pool = POOLS[role]()
+    pool.warm(1)
+    warm = _time(pool, runs)
+    saved = cold["mean_setup_ms"] - warm["mean_setup_ms"]
+    return {"cold": cold, "pooled": warm, "saved_ms_per_run": round(saved, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--role", choices=sorted(POOLS), action="append")
+    args = parser.parse_args()
+
+    results = {}
+    # Agents stream model text to stdout; keep it out of the report.
+    with tempfile.TemporaryDirectory(prefix="orchestrator-bench-") as output_dir, StubServer(
+        PROFILES["fast"]
+    ) as stub, contextlib.redirect_stdout(io.StringIO()):
+        configure_environment(stub, output_dir)
+        for role in args.role or sorted(POOLS):
+            results[role] = run_benchmark(role, args.runs)
+    for role, result in results.items():
+        print(f"{role}: {result}")
+
+
+if __name__ == "__main__":
+    main()
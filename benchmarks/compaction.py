@@ -0,0 +1,105 @@
+"""Measure tool-result compaction: tokens sent to the agents and report parity.
+
+Runs the offline workflow against the stub providers twice per domain, with
+``TOOL_COMPACTION_ENABLED`` off and on, and compares the estimated tool-result
+tokens the agents received and the resulting report models. Volatile fields
+(timestamps, the raw verification extract) are ignored in the comparison. The
+``case_study_search`` tool, which the fake model does not call, is measured
+directly on one web-fallback query per domain.
+
+    PYTHONPATH=. python benchmarks/compaction.py --domains 5 --payload-kb 64
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+from dataclasses import replace
+from typing import Any, Dict
+
+from benchmarks.fake_model import FakeModel
+from benchmarks.harness import PROFILES, configure_environment
+from benchmarks.stubs import StubServer
+from orchestrator.agents.models import set_model_factory
+from orchestrator.blobs import json_default
+from orchestrator.tools.compaction import estimate_tokens
+from orchestrator.tools.strands_tools import case_study_search_tool
+from orchestrator.workflow import run_workflow
+
+VOLATILE_KEYS = {"report_date", "validation_timestamp", "raw_extract", "time_budget"}
+
+
+def _stable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _stable(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_stable(item) for item in value]
+    return value
+
+
+def _run(domain: str, compaction: bool) -> Dict[str, Any]:
+    os.environ["TOOL_COMPACTION_ENABLED"] = "true" if compaction else "false"
+    result = run_workflow({"target_domain": domain})
+    report = json.loads(json.dumps(result["context"].get("report_model"), default=json_default))
+    return {"report": _stable(report), "compaction": result["compaction"]}
+
+
+def _case_study_tokens(domain: str, compaction: bool) -> int:
+    os.environ["TOOL_COMPACTION_ENABLED"] = "true" if compaction else "false"
+    # The index is off so every call takes the web fallback being measured.
+    previous = os.environ.get("CASE_INDEX_ENABLED")
+    os.environ["CASE_INDEX_ENABLED"] = "false"
+    try:
+        result = case_study_search_tool(query=f"{domain} AWS case study data platform modernization")
+    finally:
+        if previous is None:
+            os.environ.pop("CASE_INDEX_ENABLED")
+        else:
+            os.environ["CASE_INDEX_ENABLED"] = previous
+    return estimate_tokens(json.dumps(result, default=str))
+
+
+def run_benchmark(domains: int) -> Dict[str, Any]:
+    totals = {"tokens_raw": 0, "tokens_sent": 0, "duplicates_dropped": 0}
+    case_study = {"tokens_raw": 0, "tokens_sent": 0}
+    mismatches = []
+    for index in range(domains):
+        domain = f"bench-{index:04d}.example.com"
+        baseline, compacted = _run(domain, False), _run(domain, True)
+        for key in totals:
+            totals[key] += compacted["compaction"][key]
+        case_study["tokens_raw"] += _case_study_tokens(domain, False)
+        case_study["tokens_sent"] += _case_study_tokens(domain, True)
+        if baseline["report"] != compacted["report"]:
+            mismatches.append(domain)
+    saved = totals["tokens_raw"] - totals["tokens_sent"]
+    return {
+        **totals,
+        "tokens_saved": saved,
+        "saved_fraction": round(saved / totals["tokens_raw"], 3) if totals["tokens_raw"] else 0.0,
+        "case_study_search": {**case_study, "tokens_saved": case_study["tokens_raw"] - case_study["tokens_sent"]},
+        "report_mismatches": mismatches,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--domains", type=int, default=5)
+    parser.add_argument("--payload-kb", type=float, default=64.0, help="Stub response size")
+    args = parser.parse_args()
+
+    set_model_factory(lambda role: FakeModel(role, turn_latency_ms=0))
+    profile = replace(PROFILES["fast"], payload_kb=args.payload_kb)
+    with tempfile.TemporaryDirectory(prefix="orchestrator-bench-") as output_dir, StubServer(profile) as stub:
+        configure_environment(stub, output_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_benchmark(args.domains)
+    print(json.dumps(result, indent=2))
+    if result["report_mismatches"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Offline Strands model that returns canned research reports.
+
+The first turn of an agent that has ``tavily_search`` available asks for one
+search, so benchmarks exercise the tool path and the HTTP stack; the next
+turn (or the only turn for tool-less agents) returns a JSON report with the
+keys the integration node validates. Each turn sleeps for a configurable
+latency to stand in for model time.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, List, Optional
+
+from strands.models.model import Model
+
+
+def _report(role: str, domain: str, padding: int) -> Dict[str, Any]:
+    metadata = {"target_domain": domain, "source": "fake-model"}
+    sources = [f"https://example.com/{role}/{index}" for index in range(5)]
+    if role == "tavily":
+        return {
+            "research_metadata": metadata,
+            "industry_classification": {"primary": "Software", "secondary": ["Analytics"]},
+            "aws_case_studies": [
+                {
+                    "company": f"Case study {index}",
+                    "url": f"https://aws.amazon.com/solutions/case-studies/example-{index}/",
+                    "business_outcomes": ["Reduced infrastructure cost by 30%"],
+                }
+                for index in range(3)
+            ],
+            "business_challenges": ["Scaling analytics workloads"],
+            "aws_recommendations": [{"priority": "High", "recommendation": "Adopt managed data services"}],
+            "sources": sources,
+            "notes": "x" * padding,
+        }
+    return {
+        "research_metadata": metadata,
+        "company_identity": {"name": domain, "description": "Benchmark company profile"},
+        "business_model": {"type": "B2B SaaS"},
+        "market_intelligence": {"competitors": ["Competitor A", "Competitor B"]},
+        "technology_footprint": {"cloud": ["AWS"]},
+        "leadership_team": [{"name": "Jane Doe", "title": "CEO"}],
+        "recent_developments": ["Series B funding"],
+        "sources": sources,
+        "notes": "x" * padding,
+    }
+
+
+def _has_tool_result(messages: List[Dict[str, Any]]) -> bool:
+    return any("toolResult" in block for message in messages for block in message.get("content", []))
+
+
+def _target_domain(messages: List[Dict[str, Any]]) -> str:
+    for block in messages[0].get("content", []) if messages else []:
+        for line in block.get("text", "").splitlines():
+            if line.startswith("Target domain:"):
+                return line.split(":", 1)[1].strip()
+    return "unknown"
+
+
+class FakeModel(Model):
+    def __init__(self, role: str, turn_latency_ms: float = 200.0, report_bytes: int = 2048) -> None:
+        self.role = role
+        self.config: Dict[str, Any] = {
+            "model_id": f"fake-{role}",
+            "turn_latency_ms": turn_latency_ms,
+            "report_bytes": report_bytes,
+        }
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.config
+
+    async def structured_output(
+        self, output_model: Any, prompt: Any, system_prompt: Optional[str] = None, **kwargs: Any
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        raise NotImplementedError("FakeModel does not support structured output")
+        yield {}
+
+    async def stream(
+        self,
+        messages: Any,
+        tool_specs: Optional[List[Dict[str, Any]]] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterable[Dict[str, Any]]:
+        await asyncio.sleep(self.config["turn_latency_ms"] / 1000)
+        domain = _target_domain(messages)
+        tool_names = {spec["name"] for spec in tool_specs or []}
+
+        yield {"messageStart": {"role": "assistant"}}
+        if "tavily_search" in tool_names and not _has_tool_result(messages):
+            query = json.dumps({"query": f"{domain} AWS case study", "max_results": 5})
+            yield {
+                "contentBlockStart": {
+                    "start": {"toolUse": {"toolUseId": f"fake-{len(messages)}", "name": "tavily_search"}}
+                }
+            }
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": query}}}}
+            yield {"contentBlockStop": {}}
+            stop_reason, output = "tool_use", len(query)
+        else:
+            text = json.dumps(_report(self.role, domain, self.config["report_bytes"]))
+            yield {"contentBlockStart": {"start": {}}}
+            yield {"contentBlockDelta": {"delta": {"text": text}}}
+            yield {"contentBlockStop": {}}
+            stop_reason, output = "end_turn", len(text)
+
+        yield {"messageStop": {"stopReason": stop_reason}}
+        yield {
+            "metadata": {
+                "usage": {"inputTokens": 1000, "outputTokens": output // 4, "totalTokens": 1000 + output // 4},
+                "metrics": {"latencyMs": int(self.config["turn_latency_ms"])},
+            }
+        }
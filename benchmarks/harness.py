@@ -0,0 +1,250 @@
+"""Offline end-to-end benchmark for the research workflow.
+
+Points the Tavily and Perplexity clients at local stub servers, swaps the
+agents' models for ``FakeModel`` and drives the real workflow, either as
+sequential ``run_workflow`` calls, through the batch runner, or both. Reports
+latency percentiles, throughput, peak RSS and per-node time, and can save
+the result as a named baseline or compare against one.
+
+    PYTHONPATH=. python benchmarks/harness.py --domains 20 --profile realistic
+    PYTHONPATH=. python benchmarks/harness.py --save-baseline realistic
+    PYTHONPATH=. python benchmarks/harness.py --compare realistic
+
+Settings already present in the environment (rate limits, cache, retries)
+are respected, so the same harness can measure a tuned configuration.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fake_model import FakeModel
+from benchmarks.stubs import StubProfile, StubServer, describe
+from orchestrator.agents.models import set_model_factory
+from orchestrator.agents.pool import agent_pool_stats
+from orchestrator.batch import percentile, run_batch
+from orchestrator.workflow import run_workflow
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+PROFILES = {
+    "fast": StubProfile(latency_ms=5, jitter_ms=2, payload_kb=4, error_rate=0.0),
+    "realistic": StubProfile(latency_ms=400, jitter_ms=200, payload_kb=32, error_rate=0.02),
+    "flaky": StubProfile(latency_ms=150, jitter_ms=100, payload_kb=16, error_rate=0.2),
+    "heavy": StubProfile(latency_ms=200, jitter_ms=50, payload_kb=256, error_rate=0.0),
+}
+
+# (metric, True when larger is better) compared against baselines.
+COMPARED_METRICS = [
+    ("latency_p50_ms", False),
+    ("latency_p95_ms", False),
+    ("runs_per_minute", True),
+]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _payloads(count: int) -> List[Dict[str, Any]]:
+    return [{"target_domain": f"bench-{index:04d}.example.com"} for index in range(count)]
+
+
+def _summarize(
+    latencies_ms: List[float],
+    failures: int,
+    elapsed: float,
+    timings: List[List[Dict[str, Any]]],
+    errors: Optional[List[str]] = None,
+):
+    per_node: Dict[str, List[float]] = {}
+    for run in timings:
+        for row in run:
+            per_node.setdefault(row["node"], []).append(row["duration_ms"])
+    return {
+        "runs": len(latencies_ms),
+        "failures": failures,
+        # Distinct error messages, so a failing benchmark shows why.
+        "errors": sorted(set(errors or [])),
+        "elapsed_seconds": round(elapsed, 3),
+        "runs_per_minute": round(len(latencies_ms) / elapsed * 60, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(latencies_ms, 50), 1),
+        "latency_p90_ms": round(percentile(latencies_ms, 90), 1),
+        "latency_p95_ms": round(percentile(latencies_ms, 95), 1),
+        "latency_p99_ms": round(percentile(latencies_ms, 99), 1),
+        "nodes": {
+            node: {
+                "mean_ms": round(sum(values) / len(values), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+            }
+            for node, values in per_node.items()
+        },
+    }
+
+
+def bench_single(count: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    timings: List[List[Dict[str, Any]]] = []
+    errors: List[str] = []
+    failures = 0
+    started = time.perf_counter()
+    for payload in _payloads(count):
+        run_started = time.perf_counter()
+        try:
+            result = run_workflow(payload)
+            timings.append(result["timings"])
+            failures += result["status"].value != "completed"
+        except Exception as exc:
+            failures += 1
+            errors.append(f"{type(exc).__name__}: {exc}")
+        latencies.append((time.perf_counter() - run_started) * 1000)
+    return _summarize(latencies, failures, time.perf_counter() - started, timings, errors)
+
+
+def bench_batch(count: int, concurrency: int) -> Dict[str, Any]:
+    source = io.StringIO("".join(json.dumps(payload) + "\n" for payload in _payloads(count)))
+    sink = io.StringIO()
+    started = time.perf_counter()
+    asyncio.run(run_batch(source, sink, concurrency=concurrency))
+    elapsed = time.perf_counter() - started
+
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    latencies = [record["elapsed_seconds"] * 1000 for record in records]
+    failures = sum(record["status"] != "completed" for record in records)
+    timings = [record["result"]["timings"] for record in records if "result" in record]
+    errors = [record["error"] for record in records if "error" in record]
+    return {"concurrency": concurrency, **_summarize(latencies, failures, elapsed, timings, errors)}
+
+
+def configure_environment(stub: StubServer, output_dir: str) -> None:
+    os.environ["TAVILY_BASE_URL"] = stub.url
+    os.environ["PERPLEXITY_BASE_URL"] = stub.url
+    os.environ["REPORT_OUTPUT_DIR"] = output_dir
+    # All on-disk state lives in the run's temporary directory, whatever the
+    # caller's environment says, so nothing learned carries over between runs.
+    state_paths = {
+        "TAVILY_CACHE_PATH": "tavily.sqlite3",
+        "CASE_INDEX_PATH": "case_studies.sqlite3",
+        "SOURCE_REGISTRY_PATH": "sources.sqlite3",
+        "MEMO_DIR": "memo",
+        "TRACE_DIR": "traces",
+        "CHECKPOINT_DIR": "checkpoints",
+        "BLOB_DIR": "blobs",
+        "WORKER_QUEUE_PATH": "jobs.sqlite3",
+        "WORKER_RESULT_DIR": "results",
+    }
+    for name, path in state_paths.items():
+        os.environ[name] = os.path.join(output_dir, path)
+    defaults = {
+        "TAVILY_API_KEY": "bench",
+        "PERPLEXITY_API_KEY": "bench",
+        "TAVILY_CACHE_ENABLED": "false",
+        "TAVILY_RATE_LIMIT": "0",
+        "PERPLEXITY_RATE_LIMIT": "0",
+        "HTTP_BACKOFF_BASE": "0.05",
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe metrics that regressed by more than ``tolerance`` (a fraction)."""
+
+    regressions = []
+    for mode in ("single", "batch"):
+        if mode not in current or mode not in baseline:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            before, after = baseline[mode].get(metric), current[mode].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            status = "REGRESSED" if worse > tolerance else "ok"
+            line = f"{mode}.{metric}: {before} -> {after} ({change:+.1%}) {status}"
+            print(line, file=sys.stderr)
+            if worse > tolerance:
+                regressions.append(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline workflow benchmark against stub providers.")
+    parser.add_argument("--domains", type=int, default=20, help="Workflow runs per mode")
+    parser.add_argument("--mode", choices=["single", "batch", "all"], default="all")
+    parser.add_argument("--concurrency", type=int, default=4, help="Batch concurrency")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--latency-ms", type=float, help="Override the profile's stub latency")
+    parser.add_argument("--payload-kb", type=float, help="Override the profile's response size")
+    parser.add_argument("--error-rate", type=float, help="Override the profile's error rate")
+    parser.add_argument("--model-latency-ms", type=float, default=50.0, help="Fake model time per turn")
+    parser.add_argument(
+        "--perplexity-mode", choices=["agent", "direct"], help="Run the Perplexity branch as an agent or one API call"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-baseline", metavar="NAME", help="Write results to baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed regression fraction")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    overrides = {"latency_ms": args.latency_ms, "payload_kb": args.payload_kb, "error_rate": args.error_rate}
+    profile = replace(profile, **{key: value for key, value in overrides.items() if value is not None})
+    random.seed(args.seed)
+    if args.perplexity_mode:
+        os.environ["PERPLEXITY_MODE"] = args.perplexity_mode
+
+    set_model_factory(lambda role: FakeModel(role, turn_latency_ms=args.model_latency_ms))
+    with tempfile.TemporaryDirectory(prefix="orchestrator-bench-") as output_dir, StubServer(
+        profile, seed=args.seed
+    ) as stub:
+        configure_environment(stub, output_dir)
+        # Agents stream model text to stdout; keep it out of the JSON report.
+        streamed = io.StringIO()
+        results: Dict[str, Any] = {
+            "profile": {"name": args.profile, **describe(profile)},
+            "domains": args.domains,
+            "model_latency_ms": args.model_latency_ms,
+            "perplexity_mode": os.environ.get("PERPLEXITY_MODE", "agent"),
+            "python": platform.python_version(),
+        }
+        with contextlib.redirect_stdout(streamed):
+            if args.mode in ("single", "all"):
+                results["single"] = bench_single(args.domains)
+            if args.mode in ("batch", "all"):
+                results["batch"] = bench_batch(args.domains, args.concurrency)
+        results["peak_rss_mb"] = _peak_rss_mb()
+        results["stub"] = stub.stats()
+        results["agent_pools"] = agent_pool_stats()
+
+    print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"baseline written to {path}", file=sys.stderr)
+
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Check that the Perplexity/Tavily fan-out overlaps on the graph event loop.
+
+Builds the same diamond as ``build_workflow`` (verification -> two research
+branches -> integration) out of blocking sleep functions, then compares the
+graph's wall-clock time with the sum of the branch durations.
+
+    PYTHONPATH=. python benchmarks/parallel_fanout.py --branch-seconds 1.0
+"""
+
+import argparse
+import time
+from typing import Any, Dict
+
+from strands.multiagent import GraphBuilder
+
+from orchestrator.context import WorkflowContext
+from orchestrator.graph_nodes import FunctionNode
+from orchestrator.workflow import all_dependencies_complete
+
+
+def _sleeper(name: str, seconds: float):
+    def run(task: Any, context: WorkflowContext) -> Dict[str, Any]:
+        started = time.perf_counter()
+        time.sleep(seconds)
+        context.set(name, {"started": started, "finished": time.perf_counter()})
+        return {name: "done"}
+
+    return run
+
+
+def run_benchmark(branch_seconds: float) -> Dict[str, Any]:
+    context = WorkflowContext()
+    builder = GraphBuilder()
+    builder.add_node(FunctionNode(_sleeper("domain_verification", 0.05), "domain_verification", context))
+    builder.add_node(FunctionNode(_sleeper("perplexity_handoff", branch_seconds), "perplexity_handoff", context))
+    builder.add_node(FunctionNode(_sleeper("tavily_handoff", branch_seconds), "tavily_handoff", context))
+    builder.add_node(FunctionNode(_sleeper("integration", 0.05), "integration", context))
+
+    builder.add_edge("domain_verification", "perplexity_handoff")
+    builder.add_edge("domain_verification", "tavily_handoff")
+    condition = all_dependencies_complete(["perplexity_handoff", "tavily_handoff"])
+    builder.add_edge("perplexity_handoff", "integration", condition=condition)
+    builder.add_edge("tavily_handoff", "integration", condition=condition)
+    builder.set_entry_point("domain_verification")
+
+    graph = builder.build()
+    started = time.perf_counter()
+    graph({"target_domain": "example.com"})
+    wall = time.perf_counter() - started
+
+    perplexity = context.get("perplexity_handoff")
+    tavily = context.get("tavily_handoff")
+    overlap = min(perplexity["finished"], tavily["finished"]) - max(perplexity["started"], tavily["started"])
+    return {
+        "wall_seconds": round(wall, 3),
+        "serial_branch_seconds": round(2 * branch_seconds, 3),
+        "branch_overlap_seconds": round(max(overlap, 0.0), 3),
+        "parallel": overlap > 0.5 * branch_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--branch-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    result = run_benchmark(args.branch_seconds)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    if not result["parallel"]:
+        raise SystemExit("research branches did not overlap")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure HTML report rendering: full string vs. streamed to a file handle.
+
+Builds a synthetic report model with every report section populated (sizes
+scale with ``--items``) and renders it repeatedly through the compiled
+template, both as one string and streamed chunk by chunk to ``os.devnull``.
+
+    PYTHONPATH=. python benchmarks/report_render.py --reports 500 --items 40
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+from orchestrator.batch import percentile
+from orchestrator.report import render_html_report, stream_html_report
+
+
+def synthetic_report(items: int) -> Dict[str, Any]:
+    return {
+        "report_metadata": {"validated_company_name": "Example <Corp>", "overall_confidence": "HIGH"},
+        "report_sections": {
+            "executive_summary": "Example Corp & partners " * items,
+            "company_profile": {"description": "A company that makes <things>. " * items},
+            "business_challenges_and_aws_opportunities": [
+                {"challenge": f"Challenge {i}", "aws_services": ["Amazon S3", "AWS Lambda"], "impact": "high"}
+                for i in range(items)
+            ],
+            "market_competitive_intelligence": {"competitors": [f"Competitor {i}" for i in range(items)]},
+            "technology_infrastructure": {"current_stack": [f"service-{i}" for i in range(items)]},
+            "leadership": [
+                {"name": f"Person {i}", "title": "VP", "profile": f"https://example.com/people/{i}"}
+                for i in range(items)
+            ],
+            "recent_developments": [f"Announcement {i} <b>bold</b>" for i in range(items)],
+            "aws_case_studies": [
+                {"company": f"Customer {i}", "url": f"https://aws.amazon.com/solutions/case-studies/{i}/",
+                 "business_outcomes": ["40% lower cost"]}
+                for i in range(items)
+            ],
+            "strategic_recommendations": [
+                {"priority": "HIGH", "recommendation": f"Migrate workload {i}"} for i in range(items)
+            ],
+            "methodology_confidence": {"sources_consulted": items, "notes": "Synthetic benchmark data"},
+            "sources": [f"https://example.com/source/{i}" for i in range(items)],
+        },
+    }
+
+
+def _time(render: Callable[[], Any], reports: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    started = time.perf_counter()
+    for _ in range(reports):
+        begin = time.perf_counter()
+        render()
+        samples.append((time.perf_counter() - begin) * 1_000_000)
+    elapsed = time.perf_counter() - started
+    return {
+        "mean_us": round(sum(samples) / len(samples), 1),
+        "p50_us": round(percentile(samples, 50), 1),
+        "p95_us": round(percentile(samples, 95), 1),
+        "reports_per_second": round(reports / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def run_benchmark(reports: int, items: int) -> Dict[str, Any]:
+    model = synthetic_report(items)
+    html_bytes = len(render_html_report(model).encode("utf-8"))
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        streamed = _time(lambda: stream_html_report(model, devnull), reports)
+    return {
+        "html_bytes": html_bytes,
+        "string": _time(lambda: render_html_report(model), reports),
+        "streamed": streamed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=500)
+    parser.add_argument("--items", type=int, default=40, help="Entries per list section")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.reports, args.items)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Local stand-ins for the Tavily and Perplexity HTTP APIs.
+
+One threaded server answers ``/search``, ``/extract`` and
+``/chat/completions`` with deterministic filler shaped like the real
+responses. A ``StubProfile`` sets per-request latency, response size and the
+share of requests that fail with a retryable status.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+WORDS = (
+    "cloud migration analytics platform customers revenue growth latency storage pipeline "
+    "serverless compute database modernization security compliance workload region scale"
+).split()
+
+
+@dataclass(frozen=True)
+class StubProfile:
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    payload_kb: float = 8.0
+    error_rate: float = 0.0
+    error_statuses: tuple = (429, 500, 503)
+
+
+def _filler(rng: random.Random, size_bytes: int) -> str:
+    words = []
+    length = 0
+    while length < size_bytes:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+class StubServer:
+    def __init__(self, profile: StubProfile, host: str = "127.0.0.1", port: int = 0, seed: int = 0) -> None:
+        self.profile = profile
+        self.seed = seed
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-api", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": dict(self.requests), "errors": dict(self.errors)}
+
+    def _count(self, path: str, failed: bool) -> None:
+        with self._lock:
+            self.requests[path] += 1
+            if failed:
+                self.errors[path] += 1
+
+    def _body(self, path: str, request: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        size = int(self.profile.payload_kb * 1024)
+        if path == "/search":
+            count = max(1, int(request.get("max_results", 5)))
+            return {
+                "query": request.get("query", ""),
+                "results": [
+                    {
+                        "title": f"Result {index} for {request.get('query', '')}",
+                        "url": f"https://example.com/{rng.randrange(1_000_000)}",
+                        "content": _filler(rng, size // count),
+                        "score": round(rng.random(), 3),
+                    }
+                    for index in range(count)
+                ],
+            }
+        if path == "/extract":
+            urls = request.get("urls") or [request.get("url", "")]
+            urls = urls if isinstance(urls, list) else [urls]
+            return {
+                "results": [{"url": url, "raw_content": _filler(rng, size // len(urls))} for url in urls],
+                "failed_results": [],
+            }
+        report: Dict[str, Any] = {"summary": _filler(rng, size)}
+        if request.get("response_format"):
+            # Structured requests get a report with the keys integration validates.
+            report.update(
+                research_metadata={"source": "stub"},
+                company_identity={"description": "Stub company profile"},
+                business_model={"type": "B2B SaaS"},
+            )
+        content = json.dumps(report)
+        return {
+            "id": f"stub-{rng.randrange(1_000_000)}",
+            "model": request.get("model", "sonar"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 200, "completion_tokens": size // 4, "total_tokens": 200 + size // 4},
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", "0"))
+                raw = self.rfile.read(length) if length else b"{}"
+                path = self.path.split("?", 1)[0]
+                if path not in ("/search", "/extract", "/chat/completions"):
+                    self._send(404, {"error": "not found"})
+                    return
+
+                # Seed from the request so identical calls get identical bodies.
+                rng = random.Random(f"{stub.seed}:{path}:{raw!r}")
+                profile = stub.profile
+                delay = max(0.0, profile.latency_ms + random.uniform(-profile.jitter_ms, profile.jitter_ms))
+                time.sleep(delay / 1000)
+
+                failed = random.random() < profile.error_rate
+                stub._count(path, failed)
+                if failed:
+                    status = random.choice(profile.error_statuses)
+                    self._send(status, {"error": "stub failure"}, {"Retry-After": "0"} if status == 429 else None)
+                    return
+                try:
+                    request = json.loads(raw or b"{}")
+                except ValueError:
+                    self._send(400, {"error": "invalid JSON"})
+                    return
+                self._send(200, stub._body(path, request, rng))
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return None
+
+        return Handler
+
+
+def describe(profile: StubProfile) -> Dict[str, Any]:
+    return {**asdict(profile), "error_statuses": list(profile.error_statuses)}
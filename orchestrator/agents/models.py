@@ -0,0 +1,30 @@
+"""Model selection for the research agents.
+
+Agents ask for their model by role. Without a registered factory that is the
+configured provider model (or the Strands default); ``set_model_factory``
+swaps in another model, e.g. an offline fake for benchmarks.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+ModelFactory = Callable[[str], Any]
+
+_factories: Dict[str, ModelFactory] = {}
+
+
+def set_model_factory(factory: Optional[ModelFactory], role: str = "*") -> None:
+    """Register a factory for ``role`` (``"*"`` for every role); ``None`` removes it."""
+
+    if factory is None:
+        _factories.pop(role, None)
+    else:
+        _factories[role] = factory
+
+
+def model_factory(role: str) -> Optional[ModelFactory]:
+    return _factories.get(role) or _factories.get("*")
+
+
+def agent_model(role: str, default: Any = None) -> Any:
+    factory = model_factory(role)
+    return factory(role) if factory is not None else default
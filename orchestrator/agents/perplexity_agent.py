@@ -1,24 +1,59 @@
-"""Perplexity Sonar agent wrapper."""
+"""Perplexity Sonar research, as a Strands agent or one direct API call.
+
+``PERPLEXITY_MODE=agent`` runs a ``strands.Agent`` with the Perplexity model.
+``direct`` sends the same system and user prompt as a single pooled chat
+completion with a JSON response format and validates the parsed report; with
+``PERPLEXITY_DIRECT_FALLBACK`` an unusable answer falls back to the agent.
+"""
 
 from typing import Any, Dict
 
 from strands import Agent
+from strands.hooks import HookProvider
 
+from orchestrator.agents.models import agent_model
+from orchestrator.agents.pool import AgentPool, agent_pool
+from orchestrator.budget import budget_hooks, remaining
 from orchestrator.config import load_config
+from orchestrator.schemas import validate_required_keys
+from orchestrator.speculation import speculation_hooks
+from orchestrator.tools.perplexity import perplexity_query
+from orchestrator.tracing import span, tracing_hooks
 from orchestrator.utils import extract_json_from_text, load_prompt
 
+SYSTEM_PROMPT_PATH = "prompts/PERPLEXITY_AGENT.md"
 
-def run_perplexity_agent(task: Dict[str, Any]) -> Dict[str, Any]:
-    config = load_config()
-    system_prompt = load_prompt("prompts/PERPLEXITY_AGENT.md")
+# Keys the integration node needs in a Perplexity report.
+PERPLEXITY_REQUIRED_KEYS = ["research_metadata", "company_identity", "business_model"]
 
-    agent = Agent(
-        name="perplexity_agent",
-        system_prompt=system_prompt,
-        model=config.perplexity_model,
-    )
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "schema": {
+            "type": "object",
+            "properties": {key: {"type": "object"} for key in PERPLEXITY_REQUIRED_KEYS},
+            "required": PERPLEXITY_REQUIRED_KEYS,
+        }
+    },
+}
+
+
+def perplexity_agent_pool() -> AgentPool:
+    model_id = load_config().perplexity_model
 
-    user_prompt = (
+    def build(hooks: HookProvider) -> Agent:
+        return Agent(
+            name="perplexity_agent",
+            system_prompt=load_prompt(SYSTEM_PROMPT_PATH),
+            model=agent_model("perplexity", model_id),
+            hooks=[hooks],
+        )
+
+    return agent_pool("perplexity", build, model_id)
+
+
+def _user_prompt(task: Dict[str, Any]) -> str:
+    return (
         "You are executing the Perplexity Sonar business intelligence research. "
         "Return ONLY valid JSON per the expected schema.\n\n"
         f"Target domain: {task.get('target_domain')}\n"
@@ -28,5 +63,50 @@ def run_perplexity_agent(task: Dict[str, Any]) -> Dict[str, Any]:
         f"Constraints: {task.get('constraints', [])}\n"
     )
 
-    result = agent(user_prompt)
-    return extract_json_from_text(str(result.message))
+
+def run_perplexity_agent(task: Dict[str, Any]) -> Dict[str, Any]:
+    with perplexity_agent_pool().lease(tracing_hooks() + budget_hooks() + speculation_hooks()) as agent:
+        result = agent(_user_prompt(task))
+    return extract_json_from_text(str(result))
+
+
+def run_perplexity_direct(task: Dict[str, Any]) -> Dict[str, Any]:
+    """One Sonar chat completion; the report carries ``error`` when it is unusable."""
+
+    config = load_config()
+    response = perplexity_query(
+        config,
+        load_prompt(SYSTEM_PROMPT_PATH),
+        _user_prompt(task),
+        max_tokens=config.perplexity_direct_max_tokens,
+        response_format=RESPONSE_FORMAT,
+        timeout=remaining(60.0),
+    )
+    if not response.get("ok"):
+        return {"error": response.get("error") or "Perplexity request failed"}
+
+    data = response.get("data") or {}
+    choices = data.get("choices") or [{}]
+    report = extract_json_from_text(choices[0].get("message", {}).get("content") or "")
+    if data.get("citations") and not report.get("sources"):
+        report["sources"] = list(data["citations"])
+    validation = validate_required_keys(report, PERPLEXITY_REQUIRED_KEYS)
+    if not validation.valid:
+        report["error"] = f"Missing keys: {', '.join(validation.missing_keys)}"
+    return report
+
+
+def run_perplexity_research(task: Dict[str, Any]) -> Dict[str, Any]:
+    """The Perplexity branch in the configured ``PERPLEXITY_MODE``."""
+
+    config = load_config()
+    if config.perplexity_mode != "direct":
+        return run_perplexity_agent(task)
+
+    with span("perplexity_direct", "agent") as direct_span:
+        report = run_perplexity_direct(task)
+        direct_span.set(valid="error" not in report)
+    if "error" in report and config.perplexity_direct_fallback:
+        with span("perplexity_fallback", "agent", reason=report["error"]):
+            return run_perplexity_agent(task)
+    return report
@@ -0,0 +1,167 @@
+"""Warm pools of research agents, one per role.
+
+Building a ``strands.Agent`` sets up a model client, a tool registry and the
+system prompt. A pooled agent keeps all three between runs: it is leased to
+one run at a time, gets that run's hooks (tracing, budget, speculation) for
+the duration of the lease, and is reset to an empty conversation, its
+initial agent state and a fresh conversation manager state before it goes
+back. An agent whose run raised is dropped rather than reused.
+"""
+
+import copy
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from strands.hooks import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeInvocationEvent,
+    BeforeModelCallEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+from strands.agent.state import AgentState
+from strands.telemetry.metrics import EventLoopMetrics
+
+from orchestrator.agents.models import model_factory
+from orchestrator.config import load_config
+
+# Events forwarded to the hooks of the run holding the lease.
+_FORWARDED_EVENTS = (
+    BeforeInvocationEvent,
+    AfterInvocationEvent,
+    BeforeModelCallEvent,
+    AfterModelCallEvent,
+    BeforeToolCallEvent,
+    AfterToolCallEvent,
+)
+
+AgentBuilder = Callable[[HookProvider], Any]
+
+
+class LeaseHooks(HookProvider):
+    """Registered once per pooled agent; forwards events to the current lease's hooks."""
+
+    def __init__(self) -> None:
+        self.registry = HookRegistry()
+
+    def use(self, providers: List[HookProvider]) -> None:
+        registry = HookRegistry()
+        for provider in providers:
+            registry.add_hook(provider)
+        self.registry = registry
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        for event_type in _FORWARDED_EVENTS:
+            registry.add_callback(event_type, self._forward)
+
+    def _forward(self, event: Any) -> None:
+        for callback in self.registry.get_callbacks_for(event):
+            callback(event)
+
+
+class _Fresh:
+    """What a pooled agent looked like when it was built, to reset it to between leases."""
+
+    def __init__(self, agent: Any) -> None:
+        self.state = agent.state.get()
+        self.conversation = copy.deepcopy(vars(agent.conversation_manager))
+
+
+def _reset(agent: Any, fresh: _Fresh) -> None:
+    agent.messages.clear()
+    agent.event_loop_metrics = EventLoopMetrics()
+    agent.state = AgentState(copy.deepcopy(fresh.state))
+    # e.g. removed_message_count, or a sliding window's model call count
+    conversation = vars(agent.conversation_manager)
+    conversation.clear()
+    conversation.update(copy.deepcopy(fresh.conversation))
+
+
+class AgentPool:
+    def __init__(self, role: str, build: AgentBuilder, size: int) -> None:
+        self.role = role
+        self.build = build
+        self.size = size
+        self._idle: List[Tuple[Any, LeaseHooks, _Fresh]] = []
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "hits": 0, "misses": 0, "discarded": 0}
+        self._setup_seconds = 0.0
+
+    def _create(self) -> Tuple[Any, LeaseHooks, _Fresh]:
+        started = time.perf_counter()
+        hooks = LeaseHooks()
+        agent = self.build(hooks)
+        fresh = _Fresh(agent)
+        with self._lock:
+            self._counters["created"] += 1
+            self._setup_seconds += time.perf_counter() - started
+        return agent, hooks, fresh
+
+    def warm(self, count: int) -> None:
+        """Build agents until ``count`` (capped at the pool size) are idle."""
+
+        with self._lock:
+            missing = min(count, self.size) - len(self._idle)
+        created = [self._create() for _ in range(max(missing, 0))]
+        with self._lock:
+            self._idle.extend(created)
+
+    @contextmanager
+    def lease(self, hooks: List[HookProvider]) -> Iterator[Any]:
+        with self._lock:
+            pooled = self._idle.pop() if self._idle else None
+            self._counters["hits" if pooled is not None else "misses"] += 1
+        if pooled is None:
+            pooled = self._create()
+        agent, lease_hooks, fresh = pooled
+        lease_hooks.use(hooks)
+        healthy = False
+        try:
+            yield agent
+            healthy = True
+        finally:
+            lease_hooks.use([])
+            if healthy:
+                _reset(agent, fresh)
+            with self._lock:
+                if healthy and len(self._idle) < self.size:
+                    self._idle.append(pooled)
+                else:
+                    self._counters["discarded"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "idle": len(self._idle), "setup_ms_total": round(self._setup_seconds * 1000, 1)}
+
+
+_pools: Dict[Tuple[Any, ...], AgentPool] = {}
+_pools_lock = threading.Lock()
+
+
+def agent_pool(role: str, build: AgentBuilder, *variant: Any) -> AgentPool:
+    """The pool for ``role``; a new model factory or ``variant`` (e.g. a model ID) gets its own pool."""
+
+    key = (role, model_factory(role), *variant)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = AgentPool(role, build, load_config().agent_pool_size)
+        return pool
+
+
+def agent_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Pool counters summed per role."""
+
+    with _pools_lock:
+        pools = list(_pools.values())
+    totals: Dict[str, Dict[str, Any]] = {}
+    for pool in pools:
+        role_totals = totals.setdefault(pool.role, {})
+        for name, value in pool.stats().items():
+            role_totals[name] = round(role_totals.get(name, 0) + value, 1)
+    return totals
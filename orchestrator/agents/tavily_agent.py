@@ -3,20 +3,36 @@
 from typing import Any, Dict
 
 from strands import Agent
-
-from orchestrator.tools.strands_tools import tavily_extract_tool, tavily_search_tool
+from strands.hooks import HookProvider
+
+from orchestrator.agents.models import agent_model
+from orchestrator.agents.pool import AgentPool, agent_pool
+from orchestrator.budget import budget_hooks
+from orchestrator.speculation import speculation_hooks
+from orchestrator.tools.strands_tools import (
+    case_study_search_tool,
+    tavily_extract_many_tool,
+    tavily_extract_tool,
+    tavily_search_tool,
+)
+from orchestrator.tracing import tracing_hooks
 from orchestrator.utils import extract_json_from_text, load_prompt
 
 
-def run_tavily_agent(task: Dict[str, Any]) -> Dict[str, Any]:
-    system_prompt = load_prompt("prompts/TAVILY_AGENT.md")
+def tavily_agent_pool() -> AgentPool:
+    def build(hooks: HookProvider) -> Agent:
+        return Agent(
+            name="tavily_agent",
+            system_prompt=load_prompt("prompts/TAVILY_AGENT.md"),
+            model=agent_model("tavily"),
+            tools=[case_study_search_tool, tavily_search_tool, tavily_extract_tool, tavily_extract_many_tool],
+            hooks=[hooks],
+        )
 
-    agent = Agent(
-        name="tavily_agent",
-        system_prompt=system_prompt,
-        tools=[tavily_search_tool, tavily_extract_tool],
-    )
+    return agent_pool("tavily", build)
 
+
+def run_tavily_agent(task: Dict[str, Any]) -> Dict[str, Any]:
     user_prompt = (
         "You are executing the Tavily AWS-focused research. "
         "Return ONLY valid JSON per the expected schema.\n\n"
@@ -28,5 +44,6 @@ def run_tavily_agent(task: Dict[str, Any]) -> Dict[str, Any]:
         f"Constraints: {task.get('constraints', [])}\n"
     )
 
-    result = agent(user_prompt)
-    return extract_json_from_text(str(result.message))
+    with tavily_agent_pool().lease(tracing_hooks() + budget_hooks() + speculation_hooks()) as agent:
+        result = agent(user_prompt)
+    return extract_json_from_text(str(result))
@@ -0,0 +1,143 @@
+"""Report artifact writing: streamed, optionally compressed, atomic.
+
+JSON is encoded incrementally with ``json.JSONEncoder.iterencode`` (compact
+unless ``ARTIFACT_JSON_PRETTY`` is set), or in one pass with ``orjson`` when it
+is installed and selected. Output can be gzip- or zstd-compressed; zstd needs
+the optional ``zstandard`` package and falls back to gzip without it. Every
+file is written to a temporary name in the target directory and renamed into
+place, and writes run on a small thread pool so report I/O stays off the
+graph's event loop.
+"""
+
+import asyncio
+import contextlib
+import gzip
+import importlib.util
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+from orchestrator.blobs import json_default
+from orchestrator.config import AppConfig
+
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+CHUNK_BYTES = 64 * 1024
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_writer_executor(config: AppConfig) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.artifact_writer_workers,
+                thread_name_prefix="artifact-writer",
+            )
+        return _executor
+
+
+def _compression(config: AppConfig) -> Optional[str]:
+    compression = config.artifact_compression.lower()
+    if compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+        return "gzip"
+    return compression if compression in EXTENSIONS else None
+
+
+def _use_orjson(config: AppConfig) -> bool:
+    encoder = config.artifact_json_encoder.lower()
+    return encoder in ("orjson", "auto") and importlib.util.find_spec("orjson") is not None
+
+
+def artifact_path(config: AppConfig, path: str) -> str:
+    """``path`` with the extension of the configured compression appended."""
+
+    return path + EXTENSIONS.get(_compression(config) or "", "")
+
+
+@contextlib.contextmanager
+def _open_atomic(path: str, compression: Optional[str]) -> Iterator[BinaryIO]:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    raw = open(tmp_path, "wb")
+    try:
+        if compression == "gzip":
+            stream: Any = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+        elif compression == "zstd":
+            import zstandard
+
+            stream = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+        else:
+            stream = raw
+        with contextlib.ExitStack() as stack:
+            if stream is not raw:
+                stack.callback(stream.close)
+            yield stream
+        raw.flush()
+        os.fsync(raw.fileno())
+        raw.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        raw.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+def _buffered(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Join small encoder chunks into larger UTF-8 writes."""
+
+    pending, size = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= CHUNK_BYTES:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def write_text(config: AppConfig, path: str, chunks: Iterable[str]) -> str:
+    """Stream text chunks to ``path`` (plus compression suffix); returns the final path."""
+
+    path = artifact_path(config, path)
+    with _open_atomic(path, _compression(config)) as handle:
+        for block in _buffered(chunks):
+            handle.write(block)
+    return path
+
+
+def write_json(config: AppConfig, path: str, document: Any) -> str:
+    pretty = config.artifact_json_pretty
+    if _use_orjson(config):
+        import orjson
+
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        encoded = orjson.dumps(document, default=json_default, option=option)
+        path = artifact_path(config, path)
+        with _open_atomic(path, _compression(config)) as handle:
+            handle.write(encoded)
+        return path
+
+    encoder = json.JSONEncoder(
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+        default=json_default,
+    )
+    return write_text(config, path, encoder.iterencode(document))
+
+
+async def write_text_async(config: AppConfig, path: str, chunks: Iterable[str]) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_writer_executor(config), write_text, config, path, chunks)
+
+
+async def write_json_async(config: AppConfig, path: str, document: Any) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_writer_executor(config), write_json, config, path, document)
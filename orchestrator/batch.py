@@ -0,0 +1,129 @@
+"""Batch execution of many workflows with bounded concurrency."""
+
+import asyncio
+import json
+import math
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional, TextIO
+
+from orchestrator.blobs import json_default
+from orchestrator.tools.http_client import aclose_clients
+from orchestrator.workflow import run_workflow_async
+
+# Research branch nodes that hold a provider's quota for most of a run.
+PROVIDER_NODES = {
+    "perplexity": ["perplexity_handoff"],
+    "tavily": ["tavily_handoff"],
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def provider_node_limits(provider_limits: Dict[str, int]) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for provider, limit in provider_limits.items():
+        for node in PROVIDER_NODES.get(provider, []):
+            limits[node] = limit
+    return limits
+
+
+async def _read_lines(stream: TextIO, queue: "asyncio.Queue[Optional[tuple[int, str]]]", workers: int) -> None:
+    index = 0
+    while True:
+        line = await asyncio.to_thread(stream.readline)
+        if not line:
+            break
+        if line.strip():
+            await queue.put((index, line))
+            index += 1
+    for _ in range(workers):
+        await queue.put(None)
+
+
+async def run_batch(
+    source: TextIO,
+    sink: TextIO,
+    concurrency: int = 4,
+    provider_limits: Optional[Dict[str, int]] = None,
+    trace: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Run one workflow per JSONL record, writing an NDJSON line as each finishes."""
+
+    node_limits = provider_node_limits(provider_limits or {})
+    queue: "asyncio.Queue[Optional[tuple[int, str]]]" = asyncio.Queue(maxsize=concurrency * 2)
+    latencies: List[float] = []
+    failures = 0
+
+    async def run_one(index: int, line: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        record: Dict[str, Any] = {"index": index, "run_id": uuid.uuid4().hex}
+        try:
+            payload = json.loads(line)
+            record["target_domain"] = payload.get("target_domain")
+            result = await run_workflow_async(
+                payload, node_concurrency=node_limits, trace=trace, run_id=record["run_id"]
+            )
+            record["status"] = result["status"].value
+            record["result"] = result
+        except Exception as exc:
+            record["status"] = "failed"
+            record["error"] = f"{type(exc).__name__}: {exc}"
+        record["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    async def worker() -> None:
+        nonlocal failures
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            record = await run_one(*item)
+            latencies.append(record["elapsed_seconds"])
+            if record["status"] != "completed":
+                failures += 1
+            sink.write(json.dumps(record, default=json_default) + "\n")
+            sink.flush()
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(_read_lines(source, queue, concurrency), *(worker() for _ in range(concurrency)))
+    finally:
+        await aclose_clients()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "runs": len(latencies),
+        "failures": failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "runs_per_minute": round(len(latencies) / elapsed * 60, 2) if elapsed else 0.0,
+        "latency_p50_seconds": percentile(latencies, 50),
+        "latency_p95_seconds": percentile(latencies, 95),
+    }
+
+
+def run_batch_cli(
+    input_path: str,
+    output_path: Optional[str],
+    concurrency: int,
+    provider_limits: Dict[str, int],
+    trace: Optional[bool] = None,
+) -> Dict[str, Any]:
+    source = sys.stdin if input_path == "-" else open(input_path, "r", encoding="utf-8")
+    sink = sys.stdout if not output_path or output_path == "-" else open(output_path, "w", encoding="utf-8")
+    try:
+        return asyncio.run(run_batch(source, sink, concurrency, provider_limits, trace))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
@@ -0,0 +1,281 @@
+"""Content-addressed storage for large workflow payloads.
+
+Values are serialized once to compact JSON and addressed by their SHA-256, so
+identical payloads are stored once. Each run gets a ``BlobStore`` with a
+memory budget; when the bytes held in memory exceed it, the least recently
+used blobs are spilled to the run's directory under ``BLOB_DIR`` (written on a
+background thread) and read back on demand. The directory is removed when the
+store is garbage-collected, except for blobs an unfinished run's checkpoint
+references; ``collect_blob_dirs`` removes directories a crashed process left.
+Callers keep a ``BlobRef`` and load the value only when they need it; values smaller than
+the store's ``min_bytes`` are not worth a reference and stay inline.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from orchestrator.utils import atomic_write_text
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=ref_default).encode("utf-8")
+
+
+class BlobRef:
+    __slots__ = ("store", "digest", "size")
+
+    def __init__(self, store: "BlobStore", digest: str, size: int) -> None:
+        self.store = store
+        self.digest = digest
+        self.size = size
+
+    def load(self) -> Any:
+        return self.store.get(self.digest)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"$blob": self.digest, "bytes": self.size}
+
+    def __repr__(self) -> str:
+        return f"BlobRef({self.digest[:12]}, {self.size} bytes)"
+
+
+class _Disk:
+    """A store's on-disk state, shared with the finalizer that cleans it up."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.persisted: Set[str] = set()
+        # False once the run's checkpoint is gone: nothing on disk is needed any more.
+        self.retain_persisted = True
+
+
+def _cleanup(disk: _Disk) -> None:
+    if not disk.retain_persisted or not disk.persisted:
+        shutil.rmtree(disk.directory, ignore_errors=True)
+        return
+    for root, _, files in os.walk(disk.directory):
+        for name in files:
+            if name.removesuffix(".json") not in disk.persisted:
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(root, name))
+
+
+class BlobStore:
+    """One run's blobs. Spilled files live in the run's own directory and are
+    deleted once the store (and every ``BlobRef`` into it) is gone; blobs a
+    checkpoint references are kept until the run completes."""
+
+    def __init__(self, directory: str, memory_budget: int, min_bytes: int = 0) -> None:
+        self.directory = directory
+        self.memory_budget = memory_budget
+        self.min_bytes = min_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # Spilled blobs whose file is still being written.
+        self._writing: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._counters = {"puts": 0, "deduplicated": 0, "spilled": 0, "disk_reads": 0, "persisted": 0}
+        self._disk = _Disk(directory)
+        weakref.finalize(self, _cleanup, self._disk)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def put(self, value: Any) -> BlobRef:
+        return self._put(_encode(value))
+
+    def _put(self, encoded: bytes) -> BlobRef:
+        digest = hashlib.sha256(encoded).hexdigest()
+        with self._lock:
+            self._counters["puts"] += 1
+            if digest in self._memory or digest in self._writing or os.path.exists(self._path(digest)):
+                self._counters["deduplicated"] += 1
+                spilled = []
+            else:
+                self._memory[digest] = encoded
+                self._memory_bytes += len(encoded)
+                spilled = self._take_spills()
+        for digest_spilled, data in spilled:
+            # Written on a background thread: _put runs on the event loop.
+            _spill_writer().submit(self._write_spill, digest_spilled, data)
+        return BlobRef(self, digest, len(encoded))
+
+    def _take_spills(self) -> List[Tuple[str, bytes]]:
+        spilled = []
+        while self._memory_bytes > self.memory_budget and self._memory:
+            digest, encoded = self._memory.popitem(last=False)
+            self._writing[digest] = encoded
+            self._memory_bytes -= len(encoded)
+            self._counters["spilled"] += 1
+            spilled.append((digest, encoded))
+        return spilled
+
+    def _write_spill(self, digest: str, encoded: bytes) -> None:
+        atomic_write_text(self._path(digest), encoded.decode("utf-8"))
+        with self._lock:
+            self._writing.pop(digest, None)
+
+    def persist(self, digest: str) -> None:
+        """Make sure ``digest`` is on disk and kept there while the run's checkpoint exists."""
+
+        with self._lock:
+            self._disk.persisted.add(digest)
+            encoded = self._memory.get(digest) or self._writing.get(digest)
+        if encoded is None or os.path.exists(self._path(digest)):
+            return
+        atomic_write_text(self._path(digest), encoded.decode("utf-8"))
+        with self._lock:
+            self._counters["persisted"] += 1
+
+    def release_persisted(self) -> None:
+        """The run completed and its checkpoint is gone; persisted blobs need not outlive the store."""
+
+        self._disk.retain_persisted = False
+
+    def get(self, digest: str) -> Any:
+        with self._lock:
+            encoded = self._memory.get(digest) or self._writing.get(digest)
+            if digest in self._memory:
+                self._memory.move_to_end(digest)
+        if encoded is None:
+            with open(self._path(digest), "rb") as handle:
+                encoded = handle.read()
+            with self._lock:
+                self._counters["disk_reads"] += 1
+        return json.loads(encoded)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "memory_bytes": self._memory_bytes, "memory_blobs": len(self._memory)}
+
+
+_writer: Optional[ThreadPoolExecutor] = None
+_writer_lock = threading.Lock()
+
+
+def _spill_writer() -> ThreadPoolExecutor:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="blob-spill")
+        return _writer
+
+
+def run_blob_dir(blob_dir: str, run_id: str) -> str:
+    return os.path.join(blob_dir, run_id)
+
+
+def collect_blob_dirs(blob_dir: str, checkpoint_dir: str, max_age: float) -> int:
+    """Remove run blob directories left behind (e.g. by a crash) that no checkpoint needs.
+
+    A directory is removed when its run has no checkpoint and it has not been
+    touched for ``max_age`` seconds; returns how many were removed.
+    """
+
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(blob_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.is_dir() or os.path.exists(os.path.join(checkpoint_dir, f"{entry.name}.json")):
+            continue
+        with contextlib.suppress(OSError):
+            if entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+    return removed
+
+
+_COLLECT_INTERVAL = 3600.0
+_collected_at: Dict[str, float] = {}
+
+
+def maybe_collect_blob_dirs(blob_dir: str, checkpoint_dir: str, max_age: float) -> int:
+    """``collect_blob_dirs`` at most once an hour per ``blob_dir``."""
+
+    now = time.monotonic()
+    with _writer_lock:
+        if now - _collected_at.get(blob_dir, -_COLLECT_INTERVAL) < _COLLECT_INTERVAL:
+            return 0
+        _collected_at[blob_dir] = now
+    return collect_blob_dirs(blob_dir, checkpoint_dir, max_age)
+
+
+_blob_store: ContextVar[Optional[BlobStore]] = ContextVar("orchestrator_blob_store", default=None)
+
+
+def current_store() -> Optional[BlobStore]:
+    return _blob_store.get()
+
+
+def activate_store(store: BlobStore):
+    return _blob_store.set(store)
+
+
+def deactivate_store(token) -> None:
+    _blob_store.reset(token)
+
+
+def offload(value: Any) -> Any:
+    """A ``BlobRef`` for a large ``value`` when a run's store is active, else ``value``."""
+
+    store = _blob_store.get()
+    if store is None or isinstance(value, BlobRef):
+        return value
+    encoded = _encode(value)
+    return store._put(encoded) if len(encoded) >= store.min_bytes else value
+
+
+def resolve(value: Any) -> Any:
+    return value.load() if isinstance(value, BlobRef) else value
+
+
+def json_default(obj: Any) -> Any:
+    """``json.dumps`` default that inlines blob contents (for final output)."""
+
+    if isinstance(obj, BlobRef):
+        return obj.load()
+    return str(obj)
+
+
+def ref_default(obj: Any) -> Any:
+    """``json.dumps`` default that writes blobs as ``{"$blob": digest}`` markers."""
+
+    if isinstance(obj, BlobRef):
+        return obj.to_json()
+    return str(obj)
+
+
+def checkpoint_default(obj: Any) -> Any:
+    """``ref_default`` that also writes each referenced blob to disk, so a checkpoint can be resumed."""
+
+    if isinstance(obj, BlobRef):
+        obj.store.persist(obj.digest)
+        return obj.to_json()
+    return str(obj)
+
+
+def revive(value: Any, store: BlobStore) -> Any:
+    """``value`` with ``{"$blob": digest}`` markers turned back into ``BlobRef``s on ``store``."""
+
+    if isinstance(value, dict):
+        if set(value) == {"$blob", "bytes"}:
+            # Still referenced by the checkpoint being resumed from.
+            store.persist(value["$blob"])
+            return BlobRef(store, value["$blob"], value["bytes"])
+        return {key: revive(item, store) for key, item in value.items()}
+    if isinstance(value, list):
+        return [revive(item, store) for item in value]
+    return value
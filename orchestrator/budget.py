@@ -0,0 +1,219 @@
+"""Time budgets derived from ``MasterInput.time_limit`` and ``research_priority``.
+
+A run's budget is ``time_limit`` ("90s", "30m", "3h", "1.5 hours") or, without
+one, ``BUDGET_DEFAULT_SECONDS`` scaled by the priority. Nodes get cumulative
+milestones within it: for example, the research branches must finish by 75%
+of the budget however long domain verification took. A node that overruns
+its milestone is abandoned and the graph continues. Its context writes made
+after the deadline are dropped, and it is recorded in ``RunBudget.truncated``.
+Agents wrap up before that happens: once most of their node's window has
+passed, ``BudgetHooks`` cancels further tool calls, so the model answers
+with what it already has.
+"""
+
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from strands.hooks import BeforeToolCallEvent, HookProvider, HookRegistry
+
+from orchestrator.config import AppConfig
+from orchestrator.context import WorkflowContext
+
+# Share of the default budget per research_priority.
+PRIORITY_SCALE = {"urgent": 0.25, "high": 0.5, "standard": 1.0, "low": 1.0, "deep": 1.5}
+
+# Fraction of the run budget by which each node must have finished.
+NODE_MILESTONES = {
+    "domain_verification": 0.10,
+    "perplexity_handoff": 0.75,
+    "tavily_handoff": 0.75,
+    "gap_fill": 0.90,
+}
+
+# Agents stop calling tools once this much of their node's window has passed.
+WRAP_UP_FRACTION = 0.85
+
+# Report categories that are incomplete when a node is truncated.
+NODE_CATEGORIES = {
+    "domain_verification": ("business_intelligence",),
+    "perplexity_handoff": ("business_intelligence",),
+    "tavily_handoff": ("aws_case_studies",),
+}
+
+_UNITS = {
+    **dict.fromkeys(("s", "sec", "secs", "second", "seconds"), 1),
+    **dict.fromkeys(("m", "min", "mins", "minute", "minutes"), 60),
+    **dict.fromkeys(("h", "hr", "hrs", "hour", "hours"), 3600),
+}
+_NUMBER = r"\d+(?:\.\d+)?"
+_PART = re.compile(rf"({_NUMBER})\s*([a-z]+)\s*")
+_RANGE = re.compile(rf"{_NUMBER}\s*(?:-|–|to)\s*({_NUMBER})\s*([a-z]*)")
+
+
+def parse_time_limit(value: Any) -> Optional[float]:
+    """Seconds in a duration such as ``"3h"``, ``"45 minutes"`` or ``"1h30m"``; bare numbers are minutes.
+
+    A range such as ``"3-4 hours"`` counts as its upper bound. Anything else (an
+    unknown unit like ``"500ms"``, trailing text) is not a time limit: ``None``.
+    """
+
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) * 60 if value > 0 else None
+    text = str(value).strip().lower()
+    ranged = _RANGE.fullmatch(text)
+    if ranged:
+        text = "".join(ranged.groups())
+    if re.fullmatch(_NUMBER, text):
+        return parse_time_limit(float(text))
+    total, position = 0.0, 0
+    while position < len(text):
+        part = _PART.match(text, position)
+        if part is None or part.group(2) not in _UNITS:
+            return None
+        total += float(part.group(1)) * _UNITS[part.group(2)]
+        position = part.end()
+    return total if total > 0 else None
+
+
+class RunBudget:
+    def __init__(self, total_seconds: float, started: Optional[float] = None) -> None:
+        self.total_seconds = total_seconds
+        self.started = time.monotonic() if started is None else started
+        self.truncated: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_input(cls, config: AppConfig, input_payload: Dict[str, Any]) -> "RunBudget":
+        total = parse_time_limit(input_payload.get("time_limit"))
+        if total is None:
+            priority = str(input_payload.get("research_priority") or "standard").lower()
+            total = config.budget_default_seconds * PRIORITY_SCALE.get(priority, 1.0)
+        return cls(total)
+
+    def node_deadline(self, node: str) -> Optional[float]:
+        milestone = NODE_MILESTONES.get(node)
+        return None if milestone is None else self.started + milestone * self.total_seconds
+
+    def mark(self, node: str, reason: str) -> None:
+        with self._lock:
+            self.truncated.setdefault(node, reason)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit_seconds": round(self.total_seconds, 1),
+                "elapsed_seconds": round(time.monotonic() - self.started, 1),
+                "truncated": dict(self.truncated),
+            }
+
+
+_budget: ContextVar[Optional[RunBudget]] = ContextVar("orchestrator_budget", default=None)
+# (node, window start, deadline) of the node running in this context.
+_node_window: ContextVar[Optional[Tuple[str, float, float]]] = ContextVar("orchestrator_node_window", default=None)
+
+
+def current_budget() -> Optional[RunBudget]:
+    return _budget.get()
+
+
+def activate_budget(budget: RunBudget):
+    return _budget.set(budget)
+
+
+def deactivate_budget(token) -> None:
+    _budget.reset(token)
+
+
+def enter_node(node: str) -> Optional[Tuple[Any, float]]:
+    """Open ``node``'s window; returns ``(token, deadline)`` or None when it is unbounded."""
+
+    budget = _budget.get()
+    deadline = budget.node_deadline(node) if budget is not None else None
+    if deadline is None:
+        return None
+    return _node_window.set((node, time.monotonic(), deadline)), deadline
+
+
+def exit_node(token) -> None:
+    _node_window.reset(token)
+
+
+def remaining(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left before the running node's deadline (``default`` when unbounded)."""
+
+    window = _node_window.get()
+    if window is None:
+        return default
+    return max(window[2] - time.monotonic(), 0.0)
+
+
+def mark_partial(completeness: Dict[str, Any]) -> Dict[str, Any]:
+    """``completeness`` with categories of truncated nodes downgraded and the budget summary attached."""
+
+    budget = _budget.get()
+    if budget is None:
+        return completeness
+    summary = budget.summary()
+    marked = dict(completeness)
+    for node in summary["truncated"]:
+        for category in NODE_CATEGORIES.get(node, ()):
+            marked[category] = "Partial (time limit)"
+    marked["time_budget"] = summary
+    return marked
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, node: str) -> None:
+        super().__init__(f"Node {node!r} exceeded its time budget")
+        self.node = node
+
+
+class GuardedContext(WorkflowContext):
+    """Passes writes through to ``inner`` until closed, then drops them."""
+
+    def __init__(self, inner: WorkflowContext) -> None:
+        super().__init__(data=inner.data, node_results=inner.node_results)
+        self.inner = inner
+        self.closed = threading.Event()
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.closed.is_set():
+            self.inner.set(key, value)
+
+    def set_blob(self, key: str, value: Any) -> None:
+        if not self.closed.is_set():
+            self.inner.set_blob(key, value)
+
+
+class BudgetHooks(HookProvider):
+    """Cancels an agent's tool calls once its node is close to its deadline."""
+
+    def __init__(self, budget: RunBudget, node: str, started: float, deadline: float) -> None:
+        self.budget = budget
+        self.node = node
+        self.wrap_up_at = started + WRAP_UP_FRACTION * (deadline - started)
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+
+    def _before_tool(self, event: BeforeToolCallEvent) -> None:
+        if time.monotonic() >= self.wrap_up_at:
+            self.budget.mark(self.node, "tools_cut")
+            event.cancel_tool = (
+                "Time budget exhausted: do not call any more tools. "
+                "Return the final JSON now using the information gathered so far."
+            )
+
+
+def budget_hooks() -> List[HookProvider]:
+    """Agent hooks for the running node's budget; empty when it is unbounded."""
+
+    budget, window = _budget.get(), _node_window.get()
+    if budget is None or window is None:
+        return []
+    return [BudgetHooks(budget, *window)]
@@ -0,0 +1,115 @@
+"""Per-run checkpoints so an interrupted workflow can resume where it stopped.
+
+After every node the graph's serialized state and the ``WorkflowContext``
+data are written atomically to ``{CHECKPOINT_DIR}/{run_id}.json``. Large
+values are written as blob references (the blobs themselves are persisted to
+``BLOB_DIR``), and serialization runs on a worker thread, off the event loop. Resuming
+restores both and re-enters the graph at the nodes that were ready to run,
+so completed research branches are not paid for twice. A run's checkpoint is
+removed once it completes.
+"""
+
+import asyncio
+import json
+import os
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from strands.experimental.hooks.multiagent import AfterNodeCallEvent
+from strands.hooks import HookProvider, HookRegistry
+
+from orchestrator.blobs import checkpoint_default, current_store, revive
+from orchestrator.context import WorkflowContext
+from orchestrator.utils import atomic_write_text
+
+
+class CheckpointStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def path(self, run_id: str) -> str:
+        return os.path.join(self.directory, f"{run_id}.json")
+
+    def write(self, run_id: str, payload: str) -> None:
+        atomic_write_text(self.path(run_id), payload)
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(run_id), "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return None
+
+    def delete(self, run_id: str) -> None:
+        try:
+            os.remove(self.path(run_id))
+        except FileNotFoundError:
+            pass
+
+
+class _ActiveRun:
+    def __init__(self, store: CheckpointStore, run_id: str, input_payload: Any) -> None:
+        self.store = store
+        self.run_id = run_id
+        self.input_payload = input_payload
+        # Parallel nodes finish on the same loop; writes go out in order.
+        self.lock = asyncio.Lock()
+
+
+_active_run: ContextVar[Optional[_ActiveRun]] = ContextVar("orchestrator_checkpoint_run", default=None)
+
+
+def activate_run(store: CheckpointStore, run_id: str, input_payload: Any):
+    return _active_run.set(_ActiveRun(store, run_id, input_payload))
+
+
+def deactivate_run(token) -> None:
+    _active_run.reset(token)
+
+
+def graph_snapshot(graph: Any) -> Dict[str, Any]:
+    """Serialized graph state with failed nodes turned back into pending ones."""
+
+    state = graph.serialize_state()
+    failed = set(state.get("failed_nodes") or [])
+    state["failed_nodes"] = []
+    state["node_results"] = {
+        node_id: result for node_id, result in state["node_results"].items() if node_id not in failed
+    }
+    return state
+
+
+class CheckpointHooks(HookProvider):
+    """Writes a checkpoint after each node of the run active in the current context."""
+
+    def __init__(self, context: WorkflowContext) -> None:
+        self.context = context
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(AfterNodeCallEvent, self._after_node)
+
+    async def _after_node(self, event: AfterNodeCallEvent) -> None:
+        run = _active_run.get()
+        if run is None:
+            return
+        state = {
+            "run_id": run.run_id,
+            "input": run.input_payload,
+            "graph": graph_snapshot(event.source),
+            # Copy first: nodes on executor threads may still be writing.
+            "context": dict(self.context.data),
+        }
+        async with run.lock:
+            await asyncio.to_thread(_write, run, state)
+
+
+def _write(run: _ActiveRun, state: Dict[str, Any]) -> None:
+    run.store.write(run.run_id, json.dumps(state, default=checkpoint_default))
+
+
+def restore(graph: Any, context: WorkflowContext, checkpoint: Dict[str, Any]) -> None:
+    store = current_store()
+    saved = checkpoint.get("context", {})
+    context.data.clear()
+    context.data.update(revive(saved, store) if store is not None else saved)
+    graph.deserialize_state(checkpoint["graph"])
@@ -2,6 +2,14 @@
 
 import os
 from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    rate: float
+    burst: int
+    max_in_flight: int
 
 
 @dataclass(frozen=True)
@@ -11,10 +19,96 @@ class AppConfig:
     tavily_base_url: str
     tavily_search_path: str
     tavily_extract_path: str
+    extract_batch_window_ms: float
+    extract_batch_max: int
     perplexity_base_url: str
     perplexity_chat_path: str
     perplexity_model: str
+    perplexity_mode: str
+    perplexity_direct_fallback: bool
+    perplexity_direct_max_tokens: int
     report_output_dir: str
+    node_executor_workers: int
+    node_concurrency: Dict[str, int]
+    node_result_mode: str
+    http_max_connections: int
+    http_max_keepalive: int
+    http_keepalive_expiry: float
+    http2_enabled: bool
+    cache_enabled: bool
+    cache_path: str
+    cache_max_bytes: int
+    cache_search_ttl: float
+    cache_extract_ttl: float
+    cache_negative_ttl: float
+    case_index_enabled: bool
+    case_index_path: str
+    case_index_min_results: int
+    case_index_min_coverage: float
+    case_index_max_age: float
+    gap_fill_deadline: float
+    gap_fill_max_queries: int
+    gap_fill_results_per_query: int
+    budget_enabled: bool
+    budget_default_seconds: float
+    budget_grace_seconds: float
+    speculative_research: bool
+    agent_pool_size: int
+    compaction_enabled: bool
+    source_registry_enabled: bool
+    source_registry_path: str
+    source_simhash_distance: int
+    source_alias_ttl: int
+    compaction_result_max_chars: int
+    compaction_response_max_chars: int
+    compaction_dedup_threshold: float
+    tavily_limits: ProviderLimits
+    perplexity_limits: ProviderLimits
+    http_max_retries: int
+    http_backoff_base: float
+    http_backoff_max: float
+    trace_enabled: bool
+    trace_dir: str
+    trace_format: str
+    checkpoint_enabled: bool
+    checkpoint_dir: str
+    worker_queue_path: str
+    worker_queue_journal_mode: str
+    worker_result_dir: str
+    worker_processes: int
+    worker_lease_seconds: float
+    worker_max_attempts: int
+    worker_poll_seconds: float
+    memo_enabled: bool
+    memo_dir: str
+    memo_ttl: float
+    blob_dir: str
+    blob_memory_budget: int
+    blob_min_bytes: int
+    blob_ttl: float
+    artifact_json_pretty: bool
+    artifact_json_encoder: str
+    artifact_compression: str
+    artifact_writer_workers: int
+
+
+def _parse_limits(raw: str) -> Dict[str, int]:
+    """Parse ``name=limit`` pairs, e.g. ``"perplexity_handoff=4,tavily_handoff=4"``."""
+
+    limits: Dict[str, int] = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            limits[name.strip()] = int(value)
+    return limits
+
+
+def _provider_limits(prefix: str, rate: str, burst: str, max_in_flight: str) -> ProviderLimits:
+    return ProviderLimits(
+        rate=float(os.getenv(f"{prefix}_RATE_LIMIT", rate)),
+        burst=int(os.getenv(f"{prefix}_RATE_BURST", burst)),
+        max_in_flight=int(os.getenv(f"{prefix}_MAX_IN_FLIGHT", max_in_flight)),
+    )
 
 
 def load_config() -> AppConfig:
@@ -25,8 +119,75 @@ def load_config() -> AppConfig:
         tavily_base_url=os.getenv("TAVILY_BASE_URL", "https://api.tavily.com"),
         tavily_search_path=os.getenv("TAVILY_SEARCH_PATH", "/search"),
         tavily_extract_path=os.getenv("TAVILY_EXTRACT_PATH", "/extract"),
+        extract_batch_window_ms=float(os.getenv("EXTRACT_BATCH_WINDOW_MS", "25")),
+        extract_batch_max=int(os.getenv("EXTRACT_BATCH_MAX", "20")),
         perplexity_base_url=os.getenv("PERPLEXITY_BASE_URL", "https://api.perplexity.ai"),
         perplexity_chat_path=os.getenv("PERPLEXITY_CHAT_PATH", "/chat/completions"),
         perplexity_model=os.getenv("PERPLEXITY_MODEL", "sonar"),
+        perplexity_mode=os.getenv("PERPLEXITY_MODE", "agent"),
+        perplexity_direct_fallback=os.getenv("PERPLEXITY_DIRECT_FALLBACK", "true").lower() == "true",
+        perplexity_direct_max_tokens=int(os.getenv("PERPLEXITY_DIRECT_MAX_TOKENS", "4096")),
         report_output_dir=os.getenv("REPORT_OUTPUT_DIR", "reports"),
+        node_executor_workers=int(os.getenv("NODE_EXECUTOR_WORKERS", "16")),
+        node_concurrency=_parse_limits(os.getenv("NODE_CONCURRENCY", "")),
+        node_result_mode=os.getenv("NODE_RESULT_MODE", "reference"),
+        http_max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "20")),
+        http_max_keepalive=int(os.getenv("HTTP_MAX_KEEPALIVE", "10")),
+        http_keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        http2_enabled=os.getenv("HTTP2_ENABLED", "false").lower() == "true",
+        cache_enabled=os.getenv("TAVILY_CACHE_ENABLED", "true").lower() == "true",
+        cache_path=os.getenv("TAVILY_CACHE_PATH", ".cache/tavily.sqlite3"),
+        cache_max_bytes=int(os.getenv("TAVILY_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        cache_search_ttl=float(os.getenv("TAVILY_CACHE_SEARCH_TTL", "86400")),
+        cache_extract_ttl=float(os.getenv("TAVILY_CACHE_EXTRACT_TTL", "604800")),
+        cache_negative_ttl=float(os.getenv("TAVILY_CACHE_NEGATIVE_TTL", "600")),
+        case_index_enabled=os.getenv("CASE_INDEX_ENABLED", "true").lower() == "true",
+        case_index_path=os.getenv("CASE_INDEX_PATH", ".cache/case_studies.sqlite3"),
+        case_index_min_results=int(os.getenv("CASE_INDEX_MIN_RESULTS", "3")),
+        case_index_min_coverage=float(os.getenv("CASE_INDEX_MIN_COVERAGE", "0.6")),
+        case_index_max_age=float(os.getenv("CASE_INDEX_MAX_AGE", str(30 * 86400))),
+        gap_fill_deadline=float(os.getenv("GAP_FILL_DEADLINE", "20")),
+        gap_fill_max_queries=int(os.getenv("GAP_FILL_MAX_QUERIES", "8")),
+        gap_fill_results_per_query=int(os.getenv("GAP_FILL_RESULTS_PER_QUERY", "3")),
+        budget_enabled=os.getenv("BUDGET_ENABLED", "false").lower() == "true",
+        budget_default_seconds=float(os.getenv("BUDGET_DEFAULT_SECONDS", "3600")),
+        budget_grace_seconds=float(os.getenv("BUDGET_GRACE_SECONDS", "120")),
+        speculative_research=os.getenv("SPECULATIVE_RESEARCH", "false").lower() == "true",
+        agent_pool_size=int(os.getenv("AGENT_POOL_SIZE", "0")),
+        source_registry_enabled=os.getenv("SOURCE_REGISTRY_ENABLED", "true").lower() == "true",
+        source_registry_path=os.getenv("SOURCE_REGISTRY_PATH", ""),
+        source_simhash_distance=int(os.getenv("SOURCE_SIMHASH_DISTANCE", "3")),
+        source_alias_ttl=int(os.getenv("SOURCE_ALIAS_TTL", "604800")),
+        compaction_enabled=os.getenv("TOOL_COMPACTION_ENABLED", "true").lower() == "true",
+        compaction_result_max_chars=int(os.getenv("TOOL_RESULT_MAX_CHARS", "1500")),
+        compaction_response_max_chars=int(os.getenv("TOOL_RESPONSE_MAX_CHARS", "8000")),
+        compaction_dedup_threshold=float(os.getenv("TOOL_DEDUP_THRESHOLD", "0.8")),
+        tavily_limits=_provider_limits("TAVILY", "5", "10", "16"),
+        perplexity_limits=_provider_limits("PERPLEXITY", "2", "4", "8"),
+        http_max_retries=int(os.getenv("HTTP_MAX_RETRIES", "3")),
+        http_backoff_base=float(os.getenv("HTTP_BACKOFF_BASE", "0.5")),
+        http_backoff_max=float(os.getenv("HTTP_BACKOFF_MAX", "30")),
+        trace_enabled=os.getenv("TRACE_ENABLED", "false").lower() == "true",
+        trace_dir=os.getenv("TRACE_DIR", "traces"),
+        trace_format=os.getenv("TRACE_FORMAT", "chrome"),
+        checkpoint_enabled=os.getenv("CHECKPOINT_ENABLED", "false").lower() == "true",
+        checkpoint_dir=os.getenv("CHECKPOINT_DIR", ".checkpoints"),
+        worker_queue_path=os.getenv("WORKER_QUEUE_PATH", ".queue/jobs.sqlite3"),
+        worker_queue_journal_mode=os.getenv("WORKER_QUEUE_JOURNAL_MODE", "delete"),
+        worker_result_dir=os.getenv("WORKER_RESULT_DIR", "results"),
+        worker_processes=int(os.getenv("WORKER_PROCESSES", "2")),
+        worker_lease_seconds=float(os.getenv("WORKER_LEASE_SECONDS", "300")),
+        worker_max_attempts=int(os.getenv("WORKER_MAX_ATTEMPTS", "3")),
+        worker_poll_seconds=float(os.getenv("WORKER_POLL_SECONDS", "2")),
+        memo_enabled=os.getenv("MEMO_ENABLED", "false").lower() == "true",
+        memo_dir=os.getenv("MEMO_DIR", ".cache/memo"),
+        memo_ttl=float(os.getenv("MEMO_TTL", "86400")),
+        blob_dir=os.getenv("BLOB_DIR", ".cache/blobs"),
+        blob_memory_budget=int(os.getenv("BLOB_MEMORY_BUDGET", str(64 * 1024 * 1024))),
+        blob_min_bytes=int(os.getenv("BLOB_MIN_BYTES", "16384")),
+        blob_ttl=float(os.getenv("BLOB_TTL", "86400")),
+        artifact_json_pretty=os.getenv("ARTIFACT_JSON_PRETTY", "false").lower() == "true",
+        artifact_json_encoder=os.getenv("ARTIFACT_JSON_ENCODER", "auto"),
+        artifact_compression=os.getenv("ARTIFACT_COMPRESSION", "none"),
+        artifact_writer_workers=int(os.getenv("ARTIFACT_WRITER_WORKERS", "4")),
     )
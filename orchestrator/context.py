@@ -3,15 +3,32 @@
 from dataclasses import dataclass, field
 from typing import Any, Dict
 
+from orchestrator.blobs import offload, resolve
+
 
 @dataclass
 class WorkflowContext:
-    """Holds node outputs and shared metadata for the graph execution."""
+    """Holds node outputs and shared metadata for the graph execution.
+
+    ``node_results`` keeps each node's return value by reference, so graph
+    messages do not have to carry it as text.
+    """
 
     data: Dict[str, Any] = field(default_factory=dict)
+    node_results: Dict[str, Any] = field(default_factory=dict)
 
     def set(self, key: str, value: Any) -> None:
         self.data[key] = value
 
+    def set_blob(self, key: str, value: Any) -> None:
+        """Store a large value as a lazily loaded blob reference."""
+
+        self.data[key] = offload(value)
+
     def get(self, key: str, default: Any = None) -> Any:
+        return resolve(self.data.get(key, default))
+
+    def get_ref(self, key: str, default: Any = None) -> Any:
+        """The stored value without loading it, so it can be shared by reference."""
+
         return self.data.get(key, default)
@@ -0,0 +1,226 @@
+"""Targeted, concurrent gap filling for incomplete report categories.
+
+``plan_gap_queries`` turns each category that ``integration_node`` did not
+mark "Complete" into a few specific searches, built from the verified company
+name, domain and industry and from what the agent reports already found
+(business challenges, competitors, technologies). ``fill_gaps`` runs every
+query at once and stops waiting at a deadline. Late queries are cancelled and
+reported as ``timed_out``, so gap filling costs at most one deadline of
+latency however many categories are missing.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from orchestrator.budget import WRAP_UP_FRACTION, remaining
+from orchestrator.config import AppConfig
+from orchestrator.tools.case_index import search_case_studies_async
+from orchestrator.tools.sources import SourceRegistry, source_url
+from orchestrator.tools.tavily import tavily_search_async
+from orchestrator.tracing import span
+
+CATEGORIES = ("business_intelligence", "aws_case_studies", "industry_analysis", "technical_intelligence")
+
+
+@dataclass(frozen=True)
+class GapQuery:
+    category: str
+    query: str
+    case_studies: bool = False
+
+
+def _names(items: Any, *keys: str, limit: int = 2) -> List[str]:
+    """Up to ``limit`` short labels from a list of strings or dicts."""
+
+    names = []
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, str):
+            names.append(item)
+        elif isinstance(item, dict):
+            names.extend(str(item[key]) for key in keys if item.get(key))
+    return [name[:80] for name in names[:limit]]
+
+
+def _mapping(value: Any) -> Dict[str, Any]:
+    """``value`` if it is a dict, else ``{}`` (agents write "Not available" for missing sections)."""
+
+    return value if isinstance(value, dict) else {}
+
+
+def _section(value: Any) -> Dict[str, Any]:
+    """A copy of a report section as a dict; a non-dict value is kept under ``summary``."""
+
+    if isinstance(value, dict):
+        return dict(value)
+    return {"summary": value} if value else {}
+
+
+def _items(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, list) else []
+
+
+def plan_gap_queries(
+    completeness: Dict[str, Any],
+    domain_verification: Dict[str, Any],
+    perplexity_report: Dict[str, Any],
+    tavily_report: Dict[str, Any],
+    industry: Optional[str] = None,
+    max_queries: int = 8,
+) -> List[GapQuery]:
+    company = domain_verification.get("official_company_name") or domain_verification.get("target_domain") or ""
+    domain = domain_verification.get("target_domain") or ""
+    subject = f'"{company}" {domain}'.strip() if company != domain else domain
+    sector = industry or "enterprise"
+    year = time.gmtime().tm_year
+    missing = [category for category in CATEGORIES if completeness.get(category, "Partial") != "Complete"]
+
+    plans: Dict[str, List[GapQuery]] = {
+        "business_intelligence": [
+            GapQuery("business_intelligence", f"{subject} company overview business model revenue"),
+        ],
+        "aws_case_studies": [
+            GapQuery("aws_case_studies", f"AWS case study {sector} {challenge}", case_studies=True)
+            for challenge in _names(tavily_report.get("business_challenges"), "challenge", "title")
+        ]
+        or [GapQuery("aws_case_studies", f"AWS case study {sector} cloud modernization", case_studies=True)],
+        "industry_analysis": [
+            GapQuery("industry_analysis", f"{sector} industry cloud adoption trends {year}"),
+            GapQuery(
+                "industry_analysis",
+                " ".join(
+                    [f"{sector} companies using AWS"]
+                    + _names(_mapping(perplexity_report.get("market_intelligence")).get("competitors"), "name")
+                ),
+            ),
+        ],
+        "technical_intelligence": [
+            GapQuery("technical_intelligence", f"{subject} technology stack cloud infrastructure engineering"),
+        ]
+        + [
+            GapQuery("technical_intelligence", f"{subject} {technology} architecture")
+            for technology in _names(
+                _mapping(perplexity_report.get("technology_footprint")).get("cloud_providers")
+                or _mapping(perplexity_report.get("technology_footprint")).get("technologies"),
+                "name",
+                limit=1,
+            )
+        ],
+    }
+
+    # Round-robin across categories so a low ``max_queries`` still covers each one.
+    queries: List[GapQuery] = []
+    pending = [list(plans[category]) for category in missing]
+    while pending and len(queries) < max_queries:
+        for plan in pending:
+            if plan and len(queries) < max_queries:
+                queries.append(plan.pop(0))
+        pending = [plan for plan in pending if plan]
+    return queries
+
+
+def _hits(result: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    hits = (result.get("data") or {}).get("results") or []
+    return [hit for hit in hits if isinstance(hit, dict) and hit.get("url")][:limit]
+
+
+async def _run_query(config: AppConfig, gap: GapQuery, industry: Optional[str]) -> Dict[str, Any]:
+    limit = config.gap_fill_results_per_query
+    if gap.case_studies:
+        return await search_case_studies_async(config=config, query=gap.query, industry=industry, max_results=limit)
+    return await tavily_search_async(config=config, query=gap.query, max_results=limit)
+
+
+async def fill_gaps(
+    config: AppConfig, queries: List[GapQuery], industry: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Run ``queries`` concurrently until ``config.gap_fill_deadline``; results grouped by category.
+
+    Inside a node with a time budget, the wait also ends before that node's deadline.
+    """
+
+    filled: Dict[str, Dict[str, Any]] = {}
+    if not queries:
+        return filled
+    with span("gap_fill", "gap_fill", queries=len(queries)):
+        tasks = {asyncio.ensure_future(_run_query(config, gap, industry)): gap for gap in queries}
+        timeout = config.gap_fill_deadline or None
+        budget_left = remaining()
+        if budget_left is not None:
+            # Leave the node time to merge what arrived before its own deadline.
+            budget_left *= WRAP_UP_FRACTION
+            timeout = budget_left if timeout is None else min(timeout, budget_left)
+        _, late = await asyncio.wait(tasks, timeout=timeout)
+        for task in late:
+            task.cancel()
+        # A query can also end cancelled without being late (e.g. a shared
+        # request cancelled elsewhere); it counts as timed out, not as a crash.
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for (task, gap), result in zip(tasks.items(), outcomes):
+            entry = filled.setdefault(gap.category, {"category": gap.category, "queries": [], "results": []})
+            if task in late or isinstance(result, asyncio.CancelledError):
+                status, hits = "timed_out", []
+            elif isinstance(result, BaseException):
+                status, hits = "error", []
+            else:
+                hits = _hits(result, config.gap_fill_results_per_query)
+                status = result.get("source", "network") if result.get("ok") else "error"
+            entry["queries"].append({"query": gap.query, "status": status, "results": len(hits)})
+            seen = {hit["url"] for hit in entry["results"]}
+            entry["results"].extend(hit for hit in hits if hit["url"] not in seen)
+    return filled
+
+
+def _case_study(hit: Dict[str, Any]) -> Dict[str, Any]:
+    if hit.get("company"):
+        return {key: value for key, value in hit.items() if key not in ("score", "coverage")}
+    return {"company": hit.get("title") or hit["url"], "url": hit["url"], "summary": hit.get("content", "")}
+
+
+def _reference(hit: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": hit.get("title") or hit.get("company") or hit["url"],
+        "url": hit["url"],
+        "snippet": (hit.get("content") or "")[:500],
+    }
+
+
+def merge_gap_fill(
+    report_model: Dict[str, Any], notes: List[Dict[str, Any]], registry: Optional[SourceRegistry] = None
+) -> None:
+    """Fold gap-fill results into ``report_model``'s sections in place.
+
+    URLs are compared as pages through ``registry`` (canonical form and known
+    mirrors), so a result already in the report is not added again.
+    """
+
+    registry = registry or SourceRegistry()
+    sections = report_model.setdefault("report_sections", {})
+    sources = _items(sections.get("sources"))
+    known_sources = {registry.primary(url) for url in map(source_url, sources) if url}
+    for note in notes:
+        results = note.get("results") or []
+        category = note.get("category")
+        if category == "aws_case_studies":
+            studies = _items(sections.get("aws_case_studies"))
+            sections["aws_case_studies"] = registry.dedupe(studies + [_case_study(hit) for hit in results])
+        elif category == "industry_analysis" and results:
+            market = _section(sections.get("market_competitive_intelligence"))
+            market["industry_research"] = [_reference(hit) for hit in results]
+            sections["market_competitive_intelligence"] = market
+        elif category == "technical_intelligence" and results:
+            technology = _section(sections.get("technology_infrastructure"))
+            technology["supplemental_research"] = [_reference(hit) for hit in results]
+            sections["technology_infrastructure"] = technology
+        elif category == "business_intelligence" and results:
+            profile = _section(sections.get("company_profile"))
+            profile["supplemental_research"] = [_reference(hit) for hit in results]
+            sections["company_profile"] = profile
+        for hit in results:
+            primary = registry.primary(hit["url"])
+            if primary not in known_sources:
+                known_sources.add(primary)
+                sources.append(hit["url"])
+    sections["sources"] = sources
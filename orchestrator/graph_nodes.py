@@ -1,39 +1,180 @@
 """Custom graph node adapters for deterministic workflow steps."""
 
+import asyncio
+import contextvars
+import functools
+import inspect
 import json
-from typing import Any, Callable, Optional
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 
 from strands.agent.agent_result import AgentResult
 from strands.multiagent.base import MultiAgentBase, MultiAgentResult, NodeResult, Status
+from strands.telemetry.metrics import EventLoopMetrics
 from strands.types.content import ContentBlock, Message
 
+from orchestrator.blobs import ref_default
+from orchestrator.budget import DeadlineExceeded, GuardedContext, current_budget, enter_node, exit_node
+from orchestrator.config import load_config
 from orchestrator.context import WorkflowContext
+from orchestrator.memo import NodeMemo, RecordingContext
+from orchestrator.speculation import node_finished
+from orchestrator.tracing import span
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Semaphores are bound to the loop they are awaited on, so limits are tracked
+# per running loop and shared by every graph executing on that loop.
+_node_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_node_executor() -> ThreadPoolExecutor:
+    """Return the bounded executor used for synchronous node functions."""
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = load_config()
+            _executor = ThreadPoolExecutor(
+                max_workers=config.node_executor_workers,
+                thread_name_prefix="workflow-node",
+            )
+        return _executor
+
+
+def _node_semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    limits = _node_limits.setdefault(asyncio.get_running_loop(), {})
+    semaphore = limits.get(name)
+    if semaphore is None:
+        semaphore = limits[name] = asyncio.Semaphore(limit)
+    return semaphore
 
 
 class FunctionNode(MultiAgentBase):
-    """Execute deterministic Python functions as graph nodes."""
+    """Execute deterministic Python functions as graph nodes.
+
+    Coroutine functions are awaited on the graph's event loop; plain functions
+    run on a shared bounded executor so parallel branches actually overlap.
+    ``max_concurrency`` caps how many invocations of this node (by name) may
+    run at once on the same loop, e.g. across concurrent workflows. With a
+    ``memo`` the node replays a stored result when its inputs are unchanged.
+
+    In ``reference`` result mode the return value is handed over through
+    ``context.node_results`` and the graph message carries only a short
+    summary; ``full`` mode serializes the whole value into the message.
+    """
 
     def __init__(
         self,
         func: Callable[..., Any],
         name: Optional[str] = None,
         context: Optional[WorkflowContext] = None,
+        max_concurrency: Optional[int] = None,
+        memo: Optional[NodeMemo] = None,
+        result_mode: Optional[str] = None,
     ) -> None:
         super().__init__()
         self.func = func
         self.name = name or func.__name__
         self.context = context
+        self.max_concurrency = max_concurrency
+        self.memo = memo
+        self.result_mode = result_mode or load_config().node_result_mode
+
+    async def _invoke(self, task: Any, context: Any) -> Any:
+        args = (task, context) if context is not None else (task,)
+        if inspect.iscoroutinefunction(self.func):
+            return await self.func(*args)
+
+        loop = asyncio.get_running_loop()
+        call_context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            get_node_executor(), functools.partial(call_context.run, self.func, *args)
+        )
+
+    async def _call(self, task: Any, context: Any = None) -> Any:
+        context = context if context is not None else self.context
+        window = enter_node(self.name)
+        if window is None:
+            return await self._invoke(task, context)
+
+        # A sync node keeps running on its thread after the deadline; the guard
+        # makes sure nothing it writes afterwards reaches the shared context.
+        token, deadline = window
+        guarded = GuardedContext(context) if context is not None else None
+        try:
+            return await asyncio.wait_for(self._invoke(task, guarded), max(deadline - time.monotonic(), 0.0))
+        except asyncio.TimeoutError:
+            if guarded is not None:
+                guarded.closed.set()
+            raise DeadlineExceeded(self.name) from None
+        finally:
+            exit_node(token)
+
+    async def _run(self, task: Any, node_span: Any) -> Any:
+        if self.memo is None or self.context is None:
+            return await self._call(task)
+
+        key = self.memo.key(task, self.context)
+        entry = self.memo.replay(key, self.context)
+        if entry is not None:
+            node_span.set(memo="hit")
+            return entry["result"]
+
+        recorder = RecordingContext(self.context)
+        result = await self._call(task, recorder)
+        # A run the budget cut short (this node or one upstream of it) produced a degraded result.
+        budget = current_budget()
+        saved = False
+        if budget is None or not budget.truncated:
+            saved = await asyncio.to_thread(self.memo.save, key, result, recorder.writes)
+        node_span.set(memo="miss" if saved else "miss_not_saved")
+        return result
+
+    def _message_text(self, result: Any) -> str:
+        if self.result_mode == "full" or self.context is None:
+            return json.dumps(result, ensure_ascii=True, default=ref_default)
+        self.context.node_results[self.name] = result
+        keys = sorted(result) if isinstance(result, dict) else [type(result).__name__]
+        return json.dumps({"node": self.name, "result_keys": keys})
 
-    async def invoke_async(self, task, invocation_state, **kwargs):
-        result = self.func(task, self.context) if self.context else self.func(task)
-        payload = json.dumps(result, ensure_ascii=True)
+    async def invoke_async(self, task, invocation_state=None, **kwargs):
+        started = time.perf_counter()
+        with span(self.name, "node") as node_span:
+            try:
+                if self.max_concurrency:
+                    async with _node_semaphore(self.name, self.max_concurrency):
+                        result = await self._run(task, node_span)
+                else:
+                    result = await self._run(task, node_span)
+            except DeadlineExceeded:
+                # Downstream nodes run on whatever the node wrote in time.
+                current_budget().mark(self.name, "timed_out")
+                node_span.set(deadline="exceeded")
+                result = {"deadline_exceeded": self.name}
+            finally:
+                node_finished(self.name)
+            payload = self._message_text(result)
+            node_span.set(bytes_out=len(payload))
+        execution_time = round((time.perf_counter() - started) * 1000)
 
         agent_result = AgentResult(
             stop_reason="end_turn",
             message=Message(role="assistant", content=[ContentBlock(text=payload)]),
+            metrics=EventLoopMetrics(),
+            state={},
         )
 
         return MultiAgentResult(
             status=Status.COMPLETED,
-            results={self.name: NodeResult(result=agent_result)},
+            results={
+                self.name: NodeResult(result=agent_result, execution_time=execution_time, status=Status.COMPLETED)
+            },
+            execution_time=execution_time,
         )
@@ -0,0 +1,225 @@
+"""Content-hashed memoization of workflow nodes for incremental re-runs.
+
+A node's key hashes everything it reads: its own source, the task (for the
+entry node), the ``WorkflowContext`` keys, prompt files and config fields
+named in its ``NodeInputs``, and the keys of its upstream nodes in the same
+run. Chaining upstream keys means a change anywhere invalidates every node
+after it. A stored entry holds the node's return value and the context
+writes it made, so a hit replays both without running the node.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from orchestrator.blobs import json_default, resolve
+from orchestrator.config import load_config
+from orchestrator.context import WorkflowContext
+from orchestrator.utils import atomic_write_text, load_prompt
+
+
+PACKAGE = "orchestrator"
+# Files named in node code that count as part of it (prompts, templates).
+DEPENDENCY_FILE_SUFFIXES = (".md", ".html")
+# Markers of a degraded output, which is not memoized.
+FAILURE_FLAGS = {"ok": False, "domain_accessible": False}
+FAILED_STATUSES = ("error", "timed_out")
+
+
+@dataclass(frozen=True)
+class NodeInputs:
+    context_keys: Tuple[str, ...] = ()
+    prompts: Tuple[str, ...] = ()
+    config_fields: Tuple[str, ...] = ()
+    upstream: Tuple[str, ...] = ()
+    include_task: bool = False
+
+
+class RecordingContext(WorkflowContext):
+    """Shares a ``WorkflowContext``'s data and remembers what the node wrote."""
+
+    def __init__(self, context: WorkflowContext) -> None:
+        super().__init__(data=context.data, node_results=context.node_results)
+        self.writes: Dict[str, Any] = {}
+
+    def set(self, key: str, value: Any) -> None:
+        self.writes[key] = value
+        super().set(key, value)
+
+    def set_blob(self, key: str, value: Any) -> None:
+        self.writes[key] = value
+        super().set_blob(key, value)
+
+
+class MemoStore:
+    def __init__(self, directory: str, ttl: float) -> None:
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, node: str, key: str) -> str:
+        return os.path.join(self.directory, node, f"{key}.json")
+
+    def get(self, node: str, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(node, key), "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+        if self.ttl and time.time() - entry.get("created_at", 0) > self.ttl:
+            return None
+        return entry
+
+    def put(self, node: str, key: str, result: Any, writes: Dict[str, Any]) -> None:
+        entry = {"created_at": time.time(), "result": result, "writes": writes}
+        atomic_write_text(self._path(node, key), json.dumps(entry, default=json_default))
+
+
+# Keys computed so far in the current run, by node name.
+_run_keys: ContextVar[Optional[Dict[str, str]]] = ContextVar("orchestrator_memo_keys", default=None)
+
+
+def begin_run():
+    return _run_keys.set({})
+
+
+def end_run(token) -> None:
+    _run_keys.reset(token)
+
+
+def _digest(value: Any) -> str:
+    # Blob references hash as their contents, so replayed plain values match.
+    encoded = json.dumps(value, sort_keys=True, default=json_default, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _source(obj: Any) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}"
+
+
+def _code_refs(code: Any) -> Tuple[set, set]:
+    """Global names and string constants used by ``code`` and the code nested in it."""
+
+    names, strings = set(code.co_names), set()
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            nested_names, nested_strings = _code_refs(const)
+            names |= nested_names
+            strings |= nested_strings
+        elif isinstance(const, str):
+            strings.add(const)
+    return names, strings
+
+
+def _dependencies(func: Callable[..., Any]) -> Tuple[List[Any], List[str]]:
+    """Functions and classes of this package ``func`` reaches, and the files they name."""
+
+    seen: Dict[int, Any] = {}
+    files: set = set()
+    pending = [func]
+    while pending:
+        obj = inspect.unwrap(pending.pop())
+        if id(obj) in seen:
+            continue
+        seen[id(obj)] = obj
+        if inspect.isclass(obj):
+            functions = [member for member in vars(obj).values() if inspect.isfunction(member)]
+        else:
+            functions = [obj] if inspect.isfunction(obj) else []
+        for function in functions:
+            names, strings = _code_refs(function.__code__)
+            for name in names:
+                target = function.__globals__.get(name)
+                if isinstance(target, str):
+                    strings.add(target)
+                if (inspect.isfunction(target) or inspect.isclass(target)) and str(
+                    getattr(target, "__module__", "")
+                ).startswith(PACKAGE):
+                    pending.append(target)
+            files |= {value for value in strings if value.endswith(DEPENDENCY_FILE_SUFFIXES) and os.path.isfile(value)}
+    ordered = sorted(seen.values(), key=lambda obj: f"{obj.__module__}.{getattr(obj, '__qualname__', '')}")
+    return ordered, sorted(files)
+
+
+def _source_hash(func: Callable[..., Any]) -> str:
+    """Hash of ``func``'s source, the package helpers it reaches, and the prompt files they read."""
+
+    functions, files = _dependencies(func)
+    digest = hashlib.sha256()
+    for obj in functions:
+        digest.update(_source(obj).encode("utf-8"))
+    for path in files:
+        digest.update(path.encode("utf-8"))
+        digest.update(load_prompt(path).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def has_failures(value: Any) -> bool:
+    """Whether a node output carries a failed fetch, an error or a timeout anywhere inside it."""
+
+    value = resolve(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in FAILURE_FLAGS and item is FAILURE_FLAGS[key]:
+                return True
+            if key in ("error", "deadline_exceeded") and item:
+                return True
+            if key == "status" and item in FAILED_STATUSES:
+                return True
+            if has_failures(item):
+                return True
+        return False
+    if isinstance(value, list):
+        return any(has_failures(item) for item in value)
+    return False
+
+
+class NodeMemo:
+    def __init__(self, store: MemoStore, name: str, func: Callable[..., Any], inputs: NodeInputs) -> None:
+        self.store = store
+        self.name = name
+        self.inputs = inputs
+        self.code_hash = _source_hash(func)
+
+    def key(self, task: Any, context: WorkflowContext) -> str:
+        config = load_config()
+        run_keys = _run_keys.get()
+        key = _digest(
+            {
+                "node": self.name,
+                "code": self.code_hash,
+                "task": task if self.inputs.include_task else None,
+                "context": {name: context.get(name) for name in self.inputs.context_keys},
+                "prompts": {path: load_prompt(path) for path in self.inputs.prompts},
+                "config": {name: getattr(config, name) for name in self.inputs.config_fields},
+                "upstream": {name: (run_keys or {}).get(name) for name in self.inputs.upstream},
+            }
+        )
+        if run_keys is not None:
+            run_keys[self.name] = key
+        return key
+
+    def replay(self, key: str, context: WorkflowContext) -> Optional[Dict[str, Any]]:
+        """Apply a stored entry's context writes and return it, or None on a miss."""
+
+        entry = self.store.get(self.name, key)
+        if entry is None:
+            return None
+        for name, value in entry["writes"].items():
+            context.set(name, value)
+        return entry
+
+    def save(self, key: str, result: Any, writes: Dict[str, Any]) -> bool:
+        """Store a result unless it (or what the node wrote) carries failures; returns whether it was stored."""
+
+        if has_failures(result) or has_failures(writes):
+            return False
+        self.store.put(self.name, key, result, writes)
+        return True
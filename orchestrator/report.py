@@ -1,112 +1,86 @@
-"""HTML report generator for AWS customer intelligence."""
+"""HTML report generator for AWS customer intelligence.
 
-from typing import Any, Dict, List
+The Jinja2 template in ``orchestrator/templates/report.html`` is compiled once
+at import. Rendering autoescapes every value from the report model and can
+stream chunks straight to a file handle instead of building one string.
+"""
+
+import os
+from typing import Any, Dict, Iterator, TextIO
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from orchestrator.utils import utc_timestamp
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
 
-AWS_STYLES = """
-:root {
-  --aws-orange: #FF9900;
-  --aws-dark-blue: #232F3E;
-  --aws-light-gray: #F2F3F3;
-  --aws-white: #FFFFFF;
-}
-body {
-  font-family: Arial, sans-serif;
-  margin: 0;
-  padding: 0;
-  background: var(--aws-light-gray);
-  color: #111;
-}
-header {
-  background: var(--aws-dark-blue);
-  color: var(--aws-white);
-  padding: 24px 32px;
-}
-header h1 { margin: 0; }
-section {
-  background: var(--aws-white);
-  margin: 16px 32px;
-  padding: 16px 20px;
-  border-radius: 8px;
-}
-section h2 {
-  color: var(--aws-dark-blue);
-  border-bottom: 2px solid var(--aws-orange);
-  padding-bottom: 8px;
-}
-.badge {
-  display: inline-block;
-  padding: 4px 8px;
-  border-radius: 4px;
-  background: var(--aws-orange);
-  color: #111;
-  font-weight: bold;
-}
-ul { padding-left: 20px; }
-small { color: #555; }
-"""
+# report_sections rendered generically after the fixed sections, in order.
+EXTRA_SECTIONS = [
+    ("business_challenges_and_aws_opportunities", "Business Challenges & AWS Opportunities"),
+    ("market_competitive_intelligence", "Market & Competitive Intelligence"),
+    ("technology_infrastructure", "Technology & Infrastructure"),
+    ("leadership", "Leadership"),
+    ("recent_developments", "Recent Developments"),
+    ("methodology_confidence", "Methodology & Confidence"),
+    ("sources", "Sources"),
+]
+FIXED_SECTIONS = {"executive_summary", "company_profile", "aws_case_studies", "strategic_recommendations"}
 
 
-def _list_items(items: List[str]) -> str:
-    if not items:
-        return "<p>Not available.</p>"
-    return "<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>"
+def _is_url(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(("https://", "http://"))
 
 
-def render_html_report(report_model: Dict[str, Any]) -> str:
-    meta = report_model.get("report_metadata", {})
-    company = report_model.get("report_sections", {}).get("company_profile", {})
-    exec_summary = report_model.get("report_sections", {}).get("executive_summary", "")
-    aws_cases = report_model.get("report_sections", {}).get("aws_case_studies", [])
-    recommendations = report_model.get("report_sections", {}).get("strategic_recommendations", [])
+def _safe_url(value: Any) -> str:
+    """Only http(s) links survive; anything else (e.g. ``javascript:``) becomes ``#``."""
 
-    title = f"AWS Customer Intelligence Report - {meta.get('validated_company_name', 'Unknown')}"
+    return value if _is_url(value) else "#"
+
+
+def _label(key: Any) -> str:
+    return str(key).replace("_", " ").capitalize()
 
-    case_study_html = "".join(
-        f"<li><a href=\"{case.get('url', '#')}\" target=\"_blank\" rel=\"noopener noreferrer\">{case.get('company', 'Case Study')}</a> - {case.get('business_outcomes', [''])[0]}</li>"
-        for case in aws_cases
-    )
 
-    rec_html = "".join(
-        f"<li><strong>{rec.get('priority', 'Priority')}:</strong> {rec.get('recommendation', '')}</li>"
-        for rec in recommendations
+def _environment() -> Environment:
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
     )
+    environment.filters["safe_url"] = _safe_url
+    environment.filters["label"] = _label
+    environment.tests["url"] = _is_url
+    return environment
+
+
+REPORT_TEMPLATE = _environment().get_template("report.html")
 
-    return f"""<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"UTF-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\" />
-  <title>{title}</title>
-  <style>{AWS_STYLES}</style>
-</head>
-<body>
-  <header>
-    <h1>{title}</h1>
-    <p><span class=\"badge\">Confidence: {meta.get('overall_confidence', 'UNKNOWN')}</span></p>
-    <small>Generated: {utc_timestamp()}</small>
-  </header>
-
-  <section>
-    <h2>Executive Summary</h2>
-    <p>{exec_summary or 'Not available.'}</p>
-  </section>
-
-  <section>
-    <h2>Company Profile</h2>
-    <p>{company.get('description', 'Not available.')}</p>
-  </section>
-
-  <section>
-    <h2>Relevant AWS Case Studies</h2>
-    <ul>{case_study_html or '<li>Not available.</li>'}</ul>
-  </section>
-
-  <section>
-    <h2>Strategic Recommendations</h2>
-    <ul>{rec_html or '<li>Not available.</li>'}</ul>
-  </section>
-</body>
-</html>"""
+
+def _template_context(report_model: Dict[str, Any]) -> Dict[str, Any]:
+    meta = report_model.get("report_metadata", {})
+    sections = report_model.get("report_sections", {})
+    extra = [(key, heading) for key, heading in EXTRA_SECTIONS if key in sections]
+    known = FIXED_SECTIONS | {key for key, _ in EXTRA_SECTIONS}
+    extra += [(key, _label(key)) for key in sections if key not in known]
+    return {
+        "title": f"AWS Customer Intelligence Report - {meta.get('validated_company_name', 'Unknown')}",
+        "meta": meta,
+        "sections": sections,
+        "extra_sections": extra,
+        "generated_at": utc_timestamp(),
+    }
+
+
+def iter_html_report(report_model: Dict[str, Any]) -> Iterator[str]:
+    """Render the report lazily, one template chunk at a time."""
+
+    return REPORT_TEMPLATE.generate(**_template_context(report_model))
+
+
+def stream_html_report(report_model: Dict[str, Any], handle: TextIO) -> None:
+    for chunk in iter_html_report(report_model):
+        handle.write(chunk)
+
+
+def render_html_report(report_model: Dict[str, Any]) -> str:
+    return "".join(iter_html_report(report_model))
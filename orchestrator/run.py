@@ -1,21 +1,56 @@
 """CLI entry for running the Strands workflow."""
 
+import argparse
 import json
 import sys
+import uuid
 
+from orchestrator.batch import run_batch_cli
+from orchestrator.blobs import json_default
 from orchestrator.workflow import run_workflow
 
 
 def main() -> None:
-    if len(sys.argv) < 2:
-        raise SystemExit("Usage: python -m orchestrator.run <input.json>")
-
-    input_path = sys.argv[1]
-    with open(input_path, "r", encoding="utf-8") as handle:
-        payload = json.load(handle)
-
-    result = run_workflow(payload)
-    print(json.dumps(result, indent=2))
+    parser = argparse.ArgumentParser(prog="aws-intel-run", description="Run the customer intelligence workflow.")
+    parser.add_argument("input", nargs="?", help="MasterInput JSON file for a single run")
+    parser.add_argument("--batch", metavar="JSONL", help="Run one workflow per JSONL record ('-' for stdin)")
+    parser.add_argument("--output", metavar="NDJSON", help="Batch results file (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent workflows in batch mode")
+    parser.add_argument("--perplexity-concurrency", type=int, help="Maximum concurrent Perplexity research branches")
+    parser.add_argument("--tavily-concurrency", type=int, help="Maximum concurrent Tavily research branches")
+    parser.add_argument("--trace", action="store_true", help="Record spans and write a trace file per run")
+    parser.add_argument("--run-id", help="Run ID for checkpoints and traces (default: random)")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume a failed run from its last checkpoint")
+    args = parser.parse_args()
+
+    if args.batch:
+        provider_limits = {
+            provider: limit
+            for provider, limit in (
+                ("perplexity", args.perplexity_concurrency),
+                ("tavily", args.tavily_concurrency),
+            )
+            if limit
+        }
+        summary = run_batch_cli(args.batch, args.output, args.concurrency, provider_limits, trace=args.trace or None)
+        print(json.dumps(summary, indent=2), file=sys.stderr)
+        return
+
+    if args.resume:
+        run_id, payload = args.resume, None
+    elif args.input:
+        run_id = args.run_id or uuid.uuid4().hex
+        with open(args.input, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    else:
+        parser.error("an input JSON file, --batch or --resume is required")
+
+    try:
+        result = run_workflow(payload, trace=args.trace or None, run_id=run_id, resume=bool(args.resume))
+    except Exception:
+        print(f"run {run_id} failed; continue it with --resume {run_id}", file=sys.stderr)
+        raise
+    print(json.dumps(result, indent=2, default=json_default))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,247 @@
+"""Long-running research service with a job queue and warm workflow state.
+
+Config, prompts, built graphs, research agents and pooled HTTP clients are
+created once at startup, so each job only pays for its own research work. The service speaks
+a small JSON-over-HTTP protocol on a TCP port or a Unix socket:
+
+    POST /jobs              submit a MasterInput payload -> {"job_id": ...}
+    GET  /jobs              list jobs
+    GET  /jobs/<id>         job status (and result once finished)
+    GET  /jobs/<id>/events  stream status changes as NDJSON until finished
+    GET  /health            queue depth, worker count and agent pool counters
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from orchestrator.agents.perplexity_agent import perplexity_agent_pool
+from orchestrator.agents.pool import agent_pool_stats
+from orchestrator.agents.tavily_agent import tavily_agent_pool
+from orchestrator.blobs import json_default
+from orchestrator.config import load_config
+from orchestrator.schemas import MasterInput
+from orchestrator.tools.http_client import aclose_clients
+from orchestrator.utils import load_prompt
+from orchestrator.workflow import WorkflowPool, run_workflow_async
+
+TERMINAL_STATES = {"completed", "failed"}
+PROMPT_PATHS = ["prompts/PERPLEXITY_AGENT.md", "prompts/TAVILY_AGENT.md"]
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+@dataclass
+class Job:
+    job_id: str
+    payload: Dict[str, Any]
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    watchers: List["asyncio.Queue[Dict[str, Any]]"] = field(default_factory=list)
+
+    def snapshot(self, include_result: bool = False) -> Dict[str, Any]:
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "target_domain": self.payload.get("target_domain"),
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class ResearchService:
+    """Accepts research jobs and runs them on a fixed set of workers."""
+
+    def __init__(self, workers: int = 4, max_finished_jobs: int = 1000) -> None:
+        self.workers = workers
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.queue: "asyncio.Queue[Job]" = asyncio.Queue()
+        self.pool: Optional[WorkflowPool] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        load_config()
+        for path in PROMPT_PATHS:
+            load_prompt(path)
+        self.pool = WorkflowPool(size=self.workers)
+        await asyncio.to_thread(perplexity_agent_pool().warm, self.workers)
+        await asyncio.to_thread(tavily_agent_pool().warm, self.workers)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await aclose_clients()
+
+    def submit(self, payload: Dict[str, Any]) -> Job:
+        MasterInput(**payload)
+        job = Job(job_id=uuid.uuid4().hex, payload=payload)
+        self.jobs[job.job_id] = job
+        self.queue.put_nowait(job)
+        self._prune()
+        return job
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in TERMINAL_STATES]
+        for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+    def _update(self, job: Job, **changes: Any) -> None:
+        for key, value in changes.items():
+            setattr(job, key, value)
+        snapshot = job.snapshot()
+        for watcher in job.watchers:
+            watcher.put_nowait(snapshot)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self.queue.get()
+            self._update(job, status="running", started_at=time.time())
+            try:
+                result = await run_workflow_async(job.payload, pool=self.pool, run_id=job.job_id)
+                status = result["status"].value
+                self._update(
+                    job,
+                    status="completed" if status == "completed" else "failed",
+                    result={**result, "status": status},
+                    finished_at=time.time(),
+                )
+            except Exception as exc:
+                self._update(job, status="failed", error=f"{type(exc).__name__}: {exc}", finished_at=time.time())
+            finally:
+                self.queue.task_done()
+
+    def health(self) -> Dict[str, Any]:
+        running = sum(1 for job in self.jobs.values() if job.status == "running")
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "running": running,
+            "agent_pools": agent_pool_stats(),
+        }
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    body = await reader.readexactly(length) if length else b""
+    return method, path.split("?", 1)[0], body
+
+
+def _response(status: int, body: Dict[str, Any], streaming: bool = False) -> bytes:
+    head = f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/"
+    if streaming:
+        return (head + "x-ndjson\r\nConnection: close\r\n\r\n").encode("latin-1")
+    payload = json.dumps(body, default=json_default).encode("utf-8")
+    head += f"json\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+    return head.encode("latin-1") + payload
+
+
+async def _stream_events(job: Job, writer: asyncio.StreamWriter) -> None:
+    watcher: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    job.watchers.append(watcher)
+    try:
+        writer.write(_response(200, {}, streaming=True))
+        snapshot = job.snapshot()
+        while True:
+            writer.write((json.dumps(snapshot, default=json_default) + "\n").encode("utf-8"))
+            await writer.drain()
+            if snapshot["status"] in TERMINAL_STATES:
+                return
+            snapshot = await watcher.get()
+    finally:
+        job.watchers.remove(watcher)
+
+
+def make_handler(service: ResearchService):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, body = await _read_request(reader)
+            parts = [part for part in path.split("/") if part]
+            job = service.jobs.get(parts[1]) if len(parts) >= 2 and parts[0] == "jobs" else None
+
+            if parts == ["health"] and method == "GET":
+                writer.write(_response(200, service.health()))
+            elif parts == ["jobs"] and method == "POST":
+                try:
+                    submitted = service.submit(json.loads(body or b"{}"))
+                    writer.write(_response(202, submitted.snapshot()))
+                except (ValueError, TypeError, ValidationError) as exc:
+                    writer.write(_response(400, {"error": str(exc)}))
+            elif parts == ["jobs"] and method == "GET":
+                writer.write(_response(200, {"jobs": [job.snapshot() for job in service.jobs.values()]}))
+            elif job is None:
+                writer.write(_response(404, {"error": "not found"}))
+            elif method != "GET":
+                writer.write(_response(405, {"error": "method not allowed"}))
+            elif len(parts) == 2:
+                writer.write(_response(200, job.snapshot(include_result=True)))
+            elif parts[2:] == ["events"]:
+                await _stream_events(job, writer)
+            else:
+                writer.write(_response(404, {"error": "not found"}))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str, port: int, unix_socket: Optional[str], workers: int) -> None:
+    service = ResearchService(workers=workers)
+    await service.start()
+    handler = make_handler(service)
+    if unix_socket:
+        server = await asyncio.start_unix_server(handler, path=unix_socket)
+    else:
+        server = await asyncio.start_server(handler, host=host, port=port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="aws-intel-serve", description="Run the research job service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent research jobs")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Speculative start of the research branches while domain verification runs.
+
+Verification rarely changes what the research branches are told: their
+handoffs only read the identity fields in ``HANDOFF_FIELDS``, which can be
+predicted from the validated input. In speculative mode both branches start
+from that prediction as soon as the input is validated. Once verification
+finishes, a branch whose prediction still holds keeps its result. Otherwise
+the speculative agent is told to stop calling tools, its result is dropped,
+and the branch restarts from the verified record.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from strands.hooks import BeforeToolCallEvent, HookProvider, HookRegistry
+
+from orchestrator.context import WorkflowContext
+from orchestrator.tracing import annotate
+
+VERIFICATION_NODE = "domain_verification"
+
+# Verification fields the research handoffs depend on.
+HANDOFF_FIELDS = (
+    "target_domain",
+    "official_company_name",
+    "industry_preliminary",
+    "disambiguation_required",
+    "exclusion_list",
+    "similar_companies",
+)
+
+
+class Speculation:
+    """Per-run state: whether verification has finished, and how speculation went."""
+
+    def __init__(self) -> None:
+        self.verified = asyncio.Event()
+        self.counters = {"started": 0, "confirmed": 0, "restarted": 0}
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+_speculation: ContextVar[Optional[Speculation]] = ContextVar("orchestrator_speculation", default=None)
+# Set inside a speculative branch; raised when the branch is abandoned.
+_cancelled: ContextVar[Optional[threading.Event]] = ContextVar("orchestrator_speculation_cancel", default=None)
+
+
+def activate_speculation(speculation: Speculation):
+    return _speculation.set(speculation)
+
+
+def deactivate_speculation(token) -> None:
+    _speculation.reset(token)
+
+
+def node_finished(name: str) -> None:
+    """Called by ``FunctionNode`` when a node finishes, however it finished."""
+
+    speculation = _speculation.get()
+    if speculation is not None and name == VERIFICATION_NODE:
+        speculation.verified.set()
+
+
+def handoff_view(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: record.get(name) for name in HANDOFF_FIELDS}
+
+
+def _run_branch(cancel: Optional[threading.Event], run: Callable[[Dict[str, Any]], Any], record: Dict[str, Any]) -> Any:
+    _cancelled.set(cancel)
+    return run(record)
+
+
+async def _in_executor(run: Callable[[Dict[str, Any]], Any], record: Dict[str, Any], cancel=None) -> Any:
+    # Imported here: graph_nodes imports this module.
+    from orchestrator.graph_nodes import get_node_executor
+
+    call_context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_node_executor(), functools.partial(call_context.run, _run_branch, cancel, run, record)
+    )
+
+
+async def research_branch(
+    context: WorkflowContext,
+    predicted: Dict[str, Any],
+    run: Callable[[Dict[str, Any]], Any],
+) -> Tuple[Dict[str, Any], Any]:
+    """Run ``run(verification_record)`` and return ``(record used, result)``.
+
+    Without an active speculation the branch waits for nothing and uses the
+    verification record in ``context``, as the graph edges already ordered it.
+    """
+
+    speculation = _speculation.get()
+    if speculation is None or speculation.verified.is_set():
+        record = context.get(VERIFICATION_NODE) or {}
+        return record, await _in_executor(run, record)
+
+    speculation.counters["started"] += 1
+    cancel = threading.Event()
+    branch = asyncio.ensure_future(_in_executor(run, predicted, cancel))
+    try:
+        await speculation.verified.wait()
+    except BaseException:
+        cancel.set()
+        branch.cancel()
+        raise
+
+    # A verification that produced nothing (failed or out of time) cannot
+    # contradict the prediction.
+    verified = context.get(VERIFICATION_NODE)
+    if not verified or handoff_view(verified) == handoff_view(predicted):
+        speculation.counters["confirmed"] += 1
+        annotate(speculation="confirmed")
+        return predicted, await branch
+
+    speculation.counters["restarted"] += 1
+    annotate(speculation="restarted")
+    cancel.set()
+    branch.cancel()
+    return verified, await _in_executor(run, verified)
+
+
+class SpeculationHooks(HookProvider):
+    """Cancels an abandoned speculative agent's tool calls so it finishes quickly."""
+
+    def __init__(self, cancel: threading.Event) -> None:
+        self.cancel = cancel
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+
+    def _before_tool(self, event: BeforeToolCallEvent) -> None:
+        if self.cancel.is_set():
+            event.cancel_tool = "Research inputs changed: do not call any more tools. Return an empty JSON object now."
+
+
+def speculation_hooks() -> List[HookProvider]:
+    """Agent hooks for a speculative branch; empty outside one."""
+
+    cancel = _cancelled.get()
+    return [] if cancel is None else [SpeculationHooks(cancel)]
@@ -0,0 +1,118 @@
+"""Micro-batching of single-key requests into one multi-key upstream call.
+
+Callers submit one key and get a ``concurrent.futures.Future``. A key
+submitted while nothing is pending or in flight is sent at once, so a lone
+request never waits. Keys arriving while a batch is in flight collect for up
+to ``window`` seconds (or until ``max_size`` keys are pending) and are sent
+together through ``fetch_many``; each caller's future receives its own entry.
+A batch is sent with the extra arguments and the ``contextvars`` context of
+its first request, so per-call settings and trace spans go with it. With a
+``group`` function, requests are batched only with others from the same group
+(e.g. the same run), so a batch never runs in another caller's context. Sync
+callers block on the future; async callers await it with
+``asyncio.wrap_future``. Batches are sent from a small private thread pool, so
+submitting never blocks an event loop.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+_Pending = Tuple[str, Future, Tuple[Any, ...], contextvars.Context]
+
+
+class _Group:
+    def __init__(self) -> None:
+        self.pending: List[_Pending] = []
+        self.in_flight = 0
+        self.timer: Optional[threading.Timer] = None
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        fetch_many: Callable[..., Dict[str, Any]],
+        missing: Callable[[str], Any],
+        window: float,
+        max_size: int,
+        name: str = "batch",
+        group: Optional[Callable[[], Hashable]] = None,
+    ) -> None:
+        self.fetch_many = fetch_many
+        self.missing = missing
+        self.window = window
+        self.max_size = max_size
+        self.group = group
+        self._groups: Dict[Hashable, _Group] = {}
+        self._lock = threading.Lock()
+        self._senders = ThreadPoolExecutor(max_workers=4, thread_name_prefix=f"{name}-sender")
+        self._counters = {"requests": 0, "batches": 0, "keys_sent": 0}
+
+    def submit(self, key: str, *args: Any) -> Future:
+        """Queue ``key``; its batch calls ``fetch_many(*args, keys)`` with the first request's ``args``."""
+
+        future: Future = Future()
+        name = self.group() if self.group is not None else None
+        with self._lock:
+            group = self._groups.setdefault(name, _Group())
+            group.pending.append((key, future, args, contextvars.copy_context()))
+            self._counters["requests"] += 1
+            if len(group.pending) >= self.max_size or (len(group.pending) == 1 and not group.in_flight):
+                batch = self._take(group)
+                group.in_flight += 1
+                self._senders.submit(self._send, name, batch)
+            elif group.timer is None:
+                group.timer = threading.Timer(self.window, self._flush, (name,))
+                group.timer.daemon = True
+                group.timer.start()
+        return future
+
+    def _take(self, group: _Group) -> List[_Pending]:
+        if group.timer is not None:
+            group.timer.cancel()
+            group.timer = None
+        batch, group.pending = group.pending, []
+        return batch
+
+    def _flush(self, name: Hashable) -> None:
+        with self._lock:
+            group = self._groups.get(name)
+            # The timer fired just as a full batch was taken and sent.
+            batch = self._take(group) if group is not None else []
+            if batch:
+                group.in_flight += 1
+        if batch:
+            self._send(name, batch)
+
+    def _send(self, name: Hashable, batch: List[_Pending]) -> None:
+        keys = list(dict.fromkeys(key for key, _, _, _ in batch))
+        _, _, args, context = batch[0]
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["keys_sent"] += len(keys)
+        try:
+            results = context.run(self.fetch_many, *args, keys)
+        except BaseException as exc:
+            for _, future, _, _ in batch:
+                future.set_exception(exc)
+            return
+        else:
+            for key, future, _, _ in batch:
+                future.set_result(results[key] if key in results else self.missing(key))
+        finally:
+            with self._lock:
+                group = self._groups[name]
+                group.in_flight -= 1
+                if not group.in_flight and not group.pending:
+                    # Don't keep a finished run's context objects alive.
+                    del self._groups[name]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            groups = list(self._groups.values())
+            return {
+                **self._counters,
+                "pending": sum(len(group.pending) for group in groups),
+                "in_flight": sum(group.in_flight for group in groups),
+            }
@@ -0,0 +1,245 @@
+"""Persistent response cache for Tavily search and extract calls.
+
+Responses are stored in SQLite keyed by a hash of the normalized request, with
+a TTL per endpoint, a shorter TTL for failed responses (negative caching) and
+least-recently-used eviction once the stored payloads exceed a byte budget.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from orchestrator.config import AppConfig
+from orchestrator.tracing import annotate
+from orchestrator.utils import canonicalize_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+# Rate limiting and timeouts are transient; caching them would pin the failure.
+_TRANSIENT_STATUS = {408, 425, 429}
+
+
+def _digest(endpoint: str, params: Dict[str, Any]) -> str:
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{endpoint}:{encoded}".encode("utf-8")).hexdigest()
+
+
+def _domains(domains: Optional[list[str]]) -> list[str]:
+    return sorted({domain.strip().lower() for domain in domains or [] if domain.strip()})
+
+
+def search_key(
+    query: str,
+    max_results: int,
+    include_domains: Optional[list[str]] = None,
+    exclude_domains: Optional[list[str]] = None,
+    timeframe: Optional[str] = None,
+) -> str:
+    return _digest(
+        "search",
+        {
+            "query": " ".join(query.lower().split()),
+            "max_results": max_results,
+            "include_domains": _domains(include_domains),
+            "exclude_domains": _domains(exclude_domains),
+            "timeframe": (timeframe or "").strip().lower(),
+        },
+    )
+
+
+def extract_key(url: str) -> str:
+    return _digest("extract", {"url": canonicalize_url(url)})
+
+
+def _cacheable_failure(result: Dict[str, Any]) -> bool:
+    status = result.get("status")
+    return status is not None and 400 <= status < 500 and status not in _TRANSIENT_STATUS
+
+
+class ResponseCache:
+    """SQLite-backed cache shared by every thread in the process."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        ttls: Dict[str, float],
+        negative_ttl: float,
+    ) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._total_bytes = self._stored_bytes()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _count(self, endpoint: str, counter: str) -> None:
+        counters = self._stats.setdefault(
+            endpoint, {"hits": 0, "negative_hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+        )
+        counters[counter] += 1
+
+    def get(self, endpoint: str, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, ok, expires_at, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count(endpoint, "misses")
+                return None
+            value, ok, expires_at, size = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self._count(endpoint, "expired")
+                self._count(endpoint, "misses")
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._count(endpoint, "hits" if ok else "negative_hits")
+        return json.loads(value)
+
+    def put(self, endpoint: str, key: str, result: Dict[str, Any]) -> None:
+        if result.get("ok"):
+            ttl = self.ttls.get(endpoint, 0)
+        elif _cacheable_failure(result):
+            ttl = self.negative_ttl
+        else:
+            return
+        if ttl <= 0:
+            return
+
+        value = json.dumps(result, separators=(",", ":"))
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, value, size, ok, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, value, size, int(bool(result.get("ok"))), now + ttl, now),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._count(endpoint, "stores")
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        # Other processes may share the file, so work from the stored total.
+        total = self._stored_bytes()
+        rows = self._conn.execute("SELECT key, endpoint, size FROM responses ORDER BY last_access").fetchall()
+        evicted = []
+        for key, endpoint, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+            self._count(endpoint, "evictions")
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self._total_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self._total_bytes,
+                "endpoints": {endpoint: dict(counters) for endpoint, counters in self._stats.items()},
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(config: AppConfig) -> Optional[ResponseCache]:
+    if not config.cache_enabled:
+        return None
+    with _caches_lock:
+        cache = _caches.get(config.cache_path)
+        if cache is None:
+            cache = _caches[config.cache_path] = ResponseCache(
+                config.cache_path,
+                max_bytes=config.cache_max_bytes,
+                ttls={"search": config.cache_search_ttl, "extract": config.cache_extract_ttl},
+                negative_ttl=config.cache_negative_ttl,
+            )
+        return cache
+
+
+def cached_call(
+    config: AppConfig,
+    endpoint: str,
+    key: str,
+    fetch: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    cache = get_response_cache(config)
+    if cache is None:
+        return fetch()
+    hit = cache.get(endpoint, key)
+    if hit is not None:
+        annotate(cache="hit" if hit.get("ok") else "negative_hit")
+        return hit
+    annotate(cache="miss")
+    result = fetch()
+    cache.put(endpoint, key, result)
+    return result
+
+
+async def acached_call(
+    config: AppConfig,
+    endpoint: str,
+    key: str,
+    fetch: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    cache = get_response_cache(config)
+    if cache is None:
+        return await fetch()
+    # SQLite reads and writes block, so keep them off the event loop.
+    hit = await asyncio.to_thread(cache.get, endpoint, key)
+    if hit is not None:
+        annotate(cache="hit" if hit.get("ok") else "negative_hit")
+        return hit
+    annotate(cache="miss")
+    result = await fetch()
+    await asyncio.to_thread(cache.put, endpoint, key, result)
+    return result
@@ -0,0 +1,301 @@
+"""Local BM25 index of AWS case studies seen in earlier runs.
+
+Case studies from ``tavily_report["aws_case_studies"]`` and case-study-like
+Tavily search results are stored in SQLite with an inverted index (term ->
+document, weighted term frequency). Industry, AWS services and business
+outcomes weigh more than free text, so a query such as "AWS case study
+healthcare data lake" ranks same-industry studies first. Documents are keyed
+by canonical URL; seeing a URL again merges the new fields into the stored
+document and re-indexes it. ``search_case_studies`` answers from the index
+and only searches the web when it has too few fresh matches.
+"""
+
+import asyncio
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from orchestrator.config import AppConfig
+from orchestrator.tools.tavily import tavily_search, tavily_search_async
+from orchestrator.tracing import annotate, span
+from orchestrator.utils import canonicalize_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    payload TEXT NOT NULL,
+    length REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf REAL NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+"""
+
+K1 = 1.2
+B = 0.75
+
+# Term weight per document field; anything not listed counts once.
+FIELD_WEIGHTS = {
+    "industry": 3.0,
+    "aws_services": 2.0,
+    "business_outcomes": 2.0,
+    "business_challenge": 1.5,
+    "company": 1.5,
+    "title": 1.5,
+}
+TEXT_FIELDS = ("company", "title", "industry", "business_challenge", "aws_services", "business_outcomes",
+               "content", "summary", "quote")
+
+# Words every case study shares carry no ranking signal.
+STOPWORDS = frozenset(
+    "a an and are as at by for from in into is it of on or the to with aws amazon web services case study "
+    "studies customer customers success story stories how".split()
+)
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+.-]*[a-z0-9+]|[a-z0-9]")
+_CASE_STUDY_HINTS = ("case-stud", "case stud", "customer-stor", "customer stor", "success stor")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(_field_text(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return " ".join(_field_text(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def _term_frequencies(document: Dict[str, Any]) -> Counter:
+    weights: Counter = Counter()
+    for field in TEXT_FIELDS:
+        weight = FIELD_WEIGHTS.get(field, 1.0)
+        for token in tokenize(_field_text(document.get(field))):
+            weights[token] += weight
+    return weights
+
+
+def looks_like_case_study(result: Dict[str, Any]) -> bool:
+    haystack = f"{result.get('url', '')} {result.get('title', '')}".lower()
+    return any(hint in haystack for hint in _CASE_STUDY_HINTS)
+
+
+class CaseStudyIndex:
+    """SQLite-backed inverted index shared by every thread in the process."""
+
+    def __init__(self, path: str, max_age: float = 0) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._stats = {"queries": 0, "hits": 0, "misses": 0, "upserts": 0}
+
+    def add(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Insert or merge documents (each needs a ``url``); returns how many were indexed."""
+
+        now = time.time()
+        indexed = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for document in documents:
+                    url = document.get("url")
+                    if not isinstance(url, str) or not url.strip():
+                        continue
+                    key = canonicalize_url(url)
+                    row = self._conn.execute("SELECT id, payload FROM documents WHERE url = ?", (key,)).fetchone()
+                    merged = json.loads(row[1]) if row else {}
+                    merged.update({name: value for name, value in document.items() if value not in (None, "", [])})
+                    frequencies = _term_frequencies(merged)
+                    length = sum(frequencies.values())
+                    if row:
+                        doc_id = row[0]
+                        self._conn.execute(
+                            "UPDATE documents SET payload = ?, length = ?, updated_at = ? WHERE id = ?",
+                            (json.dumps(merged), length, now, doc_id),
+                        )
+                        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                    else:
+                        doc_id = self._conn.execute(
+                            "INSERT INTO documents (url, payload, length, updated_at) VALUES (?, ?, ?, ?)",
+                            (key, json.dumps(merged), length, now),
+                        ).lastrowid
+                    self._conn.executemany(
+                        "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                        [(term, doc_id, tf) for term, tf in frequencies.items()],
+                    )
+                    indexed += 1
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._stats["upserts"] += indexed
+        return indexed
+
+    def search(self, query: str, industry: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Documents ranked by BM25 against ``query`` (plus ``industry`` terms).
+
+        Each result carries ``coverage``: the share of the query's terms it contains.
+        """
+
+        terms = sorted(set(tokenize(f"{query} {industry or ''}")))
+        if not terms:
+            return []
+        cutoff = time.time() - self.max_age if self.max_age else 0.0
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            total, average = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(AVG(length), 0) FROM documents"
+            ).fetchone()
+            if not total:
+                return []
+            frequencies = dict(
+                self._conn.execute(
+                    f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+                ).fetchall()
+            )
+            rows = self._conn.execute(
+                f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p JOIN documents d ON d.id = p.doc_id "
+                f"WHERE p.term IN ({placeholders}) AND d.updated_at >= ?",
+                (*terms, cutoff),
+            ).fetchall()
+
+            scores: Dict[int, float] = {}
+            matched: Dict[int, int] = {}
+            for term, doc_id, tf, length in rows:
+                df = frequencies[term]
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / (average or 1.0)))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            results = []
+            for doc_id, score in ranked:
+                payload = self._conn.execute("SELECT payload FROM documents WHERE id = ?", (doc_id,)).fetchone()[0]
+                coverage = round(matched[doc_id] / len(terms), 3)
+                results.append({**json.loads(payload), "score": round(score, 4), "coverage": coverage})
+        return results
+
+    def count(self, result: str) -> None:
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats[result] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            terms = self._conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+            return {"documents": documents, "terms": terms, **self._stats}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[str, CaseStudyIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_case_index(config: AppConfig) -> Optional[CaseStudyIndex]:
+    if not config.case_index_enabled:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(config.case_index_path)
+        if index is None:
+            index = _indexes[config.case_index_path] = CaseStudyIndex(
+                config.case_index_path, max_age=config.case_index_max_age
+            )
+        return index
+
+
+def index_case_studies(config: AppConfig, studies: Any, industry: Optional[str] = None) -> int:
+    """Index ``aws_case_studies`` entries from a Tavily report."""
+
+    index = get_case_index(config)
+    if index is None or not isinstance(studies, list):
+        return 0
+    documents = [
+        {"industry": industry, **study} if industry and not study.get("industry") else study
+        for study in studies
+        if isinstance(study, dict)
+    ]
+    return index.add(documents)
+
+
+def index_search_results(config: AppConfig, result: Dict[str, Any], industry: Optional[str] = None) -> int:
+    """Index the case-study-like hits of a Tavily search response."""
+
+    index = get_case_index(config)
+    if index is None or not result.get("ok"):
+        return 0
+    hits = (result.get("data") or {}).get("results") or []
+    documents = [
+        {"url": hit.get("url"), "title": hit.get("title"), "content": hit.get("content"), "industry": industry}
+        for hit in hits
+        if isinstance(hit, dict) and looks_like_case_study(hit)
+    ]
+    return index.add(documents)
+
+
+def _lookup(config: AppConfig, query: str, industry: Optional[str], max_results: int) -> Optional[Dict[str, Any]]:
+    index = get_case_index(config)
+    if index is None:
+        return None
+    # Only results that match most of the query count: a warm index shares
+    # common terms ("cloud", "data") with almost any query.
+    results = [
+        result
+        for result in index.search(query, industry=industry, limit=max_results)
+        if result["coverage"] >= config.case_index_min_coverage
+    ]
+    if len(results) < min(config.case_index_min_results, max_results):
+        index.count("misses")
+        annotate(case_index="miss", indexed_matches=len(results))
+        return None
+    index.count("hits")
+    annotate(case_index="hit", indexed_matches=len(results))
+    return {"ok": True, "source": "index", "data": {"query": query, "results": results}}
+
+
+def search_case_studies(
+    config: AppConfig, query: str, industry: Optional[str] = None, max_results: int = 5
+) -> Dict[str, Any]:
+    with span("case_study_search", "case_index", query=query):
+        hit = _lookup(config, query, industry, max_results)
+        if hit is not None:
+            return hit
+        result = tavily_search(config=config, query=query, max_results=max_results)
+        index_search_results(config, result, industry=industry)
+        return {**result, "source": "network"}
+
+
+async def search_case_studies_async(
+    config: AppConfig, query: str, industry: Optional[str] = None, max_results: int = 5
+) -> Dict[str, Any]:
+    with span("case_study_search", "case_index", query=query):
+        hit = await asyncio.to_thread(_lookup, config, query, industry, max_results)
+        if hit is not None:
+            return hit
+        result = await tavily_search_async(config=config, query=query, max_results=max_results)
+        await asyncio.to_thread(index_search_results, config, result, industry)
+        return {**result, "source": "network"}
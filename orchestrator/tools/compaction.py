@@ -0,0 +1,204 @@
+"""Compact Tavily responses before they reach an agent.
+
+Raw Tavily JSON carries whole pages, scores, duplicate hits and site
+boilerplate; every model turn afterwards pays for it as input tokens. A
+response goes through these steps:
+
+1. project each result onto the fields the agent uses (title, URL, text);
+2. strip boilerplate lines (navigation, cookie banners, share links);
+3. drop results whose text nearly duplicates one already returned in the run,
+   or whose URL was already returned by the same kind of call (an extract of
+   a page first seen as a search hit is kept);
+4. keep the passages that best match the query, within a per-result budget;
+5. stop adding results once the response budget is spent.
+
+Budgets are in characters; tokens are estimated at four characters each. The
+raw response is still what gets cached and indexed.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Set
+
+from orchestrator.config import AppConfig
+from orchestrator.tracing import span
+from orchestrator.utils import canonicalize_url
+
+CHARS_PER_TOKEN = 4
+SHINGLE_WORDS = 5
+
+_BOILERPLATE = re.compile(
+    r"^(skip to (main )?content|sign (in|up)|log ?in|subscribe|share( this)?( on \w+)?|follow us|"
+    r"accept( all)?( cookies)?|cookie (settings|policy|preferences)|we use cookies.*|privacy policy|"
+    r"terms (of use|of service|and conditions)|all rights reserved.*|©.*|copyright .*|"
+    r"(main )?menu|search|home|back to top|read more|learn more|contact us|related (posts|articles))$",
+    re.IGNORECASE,
+)
+_LINK_ONLY = re.compile(r"^(\W*\[[^\]]*\]\([^)]*\)\W*)+$")
+_WORD = re.compile(r"[a-z0-9]+")
+_PASSAGE_SPLIT = re.compile(r"\n\s*\n|(?<=[.!?])\s+(?=[A-Z])")
+
+
+class SeenContent:
+    """URLs and text shingles already returned to the agents of one run."""
+
+    def __init__(self) -> None:
+        self.urls: Dict[str, Set[str]] = {}
+        self.shingles: List[Set[int]] = []
+        self.counters = {"calls": 0, "tokens_raw": 0, "tokens_sent": 0, "duplicates_dropped": 0}
+        self.lock = threading.Lock()
+
+    def summary(self) -> Dict[str, int]:
+        with self.lock:
+            return {**self.counters, "tokens_saved": self.counters["tokens_raw"] - self.counters["tokens_sent"]}
+
+
+_seen: ContextVar[Optional[SeenContent]] = ContextVar("orchestrator_compaction", default=None)
+
+
+def activate_compaction(seen: SeenContent):
+    return _seen.set(seen)
+
+
+def deactivate_compaction(token) -> None:
+    _seen.reset(token)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def strip_boilerplate(text: str) -> str:
+    lines = []
+    seen_lines: Set[str] = set()
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        key = stripped.lower()
+        # Repeated short lines are navigation or footers.
+        if _BOILERPLATE.match(stripped) or _LINK_ONLY.match(stripped) or (len(stripped) < 60 and key in seen_lines):
+            continue
+        seen_lines.add(key)
+        lines.append(stripped)
+    return "\n".join(lines).strip()
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _hash(words: List[str]) -> int:
+    return int.from_bytes(hashlib.blake2b(" ".join(words).encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _shingles(words: List[str]) -> Set[int]:
+    if len(words) <= SHINGLE_WORDS:
+        return {_hash(words)} if words else set()
+    return {_hash(words[i : i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def _near_duplicate(shingles: Set[int], seen: List[Set[int]], threshold: float) -> bool:
+    if not shingles:
+        return False
+    for other in seen:
+        overlap = len(shingles & other)
+        if overlap and overlap / len(shingles | other) >= threshold:
+            return True
+    return False
+
+
+def select_passages(text: str, query: Optional[str], max_chars: int) -> str:
+    """The passages of ``text`` that best match ``query``, in page order, within ``max_chars``."""
+
+    if len(text) <= max_chars:
+        return text
+    passages = [passage.strip() for passage in _PASSAGE_SPLIT.split(text) if passage.strip()]
+    terms = set(_words(query or ""))
+    if terms:
+        scored = sorted(
+            range(len(passages)),
+            key=lambda index: (-len(terms & set(_words(passages[index]))), index),
+        )
+    else:
+        scored = list(range(len(passages)))
+
+    chosen: List[int] = []
+    used = 0
+    for index in scored:
+        cost = len(passages[index]) + 3
+        if used + cost > max_chars:
+            continue
+        chosen.append(index)
+        used += cost
+    if not chosen:
+        return passages[scored[0]][: max_chars - 1] + "…"
+    return " … ".join(passages[index] for index in sorted(chosen))
+
+
+def _project(result: Dict[str, Any]) -> Dict[str, Any]:
+    text = result.get("raw_content") or result.get("content") or ""
+    projected = {"url": result.get("url"), "content": text}
+    if result.get("title"):
+        projected = {"title": result["title"], **projected}
+    return projected
+
+
+def compact_response(
+    config: AppConfig, response: Dict[str, Any], kind: str, query: Optional[str] = None
+) -> Dict[str, Any]:
+    """A compact copy of a Tavily ``search`` or ``extract`` response for an agent."""
+
+    if not config.compaction_enabled or not response.get("ok"):
+        return response
+    data = response.get("data") or {}
+    seen = _seen.get() or SeenContent()
+    threshold = config.compaction_dedup_threshold
+
+    results: List[Dict[str, Any]] = []
+    dropped = 0
+    budget = config.compaction_response_max_chars
+    for raw in data.get("results") or []:
+        if not isinstance(raw, dict):
+            continue
+        item = _project(raw)
+        url = canonicalize_url(item["url"]) if item.get("url") else None
+        text = strip_boilerplate(item["content"])
+        shingles = _shingles(_words(text))
+        with seen.lock:
+            seen_urls = seen.urls.setdefault(kind, set())
+            if (url and url in seen_urls) or _near_duplicate(shingles, seen.shingles, threshold):
+                dropped += 1
+                continue
+            if url:
+                seen_urls.add(url)
+            seen.shingles.append(shingles)
+        item["content"] = select_passages(text, query, min(config.compaction_result_max_chars, budget))
+        results.append(item)
+        budget -= len(item["content"])
+        if budget <= 0:
+            break
+
+    compact: Dict[str, Any] = {"ok": True, "results": results}
+    if data.get("answer"):
+        compact["answer"] = data["answer"]
+    if data.get("failed_results"):
+        compact["failed_results"] = data["failed_results"]
+    if dropped:
+        compact["duplicates_omitted"] = dropped
+
+    tokens_raw = estimate_tokens(json.dumps(response, default=str))
+    tokens_sent = estimate_tokens(json.dumps(compact, default=str))
+    with seen.lock:
+        seen.counters["calls"] += 1
+        seen.counters["tokens_raw"] += tokens_raw
+        seen.counters["tokens_sent"] += tokens_sent
+        seen.counters["duplicates_dropped"] += dropped
+    with span(f"compact_{kind}", "compaction") as compact_span:
+        compact_span.set(tokens_raw=tokens_raw, tokens_sent=tokens_sent, tokens_saved=tokens_raw - tokens_sent)
+    return compact
@@ -0,0 +1,169 @@
+"""Shared, pooled HTTP clients for the Tavily and Perplexity wrappers.
+
+One client is kept per upstream base URL so every tool call, node and run in
+the process reuses the same keep-alive connections, and each host gets its own
+connection limit. Async clients are bound to the event loop that created them.
+Every request passes through its provider's rate governor and is retried on
+throttling and transient errors.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import json
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+from orchestrator.config import AppConfig
+from orchestrator.tools.ratelimit import get_governor
+from orchestrator.tracing import span
+
+_lock = threading.Lock()
+_clients: Dict[str, httpx.Client] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _timeout(seconds: float) -> httpx.Timeout:
+    # Callers over the per-host limit wait for a free connection.
+    return httpx.Timeout(seconds, pool=None)
+
+
+def _client_options(config: AppConfig) -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_keepalive,
+            keepalive_expiry=config.http_keepalive_expiry,
+        ),
+        # HTTP/2 needs the optional ``h2`` package (``httpx[http2]``).
+        "http2": config.http2_enabled and importlib.util.find_spec("h2") is not None,
+        "timeout": _timeout(30),
+    }
+
+
+def get_client(config: AppConfig, base_url: str) -> httpx.Client:
+    with _lock:
+        client = _clients.get(base_url)
+        if client is None or client.is_closed:
+            client = _clients[base_url] = httpx.Client(base_url=base_url, **_client_options(config))
+        return client
+
+
+def get_async_client(config: AppConfig, base_url: str) -> httpx.AsyncClient:
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(base_url)
+    if client is None or client.is_closed:
+        client = clients[base_url] = httpx.AsyncClient(base_url=base_url, **_client_options(config))
+    return client
+
+
+def close_clients() -> None:
+    """Close every pooled synchronous client."""
+
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_clients() -> None:
+    """Close the pooled async clients bound to the running event loop."""
+
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+atexit.register(close_clients)
+
+
+def _failure(exc: httpx.HTTPError) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"ok": False, "error": str(exc), "data": None}
+    if isinstance(exc, httpx.HTTPStatusError):
+        result["status"] = exc.response.status_code
+    return result
+
+
+def _result(response: Optional[httpx.Response], error: Optional[httpx.HTTPError]) -> Dict[str, Any]:
+    if response is None:
+        return _failure(error)
+    try:
+        response.raise_for_status()
+        return {"ok": True, "data": response.json()}
+    except httpx.HTTPError as exc:
+        return _failure(exc)
+
+
+def post_json(
+    config: AppConfig,
+    provider: str,
+    base_url: str,
+    path: str,
+    payload: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30,
+) -> Dict[str, Any]:
+    client = get_client(config, base_url)
+    governor = get_governor(config, provider)
+    content = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    with span(f"{provider} {path}", "http", provider=provider, bytes_out=len(content)) as http_span:
+        attempt = 0
+        while True:
+            response, error = None, None
+            governor.acquire()
+            try:
+                response = client.post(path, content=content, headers=headers, timeout=_timeout(timeout))
+            except httpx.HTTPError as exc:
+                error = exc
+            finally:
+                governor.release(response)
+            delay = governor.retry_delay(attempt, response, error)
+            if delay is None:
+                if response is not None:
+                    http_span.set(status=response.status_code, bytes_in=len(response.content))
+                http_span.set(attempts=attempt + 1)
+                return _result(response, error)
+            time.sleep(delay)
+            attempt += 1
+
+
+async def apost_json(
+    config: AppConfig,
+    provider: str,
+    base_url: str,
+    path: str,
+    payload: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30,
+) -> Dict[str, Any]:
+    client = get_async_client(config, base_url)
+    governor = get_governor(config, provider)
+    content = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    with span(f"{provider} {path}", "http", provider=provider, bytes_out=len(content)) as http_span:
+        attempt = 0
+        while True:
+            response, error = None, None
+            await governor.aacquire()
+            try:
+                response = await client.post(path, content=content, headers=headers, timeout=_timeout(timeout))
+            except httpx.HTTPError as exc:
+                error = exc
+            finally:
+                governor.release(response)
+            delay = governor.retry_delay(attempt, response, error)
+            if delay is None:
+                if response is not None:
+                    http_span.set(status=response.status_code, bytes_in=len(response.content))
+                http_span.set(attempts=attempt + 1)
+                return _result(response, error)
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -1,19 +1,19 @@
 """Perplexity Sonar API wrapper (placeholder endpoints; update when confirmed)."""
 
-from typing import Any, Dict, List
-
-import httpx
+from typing import Any, Dict, Optional, Tuple
 
 from orchestrator.config import AppConfig
+from orchestrator.tools.http_client import apost_json, post_json
 
 
-def perplexity_query(
+def _chat_request(
     config: AppConfig,
     system_prompt: str,
     user_prompt: str,
-    max_tokens: int = 1200,
-    temperature: float = 0.2,
-) -> Dict[str, Any]:
+    max_tokens: int,
+    temperature: float,
+    response_format: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
     payload: Dict[str, Any] = {
         "model": config.perplexity_model,
         "messages": [
@@ -23,14 +23,52 @@ def perplexity_query(
         "max_tokens": max_tokens,
         "temperature": temperature,
     }
+    if response_format:
+        payload["response_format"] = response_format
     headers = {
         "Authorization": f"Bearer {config.perplexity_api_key}",
         "Content-Type": "application/json",
     }
-    url = f"{config.perplexity_base_url}{config.perplexity_chat_path}"
-    try:
-        response = httpx.post(url, json=payload, headers=headers, timeout=60)
-        response.raise_for_status()
-        return {"ok": True, "data": response.json()}
-    except httpx.HTTPError as exc:
-        return {"ok": False, "error": str(exc), "data": None}
+    return payload, headers
+
+
+def perplexity_query(
+    config: AppConfig,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 1200,
+    temperature: float = 0.2,
+    response_format: Optional[Dict[str, Any]] = None,
+    timeout: float = 60,
+) -> Dict[str, Any]:
+    payload, headers = _chat_request(config, system_prompt, user_prompt, max_tokens, temperature, response_format)
+    return post_json(
+        config,
+        "perplexity",
+        config.perplexity_base_url,
+        config.perplexity_chat_path,
+        payload,
+        headers=headers,
+        timeout=timeout,
+    )
+
+
+async def perplexity_query_async(
+    config: AppConfig,
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 1200,
+    temperature: float = 0.2,
+    response_format: Optional[Dict[str, Any]] = None,
+    timeout: float = 60,
+) -> Dict[str, Any]:
+    payload, headers = _chat_request(config, system_prompt, user_prompt, max_tokens, temperature, response_format)
+    return await apost_json(
+        config,
+        "perplexity",
+        config.perplexity_base_url,
+        config.perplexity_chat_path,
+        payload,
+        headers=headers,
+        timeout=timeout,
+    )
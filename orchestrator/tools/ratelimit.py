@@ -0,0 +1,189 @@
+"""Per-provider rate governor for upstream API calls.
+
+Each provider gets a token bucket (sustained requests/second plus burst), an
+AIMD concurrency limit that grows while calls succeed and halves when the
+provider signals overload, and retry timing with jittered exponential backoff
+that honours ``Retry-After``. Governors are shared by sync and async callers.
+"""
+
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+from orchestrator.config import AppConfig, ProviderLimits
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+OVERLOAD_STATUS = {429, 503}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait for it."""
+
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease limit on in-flight calls."""
+
+    def __init__(self, maximum: int, minimum: int = 1, cooldown: float = 1.0) -> None:
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        # Start halfway and probe upwards while calls succeed.
+        self.limit = float(max(self.minimum, self.maximum // 2))
+        self.in_flight = 0
+        self.cooldown = cooldown
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        # Async waiters, one event per event loop, set on the next release.
+        self._released: Dict[asyncio.AbstractEventLoop, asyncio.Event] = {}
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._condition:
+            while not self._try_acquire():
+                self._condition.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._try_acquire():
+                    return
+                released = self._released.get(loop)
+                if released is None:
+                    released = self._released[loop] = asyncio.Event()
+            await released.wait()
+
+    def release(self, overloaded: bool) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if overloaded:
+                # One decrease per cooldown window so a burst of 429s counts once.
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / max(self.limit, 1.0))
+            self._condition.notify_all()
+            released, self._released = self._released, {}
+        # release() may run on any thread, so wake each loop through its own thread.
+        for loop, event in released.items():
+            with contextlib.suppress(RuntimeError):  # the loop has closed
+                loop.call_soon_threadsafe(event.set)
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateGovernor:
+    def __init__(
+        self,
+        limits: ProviderLimits,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> None:
+        self.bucket = TokenBucket(limits.rate, limits.burst)
+        self.limiter = AdaptiveLimiter(limits.max_in_flight)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def acquire(self) -> None:
+        self.bucket.acquire()
+        self.limiter.acquire()
+
+    async def aacquire(self) -> None:
+        await self.bucket.aacquire()
+        await self.limiter.aacquire()
+
+    def release(self, response: Optional[httpx.Response]) -> None:
+        self.limiter.release(overloaded=response is not None and response.status_code in OVERLOAD_STATUS)
+
+    def retry_delay(
+        self,
+        attempt: int,
+        response: Optional[httpx.Response],
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """Seconds to wait before retrying, or None when the call is final."""
+
+        if attempt >= self.max_retries:
+            return None
+        if response is not None and response.status_code not in RETRY_STATUS:
+            return None
+        if response is None and not isinstance(error, httpx.TransportError):
+            return None
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after) + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def stats(self) -> Dict[str, float]:
+        return {"concurrency_limit": round(self.limiter.limit, 2), "in_flight": self.limiter.in_flight}
+
+
+_governors: Dict[str, RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(config: AppConfig, provider: str) -> RateGovernor:
+    with _governors_lock:
+        governor = _governors.get(provider)
+        if governor is None:
+            limits = config.tavily_limits if provider == "tavily" else config.perplexity_limits
+            governor = _governors[provider] = RateGovernor(
+                limits,
+                max_retries=config.http_max_retries,
+                backoff_base=config.http_backoff_base,
+                backoff_max=config.http_backoff_max,
+            )
+        return governor
@@ -0,0 +1,116 @@
+"""Coalesce concurrent identical tool calls into a single upstream request.
+
+The first caller for a key runs the request; callers that arrive while it is
+in flight wait for it and receive the same result (or exception). Sync calls
+are shared across threads, async calls across tasks on the same event loop.
+Results are shared objects and must be treated as read-only.
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from orchestrator.tracing import annotate
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _AsyncCall]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._counters = {"calls": 0, "executions": 0, "deduplicated": 0}
+
+    def _count(self, leader: bool) -> None:
+        self._counters["calls"] += 1
+        self._counters["executions" if leader else "deduplicated"] += 1
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            self._count(leader)
+
+        if not leader:
+            annotate(coalesced=True)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async ``do``: the request runs as its own task, which every caller awaits.
+
+        A caller that is cancelled (e.g. by its own run's deadline) stops
+        waiting without affecting the others; the request itself is only
+        cancelled once no caller is waiting for it.
+        """
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+            call = calls.get(key)
+            leader = call is None
+            if leader:
+                call = calls[key] = _AsyncCall(loop.create_task(fn()))
+                call.task.add_done_callback(functools.partial(self._finished, calls, key, call))
+            call.waiters += 1
+            self._count(leader)
+
+        if not leader:
+            annotate(coalesced=True)
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.task.done()
+            if abandoned:
+                call.task.cancel()
+
+    def _finished(self, calls: Dict[str, "_AsyncCall"], key: str, call: "_AsyncCall", task: asyncio.Task) -> None:
+        with self._lock:
+            if calls.get(key) is call:
+                del calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when no caller is waiting.
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._calls) + sum(len(calls) for calls in self._async_calls.values())
+            return {**self._counters, "in_flight": in_flight}
+
+
+tavily_flight = SingleFlight()
@@ -0,0 +1,269 @@
+"""Registry of the sources a run fetches and cites.
+
+URLs are compared in canonical form (``canonicalize_url``), and fetched pages
+are fingerprinted with a 64-bit simhash, so tracking-parameter variants and
+mirrors of one page count as one source. Only pages with at least
+``MIN_FINGERPRINT_WORDS`` words are fingerprinted (short pages are mostly
+bot-check interstitials and error pages that look alike everywhere), and a
+page is only ever an alias of a page on the same registered domain. Each run has a ``SourceRegistry``:
+
+- before an extract, the tool layer asks it for the page's primary URL and
+  for a result already fetched in this run, which is returned without a fetch;
+- synthesis uses it to build the report's deduplicated, ranked source list
+  and to drop repeated case studies.
+
+With ``SOURCE_REGISTRY_PATH`` set, near-duplicate pages found in one run are
+remembered in a SQLite alias table shared across runs for ``SOURCE_ALIAS_TTL``
+seconds, so later runs fetch the primary page (usually a cache hit) instead of
+its mirror. Without it, aliases last for the run only.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from orchestrator.blobs import offload, resolve
+from orchestrator.config import AppConfig
+from orchestrator.utils import canonicalize_url, registered_domain
+
+SIMHASH_BITS = 64
+# Bands for the near-duplicate lookup: within distance 3, one of four bands matches exactly.
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+SHINGLE_WORDS = 3
+MIN_FINGERPRINT_WORDS = 80
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aliases (
+    url TEXT PRIMARY KEY,
+    primary_url TEXT NOT NULL,
+    seen_at REAL NOT NULL
+);
+"""
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit simhash of ``text``'s word shingles; None when the text is too short to tell pages apart."""
+
+    words = _WORD.findall(text.lower())
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for start in range(max(len(words) - SHINGLE_WORDS + 1, 1)):
+        shingle = " ".join(words[start : start + SHINGLE_WORDS]).encode("utf-8")
+        value = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _bands(fingerprint: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [fingerprint >> (band * BAND_BITS) & mask for band in range(BANDS)]
+
+
+def source_url(source: Any) -> Optional[str]:
+    url = source.get("url") if isinstance(source, dict) else source
+    return url if isinstance(url, str) and url.strip() else None
+
+
+def _page_text(result: Dict[str, Any]) -> str:
+    items = (result.get("data") or {}).get("results") or []
+    return " ".join(item.get("raw_content") or item.get("content") or "" for item in items if isinstance(item, dict))
+
+
+class AliasStore:
+    """Cross-run ``canonical URL -> primary URL`` mapping for near-duplicate pages."""
+
+    def __init__(self, path: str, ttl: float) -> None:
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def primary(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT primary_url FROM aliases WHERE url = ? AND seen_at >= ?", (url, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def add(self, url: str, primary: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aliases (url, primary_url, seen_at) VALUES (?, ?, ?)",
+                (url, primary, time.time()),
+            )
+
+
+@dataclass
+class _Source:
+    order: int
+    item: Any
+    origins: Set[str] = field(default_factory=set)
+    mentions: int = 0
+    fetched: bool = False
+
+
+class SourceRegistry:
+    def __init__(self, aliases: Optional[AliasStore] = None, max_distance: int = 3) -> None:
+        self.aliases = aliases
+        self.max_distance = max_distance
+        self._primary: Dict[str, str] = {}
+        self._fetched: Dict[str, Any] = {}
+        self._fingerprints: Dict[str, int] = {}
+        self._bands: List[Dict[int, Set[str]]] = [{} for _ in range(BANDS)]
+        self._lock = threading.Lock()
+        self._counters = {"fetch_checks": 0, "fetches_skipped": 0, "aliases_found": 0}
+
+    def primary(self, url: str) -> str:
+        """Canonical URL of the page ``url`` points to, following known aliases."""
+
+        canonical = canonicalize_url(url)
+        with self._lock:
+            known = self._primary.get(canonical)
+        if known is not None:
+            return known
+        stored = self.aliases.primary(canonical) if self.aliases is not None else None
+        # Aliases never cross registered domains, including ones stored by older versions.
+        primary = stored if stored and registered_domain(stored) == registered_domain(canonical) else canonical
+        with self._lock:
+            self._primary.setdefault(canonical, primary)
+        return primary
+
+    def before_fetch(self, url: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """``(url to fetch, result already fetched in this run or None)``."""
+
+        primary = self.primary(url)
+        with self._lock:
+            self._counters["fetch_checks"] += 1
+            previous = self._fetched.get(primary)
+            if previous is not None:
+                self._counters["fetches_skipped"] += 1
+        if previous is not None:
+            return primary, resolve(previous)
+        return (url if primary == canonicalize_url(url) else primary), None
+
+    def after_fetch(self, url: str, result: Dict[str, Any]) -> None:
+        """Record a fetched page; a near-duplicate of an earlier page becomes its alias."""
+
+        if not result.get("ok"):
+            return
+        primary = self.primary(url)
+        fingerprint = simhash(_page_text(result))
+        with self._lock:
+            duplicate_of = self._near_duplicate(primary, fingerprint) if fingerprint is not None else None
+            if duplicate_of is not None and duplicate_of != primary:
+                self._counters["aliases_found"] += 1
+                self._primary[primary] = duplicate_of
+                for canonical, target in self._primary.items():
+                    if target == primary:
+                        self._primary[canonical] = duplicate_of
+            else:
+                self._fetched[primary] = offload(result)
+                if fingerprint is not None:
+                    self._fingerprints[primary] = fingerprint
+                    for band, value in zip(self._bands, _bands(fingerprint)):
+                        band.setdefault(value, set()).add(primary)
+        if duplicate_of is not None and duplicate_of != primary and self.aliases is not None:
+            self.aliases.add(primary, duplicate_of)
+
+    def _near_duplicate(self, url: str, fingerprint: int) -> Optional[str]:
+        domain = registered_domain(url)
+        candidates: Set[str] = set()
+        for band, value in zip(self._bands, _bands(fingerprint)):
+            candidates |= band.get(value, set())
+        for candidate in sorted(candidates):
+            if registered_domain(candidate) != domain:
+                continue
+            if bin(self._fingerprints[candidate] ^ fingerprint).count("1") <= self.max_distance:
+                return candidate
+        return None
+
+    def ranked_sources(self, groups: Iterable[Tuple[str, Iterable[Any]]]) -> List[Any]:
+        """Sources from ``(origin, sources)`` groups, one per page, best supported first.
+
+        Pages cited by more origins rank first, then pages cited more often,
+        then pages actually fetched in the run, then first appearance. Each
+        page keeps the first spelling it was cited with.
+        """
+
+        merged: Dict[str, _Source] = {}
+        for origin, sources in groups:
+            for source in sources or []:
+                url = source_url(source)
+                if url is None:
+                    continue
+                primary = self.primary(url)
+                entry = merged.get(primary)
+                if entry is None:
+                    entry = merged[primary] = _Source(order=len(merged), item=source)
+                entry.origins.add(origin)
+                entry.mentions += 1
+        with self._lock:
+            for primary, entry in merged.items():
+                entry.fetched = primary in self._fetched
+        entries = sorted(merged.values(), key=lambda e: (-len(e.origins), -e.mentions, not e.fetched, e.order))
+        return [entry.item for entry in entries]
+
+    def dedupe(self, items: Iterable[Any]) -> List[Any]:
+        """``items`` without entries whose ``url`` repeats an earlier entry's page."""
+
+        seen: Set[str] = set()
+        kept = []
+        for item in items or []:
+            url = source_url(item)
+            if url is not None:
+                primary = self.primary(url)
+                if primary in seen:
+                    continue
+                seen.add(primary)
+            kept.append(item)
+        return kept
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "pages": len(self._fetched)}
+
+
+_aliases: Dict[str, AliasStore] = {}
+_aliases_lock = threading.Lock()
+_registry: ContextVar[Optional[SourceRegistry]] = ContextVar("orchestrator_sources", default=None)
+
+
+def new_registry(config: AppConfig) -> SourceRegistry:
+    """A run's registry, backed by the shared alias store when ``SOURCE_REGISTRY_PATH`` is set."""
+
+    if not config.source_registry_path:
+        return SourceRegistry(max_distance=config.source_simhash_distance)
+    with _aliases_lock:
+        store = _aliases.get(config.source_registry_path)
+        if store is None:
+            store = _aliases[config.source_registry_path] = AliasStore(
+                config.source_registry_path, config.source_alias_ttl
+            )
+    return SourceRegistry(store, max_distance=config.source_simhash_distance)
+
+
+def current_sources() -> Optional[SourceRegistry]:
+    return _registry.get()
+
+
+def activate_sources(registry: SourceRegistry):
+    return _registry.set(registry)
+
+
+def deactivate_sources(token) -> None:
+    _registry.reset(token)
@@ -1,11 +1,17 @@
-"""Strands tool wrappers for Tavily APIs."""
+"""Strands tool wrappers for Tavily APIs and the local case-study index.
+
+Tavily responses are compacted (see ``orchestrator.tools.compaction``) before
+they are returned to the agent.
+"""
 
 from typing import Any, Dict, List, Optional
 
 from strands import tool
 
 from orchestrator.config import load_config
-from orchestrator.tools.tavily import tavily_extract, tavily_search
+from orchestrator.tools.case_index import index_search_results, search_case_studies
+from orchestrator.tools.compaction import compact_response
+from orchestrator.tools.tavily import tavily_extract, tavily_extract_many, tavily_search
 
 
 @tool(name="tavily_search", description="Search the web using Tavily.")
@@ -15,6 +21,7 @@ def tavily_search_tool(
     include_domains: Optional[List[str]] = None,
     exclude_domains: Optional[List[str]] = None,
     timeframe: Optional[str] = None,
+    fresh: bool = False,
 ) -> Dict[str, Any]:
     """Search the web using Tavily.
 
@@ -24,24 +31,71 @@ def tavily_search_tool(
         include_domains: Optional list of domains to include
         exclude_domains: Optional list of domains to exclude
         timeframe: Optional timeframe hint (e.g., "1y")
+        fresh: Bypass the response cache and fetch live results
     """
     config = load_config()
-    return tavily_search(
+    result = tavily_search(
         config=config,
         query=query,
         max_results=max_results,
         include_domains=include_domains,
         exclude_domains=exclude_domains,
         timeframe=timeframe,
+        use_cache=not fresh,
     )
+    index_search_results(config, result)
+    return compact_response(config, result, "search", query=query)
+
+
+@tool(
+    name="case_study_search",
+    description="Find AWS case studies, answering from the local case-study index before searching the web.",
+)
+def case_study_search_tool(query: str, industry: Optional[str] = None, max_results: int = 5) -> Dict[str, Any]:
+    """Find AWS case studies, answering from the local case-study index before searching the web.
+
+    Args:
+        query: What the case studies should cover (industry, challenge, AWS services, outcomes)
+        industry: Optional industry to rank same-industry case studies first
+        max_results: Maximum number of case studies
+    """
+    config = load_config()
+    result = search_case_studies(config=config, query=query, industry=industry, max_results=max_results)
+    if result.get("source") == "index":
+        # Indexed studies are already short, structured records.
+        return result
+    return {**compact_response(config, result, "search", query=query), "source": result.get("source")}
 
 
 @tool(name="tavily_extract", description="Extract content from a URL using Tavily.")
-def tavily_extract_tool(url: str) -> Dict[str, Any]:
+def tavily_extract_tool(url: str, focus: Optional[str] = None, fresh: bool = False) -> Dict[str, Any]:
     """Extract content from a URL using Tavily.
 
     Args:
         url: URL to extract
+        focus: What to look for on the page; long pages are cut down to the passages that match it
+        fresh: Bypass the response cache and fetch the live page
+    """
+    config = load_config()
+    result = tavily_extract(config=config, url=url, use_cache=not fresh)
+    return compact_response(config, result, "extract", query=focus)
+
+
+@tool(name="tavily_extract_many", description="Extract content from several URLs in one Tavily request.")
+def tavily_extract_many_tool(urls: List[str], focus: Optional[str] = None, fresh: bool = False) -> Dict[str, Any]:
+    """Extract content from several URLs in one Tavily request.
+
+    Args:
+        urls: URLs to extract
+        focus: What to look for on the pages; long pages are cut down to the passages that match it
+        fresh: Bypass the response cache and fetch the live pages
     """
     config = load_config()
-    return tavily_extract(config=config, url=url)
+    extracted = tavily_extract_many(config=config, urls=urls, use_cache=not fresh)
+    merged: Dict[str, Any] = {"results": [], "failed_results": []}
+    for url, result in extracted.items():
+        if result.get("ok"):
+            merged["results"].extend((result.get("data") or {}).get("results") or [])
+        else:
+            merged["failed_results"].append({"url": url, "error": result.get("error")})
+    return compact_response(config, {"ok": True, "data": merged}, "extract", query=focus)
@@ -1,19 +1,38 @@
-"""Tavily API wrapper (placeholder endpoints; update when confirmed)."""
+"""Tavily API wrapper (placeholder endpoints; update when confirmed).
 
-from typing import Any, Dict, Optional
+Single-URL extracts that miss the cache are micro-batched: a lone extract is
+sent at once, and those from the same run arriving while one is in flight
+collect for up to ``EXTRACT_BATCH_WINDOW_MS`` and go upstream as one multi-URL
+request. ``tavily_extract_many`` sends a list of URLs directly. Inside a run,
+extracts consult the run's source registry first: a page already fetched in
+the run is returned as is, and known mirrors are fetched by their primary URL.
+"""
 
-import httpx
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
+from orchestrator.budget import current_budget
 from orchestrator.config import AppConfig
+from orchestrator.tools.batching import MicroBatcher
+from orchestrator.tools.cache import acached_call, cached_call, extract_key, get_response_cache, search_key
+from orchestrator.tools.http_client import apost_json, post_json
+from orchestrator.tools.singleflight import tavily_flight
+from orchestrator.tools.sources import current_sources
+from orchestrator.tracing import annotate, current_tracer, span
+from orchestrator.utils import canonicalize_url
 
+_batchers: Dict[Tuple[str, str, str], MicroBatcher] = {}
+_batchers_lock = threading.Lock()
 
-def tavily_search(
+
+def _search_payload(
     config: AppConfig,
     query: str,
-    max_results: int = 8,
-    include_domains: Optional[list[str]] = None,
-    exclude_domains: Optional[list[str]] = None,
-    timeframe: Optional[str] = None,
+    max_results: int,
+    include_domains: Optional[list[str]],
+    exclude_domains: Optional[list[str]],
+    timeframe: Optional[str],
 ) -> Dict[str, Any]:
     payload: Dict[str, Any] = {
         "api_key": config.tavily_api_key,
@@ -26,22 +45,222 @@ def tavily_search(
         payload["exclude_domains"] = exclude_domains
     if timeframe:
         payload["timeframe"] = timeframe
+    return payload
+
+
+def tavily_search(
+    config: AppConfig,
+    query: str,
+    max_results: int = 8,
+    include_domains: Optional[list[str]] = None,
+    exclude_domains: Optional[list[str]] = None,
+    timeframe: Optional[str] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    payload = _search_payload(config, query, max_results, include_domains, exclude_domains, timeframe)
+
+    def fetch() -> Dict[str, Any]:
+        return post_json(
+            config, "tavily", config.tavily_base_url, config.tavily_search_path, payload, timeout=30
+        )
+
+    key = search_key(query, max_results, include_domains, exclude_domains, timeframe)
+    with span("tavily_search", "tavily", query=query):
+        if not use_cache:
+            return tavily_flight.do(f"fresh:{key}", fetch)
+        return tavily_flight.do(key, lambda: cached_call(config, "search", key, fetch))
+
+
+async def tavily_search_async(
+    config: AppConfig,
+    query: str,
+    max_results: int = 8,
+    include_domains: Optional[list[str]] = None,
+    exclude_domains: Optional[list[str]] = None,
+    timeframe: Optional[str] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    payload = _search_payload(config, query, max_results, include_domains, exclude_domains, timeframe)
+
+    async def fetch() -> Dict[str, Any]:
+        return await apost_json(
+            config, "tavily", config.tavily_base_url, config.tavily_search_path, payload, timeout=30
+        )
+
+    key = search_key(query, max_results, include_domains, exclude_domains, timeframe)
+    with span("tavily_search", "tavily", query=query):
+        if not use_cache:
+            return await tavily_flight.ado(f"fresh:{key}", fetch)
+        return await tavily_flight.ado(key, lambda: acached_call(config, "search", key, fetch))
+
 
-    url = f"{config.tavily_base_url}{config.tavily_search_path}"
-    try:
-        response = httpx.post(url, json=payload, timeout=30)
-        response.raise_for_status()
-        return {"ok": True, "data": response.json()}
-    except httpx.HTTPError as exc:
-        return {"ok": False, "error": str(exc), "data": None}
+def _missing_extract(url: str) -> Dict[str, Any]:
+    return {"ok": False, "error": f"No extract result returned for {url}", "data": None}
 
 
-def tavily_extract(config: AppConfig, url: str) -> Dict[str, Any]:
+def _split_extracts(urls: List[str], response: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Per-URL responses, each shaped like a single-URL extract, from a multi-URL one."""
+
+    if not response.get("ok"):
+        return {url: response for url in urls}
+    data = response.get("data") or {}
+    requested = {canonicalize_url(url): url for url in urls}
+    split: Dict[str, Dict[str, Any]] = {}
+    for item in data.get("results") or []:
+        url = requested.get(canonicalize_url(item.get("url") or ""))
+        if url is not None:
+            split[url] = {"ok": True, "data": {"results": [item], "failed_results": []}}
+    for item in data.get("failed_results") or []:
+        url = requested.get(canonicalize_url(item.get("url") or ""))
+        if url is not None and url not in split:
+            split[url] = {"ok": False, "error": item.get("error") or "Extraction failed", "data": None}
+    return split
+
+
+def fetch_extracts(config: AppConfig, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+    """One uncached multi-URL extract request."""
+
+    payload = {"api_key": config.tavily_api_key, "urls": urls}
+    response = post_json(config, "tavily", config.tavily_base_url, config.tavily_extract_path, payload, timeout=30)
+    return _split_extracts(urls, response)
+
+
+def _run_context() -> Tuple[Any, ...]:
+    return current_tracer(), current_budget(), current_sources()
+
+
+def extract_batcher(config: AppConfig) -> Optional[MicroBatcher]:
+    """The shared extract micro-batcher for this endpoint and API key.
+
+    None when batching is off. Batches carry the config of their first request,
+    so the batcher itself holds no credentials, and only group extracts from
+    the same run, so each run's tracer, budget and source registry see only its
+    own requests.
+    """
+
+    if config.extract_batch_window_ms <= 0 or config.extract_batch_max <= 1:
+        return None
+    key = (config.tavily_base_url, config.tavily_extract_path, config.tavily_api_key)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = MicroBatcher(
+                fetch_extracts,
+                _missing_extract,
+                window=config.extract_batch_window_ms / 1000,
+                max_size=config.extract_batch_max,
+                name="tavily-extract",
+                group=_run_context,
+            )
+        return batcher
+
+
+def _extract(config: AppConfig, url: str, use_cache: bool) -> Dict[str, Any]:
+    payload = {"api_key": config.tavily_api_key, "url": url}
+    batcher = extract_batcher(config)
+
+    def fetch() -> Dict[str, Any]:
+        if batcher is not None:
+            annotate(batched=True)
+            return batcher.submit(url, config).result()
+        return post_json(
+            config, "tavily", config.tavily_base_url, config.tavily_extract_path, payload, timeout=30
+        )
+
+    key = extract_key(url)
+    with span("tavily_extract", "tavily", url=url):
+        if not use_cache:
+            return tavily_flight.do(f"fresh:{key}", fetch)
+        return tavily_flight.do(key, lambda: cached_call(config, "extract", key, fetch))
+
+
+async def _extract_async(config: AppConfig, url: str, use_cache: bool) -> Dict[str, Any]:
     payload = {"api_key": config.tavily_api_key, "url": url}
-    endpoint = f"{config.tavily_base_url}{config.tavily_extract_path}"
-    try:
-        response = httpx.post(endpoint, json=payload, timeout=30)
-        response.raise_for_status()
-        return {"ok": True, "data": response.json()}
-    except httpx.HTTPError as exc:
-        return {"ok": False, "error": str(exc), "data": None}
+    batcher = extract_batcher(config)
+
+    async def fetch() -> Dict[str, Any]:
+        if batcher is not None:
+            annotate(batched=True)
+            return await asyncio.wrap_future(batcher.submit(url, config))
+        return await apost_json(
+            config, "tavily", config.tavily_base_url, config.tavily_extract_path, payload, timeout=30
+        )
+
+    key = extract_key(url)
+    with span("tavily_extract", "tavily", url=url):
+        if not use_cache:
+            return await tavily_flight.ado(f"fresh:{key}", fetch)
+        return await tavily_flight.ado(key, lambda: acached_call(config, "extract", key, fetch))
+
+
+def tavily_extract(config: AppConfig, url: str, use_cache: bool = True) -> Dict[str, Any]:
+    registry = current_sources()
+    if registry is None:
+        return _extract(config, url, use_cache)
+    target, previous = registry.before_fetch(url)
+    if previous is not None and use_cache:
+        annotate(source_registry="hit")
+        return previous
+    result = _extract(config, target, use_cache)
+    registry.after_fetch(target, result)
+    return result
+
+
+async def tavily_extract_async(config: AppConfig, url: str, use_cache: bool = True) -> Dict[str, Any]:
+    registry = current_sources()
+    if registry is None:
+        return await _extract_async(config, url, use_cache)
+    target, previous = registry.before_fetch(url)
+    if previous is not None and use_cache:
+        annotate(source_registry="hit")
+        return previous
+    result = await _extract_async(config, target, use_cache)
+    registry.after_fetch(target, result)
+    return result
+
+
+def tavily_extract_many(config: AppConfig, urls: List[str], use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Extract several URLs, sending the cache misses as multi-URL requests.
+
+    Returns one single-URL-shaped response per requested URL.
+    """
+
+    cache = get_response_cache(config) if use_cache else None
+    registry = current_sources()
+    results: Dict[str, Dict[str, Any]] = {}
+    # Requested URL -> URL to fetch (the primary page for a known mirror).
+    targets: Dict[str, str] = {}
+    for url in dict.fromkeys(urls):
+        target, previous = registry.before_fetch(url) if registry is not None else (url, None)
+        if previous is not None and use_cache:
+            results[url] = previous
+            continue
+        hit = cache.get("extract", extract_key(target)) if cache is not None else None
+        if hit is not None:
+            results[url] = hit
+        else:
+            targets[url] = target
+    misses = list(dict.fromkeys(targets.values()))
+
+    with span("tavily_extract_many", "tavily", urls=len(results) + len(targets), cache_hits=len(results)):
+        size = max(config.extract_batch_max, 1)
+        for start in range(0, len(misses), size):
+            chunk = misses[start : start + size]
+            fetched = fetch_extracts(config, chunk)
+            for target in chunk:
+                result = fetched.get(target) or _missing_extract(target)
+                if cache is not None:
+                    cache.put("extract", extract_key(target), result)
+                if registry is not None:
+                    registry.after_fetch(target, result)
+                fetched[target] = result
+            for url, target in targets.items():
+                if target in fetched:
+                    results[url] = fetched[target]
+    return {url: results[url] for url in dict.fromkeys(urls)}
+
+
+async def tavily_extract_many_async(
+    config: AppConfig, urls: List[str], use_cache: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    return await asyncio.to_thread(tavily_extract_many, config, urls, use_cache)
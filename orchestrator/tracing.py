@@ -0,0 +1,281 @@
+"""Span recording for workflow runs.
+
+A ``Tracer`` is activated per run through a context variable, so spans opened
+in graph nodes, executor threads, agent tool calls and HTTP calls all land in
+the run that caused them. With no active tracer ``span()`` returns a shared
+no-op object, which keeps instrumentation free when tracing is off.
+
+Traces export as Chrome trace-event JSON (chrome://tracing, Perfetto) or as
+OTLP-JSON ``resourceSpans``.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from strands.hooks import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeInvocationEvent,
+    BeforeModelCallEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+
+_tracer: ContextVar[Optional["Tracer"]] = ContextVar("orchestrator_tracer", default=None)
+_active_span: ContextVar[Optional["Span"]] = ContextVar("orchestrator_active_span", default=None)
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, category: str, attrs: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.span_id = uuid.uuid4().hex[:16]
+        parent = _active_span.get()
+        self.parent_id = parent.span_id if parent is not None and parent.tracer is tracer else None
+        self.thread_id = threading.get_ident()
+        self.start = 0.0
+        self.end = 0.0
+        self._token = None
+
+    def set(self, **attrs: Any) -> "Span":
+        self.attrs.update(attrs)
+        return self
+
+    def open(self) -> "Span":
+        self.start = time.time()
+        return self
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        self.end = time.time()
+        if error is not None:
+            self.attrs["error"] = f"{type(error).__name__}: {error}"
+        self.tracer.record(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return round((self.end - self.start) * 1000, 3)
+
+    def __enter__(self) -> "Span":
+        self._token = _active_span.set(self)
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active_span.reset(self._token)
+        self.close(exc)
+
+
+class _NullSpan:
+    def set(self, **attrs: Any) -> "_NullSpan":
+        return self
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self, run_id: Optional[str] = None) -> None:
+        self.run_id = run_id or uuid.uuid4().hex
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: str, **attrs: Any) -> Span:
+        return Span(self, name, category, attrs)
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def node_timings(self) -> List[Dict[str, Any]]:
+        nodes = sorted((span for span in self.spans if span.category == "node"), key=lambda span: span.start)
+        origin = min((span.start for span in self.spans), default=0.0)
+        return [
+            {
+                "node": span.name,
+                "start_ms": round((span.start - origin) * 1000, 3),
+                "duration_ms": span.duration_ms,
+                **span.attrs,
+            }
+            for span in nodes
+        ]
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1_000_000),
+                "dur": round((span.end - span.start) * 1_000_000),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attrs,
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"run_id": self.run_id}}
+
+    def to_otlp(self) -> Dict[str, Any]:
+        def attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+            converted = []
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    typed = {"boolValue": value}
+                elif isinstance(value, int):
+                    typed = {"intValue": str(value)}
+                elif isinstance(value, float):
+                    typed = {"doubleValue": value}
+                else:
+                    typed = {"stringValue": value if isinstance(value, str) else json.dumps(value, default=str)}
+                converted.append({"key": key, "value": typed})
+            return converted
+
+        spans = [
+            {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(round(span.start * 1e9)),
+                "endTimeUnixNano": str(round(span.end * 1e9)),
+                "attributes": attributes({"category": span.category, **span.attrs}),
+            }
+            for span in self.spans
+        ]
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": attributes(
+                            {"service.name": "aws-customer-intel-orchestrator", "run.id": self.run_id}
+                        )
+                    },
+                    "scopeSpans": [{"scope": {"name": "orchestrator"}, "spans": spans}],
+                }
+            ]
+        }
+
+    def write(self, directory: str, fmt: str = "chrome") -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.run_id}.{fmt}.json")
+        document = self.to_otlp() if fmt == "otlp" else self.to_chrome_trace()
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, default=str)
+        return path
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _tracer.get()
+
+
+def activate(tracer: Tracer):
+    return _tracer.set(tracer)
+
+
+def deactivate(token) -> None:
+    _tracer.reset(token)
+
+
+def span(name: str, category: str, **attrs: Any):
+    tracer = _tracer.get()
+    if tracer is None:
+        return NULL_SPAN
+    return tracer.span(name, category, **attrs)
+
+
+def annotate(**attrs: Any) -> None:
+    """Attach attributes to the innermost open span, if any."""
+
+    active = _active_span.get()
+    if active is not None:
+        active.set(**attrs)
+
+
+class TracingHooks(HookProvider):
+    """Records agent invocations, model turns and tool calls as spans."""
+
+    def __init__(self, tracer: Tracer) -> None:
+        self.tracer = tracer
+        self._invocation: Optional[Span] = None
+        self._turn: Optional[Span] = None
+        self._last_turn: Optional[Span] = None
+        self._tokens_seen: Dict[str, int] = {}
+        self._invocation_start: Dict[str, int] = {}
+        self._tools: Dict[str, Span] = {}
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeInvocationEvent, self._before_invocation)
+        registry.add_callback(AfterInvocationEvent, self._after_invocation)
+        registry.add_callback(BeforeModelCallEvent, self._before_model)
+        registry.add_callback(AfterModelCallEvent, self._after_model)
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+        registry.add_callback(AfterToolCallEvent, self._after_tool)
+
+    def _usage(self, agent: Any) -> Dict[str, int]:
+        usage = agent.event_loop_metrics.accumulated_usage
+        return {key: usage.get(key, 0) for key in ("inputTokens", "outputTokens", "totalTokens")}
+
+    def _settle_last_turn(self, agent: Any) -> None:
+        # Strands updates usage after AfterModelCallEvent, so the previous turn's
+        # token counts are attributed when the next turn or the invocation ends.
+        usage = self._usage(agent)
+        if self._last_turn is not None:
+            self._last_turn.set(**{key: usage[key] - self._tokens_seen.get(key, 0) for key in usage})
+            self._last_turn = None
+        self._tokens_seen = usage
+
+    def _before_invocation(self, event: BeforeInvocationEvent) -> None:
+        self._tokens_seen = self._invocation_start = self._usage(event.agent)
+        self._invocation = self.tracer.span(event.agent.name, "agent").open()
+
+    def _after_invocation(self, event: AfterInvocationEvent) -> None:
+        self._settle_last_turn(event.agent)
+        if self._invocation is not None:
+            usage = self._usage(event.agent)
+            self._invocation.set(**{key: usage[key] - self._invocation_start.get(key, 0) for key in usage}).close()
+            self._invocation = None
+
+    def _before_model(self, event: BeforeModelCallEvent) -> None:
+        self._settle_last_turn(event.agent)
+        self._turn = self.tracer.span(f"{event.agent.name}.model", "model").open()
+
+    def _after_model(self, event: AfterModelCallEvent) -> None:
+        if self._turn is None:
+            return
+        if event.stop_response is not None:
+            self._turn.set(stop_reason=str(event.stop_response.stop_reason))
+        self._turn.close(event.exception)
+        self._last_turn, self._turn = self._turn, None
+
+    def _before_tool(self, event: BeforeToolCallEvent) -> None:
+        tool_use = event.tool_use
+        self._tools[tool_use["toolUseId"]] = self.tracer.span(tool_use["name"], "tool").open()
+
+    def _after_tool(self, event: AfterToolCallEvent) -> None:
+        tool_span = self._tools.pop(event.tool_use["toolUseId"], None)
+        if tool_span is not None:
+            tool_span.set(status=event.result.get("status")).close(event.exception)
+
+
+def tracing_hooks() -> List[HookProvider]:
+    """Agent hooks for the active tracer; empty when tracing is off."""
+
+    tracer = _tracer.get()
+    return [TracingHooks(tracer)] if tracer is not None else []
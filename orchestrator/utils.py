@@ -1,11 +1,19 @@
 """Utility helpers for prompt loading and JSON handling."""
 
+import functools
 import json
 import os
+import uuid
 from datetime import datetime
 from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src"}
+# Second-level labels under which country-code registrations sit (example.co.uk).
+SECOND_LEVEL_LABELS = {"ac", "co", "com", "edu", "gov", "net", "org"}
 
+
+@functools.lru_cache(maxsize=None)
 def load_prompt(path: str) -> str:
     with open(path, "r", encoding="utf-8") as handle:
         return handle.read()
@@ -42,5 +50,54 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def atomic_write_text(path: str, text: str) -> None:
+    """Write ``text`` to ``path`` so readers never see a partial file."""
+
+    ensure_dir(os.path.dirname(path) or ".")
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
 def utc_timestamp() -> str:
     return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings compare equal.
+
+    Lowercases scheme and host, drops default ports, fragments, trailing slashes
+    and tracking parameters, and sorts the remaining query parameters.
+    """
+
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in {("http", 80), ("https", 443)}:
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def registered_domain(url: str) -> str:
+    """The registrable domain of ``url``'s host (``shop.example.co.uk`` -> ``example.co.uk``).
+
+    A heuristic without a public-suffix list: two labels, or three when the
+    second-level label is a common one under a country-code TLD.
+    """
+
+    host = urlsplit(url if "://" in url else f"https://{url}").hostname or ""
+    labels = host.lower().rstrip(".").split(".")
+    keep = 3 if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_LABELS else 2
+    return ".".join(labels[-keep:])
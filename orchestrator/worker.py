@@ -0,0 +1,375 @@
+"""Sharded execution of queued workflows across processes and hosts.
+
+``MasterInput`` jobs are enqueued in a SQLite work queue (``WORKER_QUEUE_PATH``)
+that every worker opens, on one host or on a shared filesystem with working
+POSIX locks. The queue uses SQLite's rollback journal by default
+(``WORKER_QUEUE_JOURNAL_MODE=delete``); WAL needs shared memory between the
+processes and is only safe when every worker runs on the same host. A worker claims a job by taking a lease on it in an ``IMMEDIATE``
+transaction, so two workers never hold the same job. It runs the workflow in
+one of its worker processes, which keeps the JSON-heavy stages of parallel
+runs off a single interpreter's GIL, and renews the lease while the job runs.
+
+A worker that crashes stops renewing. Its leases expire after
+``WORKER_LEASE_SECONDS`` and another worker claims the jobs again; the job ID
+is the run ID, so the retry resumes from the run's checkpoint when
+``CHECKPOINT_DIR`` is shared. Status is only written back by the lease holder,
+so a worker that lost its lease cannot overwrite the result of the worker
+that took the job over. A job is attempted at most ``WORKER_MAX_ATTEMPTS``
+times.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO
+
+from orchestrator.artifacts import write_json
+from orchestrator.batch import percentile
+from orchestrator.checkpoint import CheckpointStore
+from orchestrator.config import AppConfig, load_config
+from orchestrator.workflow import run_workflow
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, lease_expires, created_at);
+"""
+
+STATUSES = ("queued", "running", "completed", "failed")
+# Rollback-journal modes work over network filesystems; "wal" is single-host only.
+JOURNAL_MODES = ("delete", "truncate", "persist", "wal")
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobQueue:
+    def __init__(self, path: str, lease_seconds: float, max_attempts: int, journal_mode: str = "delete") -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        if journal_mode.lower() not in JOURNAL_MODES:
+            raise ValueError(f"Unsupported queue journal mode {journal_mode!r}")
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode.upper()}")
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, payloads: Iterable[Dict[str, Any]], job_ids: Optional[Iterable[str]] = None) -> List[str]:
+        """Queue one job per payload; an ID that is already queued is left as it is."""
+
+        ids = iter(job_ids or ())
+        now = time.time()
+        queued = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for payload in payloads:
+                    job_id = next(ids, None) or uuid.uuid4().hex
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO jobs (id, payload, status, created_at, updated_at)"
+                        " VALUES (?, ?, 'queued', ?, ?)",
+                        (job_id, json.dumps(payload), now, now),
+                    )
+                    queued.append(job_id)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return queued
+
+    def claim(self, owner: str) -> Optional[Job]:
+        """Lease the oldest queued (or abandoned) job to ``owner``; None when there is none."""
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Abandoned jobs that used up their attempts will not be retried.
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', lease_owner = NULL, updated_at = ?,"
+                    " error = COALESCE(error, 'lease expired') WHERE status = 'running'"
+                    " AND lease_expires < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, payload, attempts FROM jobs WHERE status = 'queued'"
+                    " OR (status = 'running' AND lease_expires < ?) ORDER BY created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?,"
+                        " lease_expires = ?, updated_at = ? WHERE id = ?",
+                        (owner, now + self.lease_seconds, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return Job(id=row[0], payload=json.loads(row[1]), attempts=row[2] + 1)
+
+    def _update_leased(self, job_id: str, owner: str, assignments: str, values: tuple) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (*values, time.time(), job_id, owner),
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, job_id: str, owner: str) -> bool:
+        """Extend ``owner``'s lease; False when the lease was lost to another worker."""
+
+        return self._update_leased(job_id, owner, "lease_expires = ?", (time.time() + self.lease_seconds,))
+
+    def complete(self, job_id: str, owner: str, status: str, result_path: Optional[str] = None) -> bool:
+        return self._update_leased(
+            job_id, owner, "status = ?, result_path = ?, error = NULL, lease_owner = NULL", (status, result_path)
+        )
+
+    def fail(self, job_id: str, owner: str, error: str, attempts: int) -> bool:
+        """Record an error; the job is queued again until it runs out of attempts."""
+
+        status = "failed" if attempts >= self.max_attempts else "queued"
+        return self._update_leased(job_id, owner, "status = ?, error = ?, lease_owner = NULL", (status, error))
+
+    def release(self, job_id: str, owner: str) -> bool:
+        """Hand a job back without using up an attempt (worker shutdown)."""
+
+        return self._update_leased(
+            job_id, owner, "status = 'queued', attempts = attempts - 1, lease_owner = NULL", ()
+        )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in STATUSES} | dict(rows)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, status, attempts, lease_owner, lease_expires, result_path, error FROM jobs WHERE id = ?",
+                (job_id,),
+            )
+            row = cursor.fetchone()
+        return dict(zip([column[0] for column in cursor.description], row)) if row else None
+
+
+def open_queue(config: AppConfig) -> JobQueue:
+    return JobQueue(
+        config.worker_queue_path,
+        config.worker_lease_seconds,
+        config.worker_max_attempts,
+        journal_mode=config.worker_queue_journal_mode,
+    )
+
+
+def _run_job(job_id: str, payload: Dict[str, Any], trace: Optional[bool]) -> Dict[str, Any]:
+    """Runs in a worker process: one workflow, its output written as an artifact."""
+
+    config = load_config()
+    resume = config.checkpoint_enabled and CheckpointStore(config.checkpoint_dir).load(job_id) is not None
+    started = time.perf_counter()
+    result = run_workflow(None if resume else payload, trace=trace, run_id=job_id, resume=resume)
+    path = write_json(config, os.path.join(config.worker_result_dir, f"{job_id}.json"), result)
+    return {
+        "status": result["status"].value,
+        "result_path": path,
+        "resumed": resume,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+class _Heartbeat(threading.Thread):
+    """Renews the leases of in-flight jobs every third of the lease period."""
+
+    def __init__(self, queue: JobQueue, owner: str, in_flight: Dict[Future, Job]) -> None:
+        super().__init__(name="worker-heartbeat", daemon=True)
+        self.queue = queue
+        self.owner = owner
+        self.in_flight = in_flight
+        self.lost: Set[str] = set()
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.queue.lease_seconds / 3):
+            for job in list(self.in_flight.values()):
+                if job.id not in self.lost and not self.queue.renew(job.id, self.owner):
+                    self.lost.add(job.id)
+
+
+def run_worker(
+    config: Optional[AppConfig] = None,
+    processes: Optional[int] = None,
+    exit_when_empty: bool = False,
+    max_jobs: Optional[int] = None,
+    trace: Optional[bool] = None,
+    log: Optional[TextIO] = None,
+) -> Dict[str, Any]:
+    """Claim and run jobs until stopped (or, with ``exit_when_empty``, until none are claimable)."""
+
+    config = config or load_config()
+    processes = processes or config.worker_processes
+    queue = open_queue(config)
+    owner = worker_id()
+    in_flight: Dict[Future, Job] = {}
+    heartbeat = _Heartbeat(queue, owner, in_flight)
+    # Spawned, not forked: the parent holds threads and a SQLite connection.
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=processes, mp_context=context)
+    latencies: List[float] = []
+    counters = {"claimed": 0, "completed": 0, "failed": 0, "retried": 0, "lost": 0, "resumed": 0}
+
+    def record(job: Job, outcome: str, **fields: Any) -> None:
+        if log is not None:
+            log.write(json.dumps({"job_id": job.id, "worker": owner, "outcome": outcome, **fields}) + "\n")
+            log.flush()
+
+    def finish(future: Future, job: Job) -> None:
+        if job.id in heartbeat.lost:
+            counters["lost"] += 1
+            heartbeat.lost.discard(job.id)
+            record(job, "lost")
+            return
+        try:
+            outcome = future.result()
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            queue.fail(job.id, owner, error, job.attempts)
+            counters["failed" if job.attempts >= queue.max_attempts else "retried"] += 1
+            record(job, "error", error=error, attempts=job.attempts)
+            return
+        counters["resumed"] += int(outcome["resumed"])
+        latencies.append(outcome["elapsed_seconds"])
+        if outcome["status"] == "completed":
+            queue.complete(job.id, owner, "completed", outcome["result_path"])
+            counters["completed"] += 1
+        else:
+            # The run's checkpoint is kept, so a retry continues where it stopped.
+            queue.fail(job.id, owner, f"workflow {outcome['status']}", job.attempts)
+            counters["failed" if job.attempts >= queue.max_attempts else "retried"] += 1
+        record(job, outcome["status"], attempts=job.attempts, **outcome)
+
+    started = time.perf_counter()
+    heartbeat.start()
+    try:
+        while True:
+            while len(in_flight) < processes and (max_jobs is None or counters["claimed"] < max_jobs):
+                job = queue.claim(owner)
+                if job is None:
+                    break
+                counters["claimed"] += 1
+                in_flight[executor.submit(_run_job, job.id, job.payload, trace)] = job
+            if not in_flight:
+                if exit_when_empty or (max_jobs is not None and counters["claimed"] >= max_jobs):
+                    break
+                time.sleep(config.worker_poll_seconds)
+                continue
+            done, _ = wait(list(in_flight), timeout=config.worker_poll_seconds, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job = in_flight.pop(future)
+                if isinstance(future.exception(), BrokenProcessPool):
+                    # A worker process died; the job counts as an attempt and is retried.
+                    broken = True
+                finish(future, job)
+            if broken:
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(max_workers=processes, mp_context=context)
+    finally:
+        heartbeat.stopped.set()
+        for job in in_flight.values():
+            queue.release(job.id, owner)
+        executor.shutdown(wait=False, cancel_futures=True)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "worker": owner,
+        **counters,
+        "elapsed_seconds": round(elapsed, 3),
+        "runs_per_minute": round(len(latencies) / elapsed * 60, 2) if elapsed else 0.0,
+        "latency_p50_seconds": percentile(latencies, 50),
+        "latency_p95_seconds": percentile(latencies, 95),
+        "queue": queue.counts(),
+    }
+
+
+def _read_payloads(path: str) -> List[Dict[str, Any]]:
+    source = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        return [json.loads(line) for line in source if line.strip()]
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="aws-intel-worker", description="Shared work queue for workflow runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Queue one job per MasterInput JSONL record")
+    enqueue.add_argument("input", help="JSONL file ('-' for stdin)")
+
+    work = commands.add_parser("run", help="Claim and run queued jobs")
+    work.add_argument("--processes", type=int, help="Worker processes (default: WORKER_PROCESSES)")
+    work.add_argument("--exit-when-empty", action="store_true", help="Stop once no job can be claimed")
+    work.add_argument("--max-jobs", type=int, help="Stop after claiming this many jobs")
+    work.add_argument("--trace", action="store_true", help="Record spans and write a trace file per run")
+
+    status = commands.add_parser("status", help="Show queue counts, or one job")
+    status.add_argument("job_id", nargs="?")
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.command == "enqueue":
+        job_ids = open_queue(config).enqueue(_read_payloads(args.input))
+        print(json.dumps({"queued": len(job_ids), "job_ids": job_ids}, indent=2))
+    elif args.command == "run":
+        summary = run_worker(
+            config,
+            processes=args.processes,
+            exit_when_empty=args.exit_when_empty,
+            max_jobs=args.max_jobs,
+            trace=args.trace or None,
+            log=sys.stdout,
+        )
+        print(json.dumps(summary, indent=2), file=sys.stderr)
+    else:
+        queue = open_queue(config)
+        print(json.dumps(queue.get(args.job_id) if args.job_id else queue.counts(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
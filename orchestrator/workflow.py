@@ -1,13 +1,33 @@
 """Strands graph orchestration for the customer intelligence workflow."""
 
-from typing import Any, Dict, Tuple
+import asyncio
+import contextvars
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from strands.multiagent import GraphBuilder
 from strands.multiagent.base import Status
 from strands.multiagent.graph import GraphState
 
+from orchestrator.blobs import BlobStore, activate_store, deactivate_store, maybe_collect_blob_dirs, run_blob_dir
+from orchestrator.budget import RunBudget, activate_budget, deactivate_budget
+from orchestrator.checkpoint import (
+    CheckpointHooks,
+    CheckpointStore,
+    activate_run,
+    deactivate_run,
+    restore,
+)
+from orchestrator.config import load_config
 from orchestrator.context import WorkflowContext
 from orchestrator.graph_nodes import FunctionNode
+from orchestrator.memo import MemoStore, NodeInputs, NodeMemo, begin_run, end_run
+from orchestrator.speculation import VERIFICATION_NODE, Speculation, activate_speculation, deactivate_speculation
+from orchestrator.tools.compaction import SeenContent, activate_compaction, deactivate_compaction
+from orchestrator.tools.http_client import aclose_clients
+from orchestrator.tools.sources import activate_sources, deactivate_sources, new_registry
+from orchestrator.tracing import Tracer, activate, deactivate
 from orchestrator.workflow_nodes import (
     artifact_node,
     domain_verification_node,
@@ -21,6 +41,70 @@ from orchestrator.workflow_nodes import (
 )
 
 
+# Graph-wide timeout for runs without a time budget.
+EXECUTION_TIMEOUT = 3600
+
+# What each node reads, for memoization. The artifact node writes files and is
+# never memoized.
+NODE_INPUTS = {
+    "input_validation": NodeInputs(include_task=True),
+    "domain_verification": NodeInputs(
+        context_keys=("input",),
+        config_fields=("tavily_base_url", "tavily_extract_path"),
+        upstream=("input_validation",),
+    ),
+    "perplexity_handoff": NodeInputs(
+        context_keys=("domain_verification",),
+        prompts=("prompts/PERPLEXITY_AGENT.md",),
+        config_fields=("perplexity_model", "perplexity_mode"),
+        upstream=("domain_verification",),
+    ),
+    "tavily_handoff": NodeInputs(
+        context_keys=("domain_verification",),
+        prompts=("prompts/TAVILY_AGENT.md",),
+        config_fields=("tavily_base_url", "tavily_search_path", "tavily_extract_path"),
+        upstream=("domain_verification",),
+    ),
+    "integration": NodeInputs(
+        context_keys=("perplexity_report", "tavily_report"),
+        upstream=("perplexity_handoff", "tavily_handoff"),
+    ),
+    "gap_fill": NodeInputs(
+        context_keys=("completeness", "domain_verification", "perplexity_report", "tavily_report"),
+        config_fields=(
+            "tavily_base_url",
+            "tavily_search_path",
+            "gap_fill_deadline",
+            "gap_fill_max_queries",
+            "gap_fill_results_per_query",
+        ),
+        upstream=("integration",),
+    ),
+    "synthesis": NodeInputs(
+        context_keys=("domain_verification", "perplexity_report", "tavily_report", "completeness", "gap_fill_notes"),
+        upstream=("gap_fill",),
+    ),
+    "final_validation": NodeInputs(context_keys=("report_model",), upstream=("synthesis",)),
+}
+
+# Speculative research branches start before verification has written its
+# record, so they are keyed on what their prediction is made from.
+SPECULATIVE_NODE_INPUTS = {
+    "perplexity_handoff": NodeInputs(
+        context_keys=("input",),
+        prompts=("prompts/PERPLEXITY_AGENT.md",),
+        config_fields=("perplexity_model", "perplexity_mode"),
+        upstream=("input_validation",),
+    ),
+    "tavily_handoff": NodeInputs(
+        context_keys=("input",),
+        prompts=("prompts/TAVILY_AGENT.md",),
+        config_fields=("tavily_base_url", "tavily_search_path", "tavily_extract_path"),
+        upstream=("input_validation",),
+    ),
+}
+
+
 def all_dependencies_complete(required_nodes: list[str]):
     def check_all_complete(state: GraphState) -> bool:
         return all(
@@ -31,23 +115,34 @@ def all_dependencies_complete(required_nodes: list[str]):
     return check_all_complete
 
 
-def build_workflow() -> Tuple[Any, WorkflowContext]:
+def build_workflow(node_concurrency: Optional[Dict[str, int]] = None) -> Tuple[Any, WorkflowContext]:
     context = WorkflowContext()
     builder = GraphBuilder()
 
-    builder.add_node(FunctionNode(input_validation_node, "input_validation", context), "input_validation")
-    builder.add_node(FunctionNode(domain_verification_node, "domain_verification", context), "domain_verification")
-    builder.add_node(FunctionNode(perplexity_handoff_node, "perplexity_handoff", context), "perplexity_handoff")
-    builder.add_node(FunctionNode(tavily_handoff_node, "tavily_handoff", context), "tavily_handoff")
-    builder.add_node(FunctionNode(integration_node, "integration", context), "integration")
-    builder.add_node(FunctionNode(gap_fill_node, "gap_fill", context), "gap_fill")
-    builder.add_node(FunctionNode(synthesis_node, "synthesis", context), "synthesis")
-    builder.add_node(FunctionNode(final_validation_node, "final_validation", context), "final_validation")
-    builder.add_node(FunctionNode(artifact_node, "artifact", context), "artifact")
+    config = load_config()
+    limits = {**config.node_concurrency, **(node_concurrency or {})}
+    memo_store = MemoStore(config.memo_dir, config.memo_ttl) if config.memo_enabled else None
+    node_inputs = {**NODE_INPUTS, **SPECULATIVE_NODE_INPUTS} if config.speculative_research else NODE_INPUTS
+
+    def add(func, name: str) -> None:
+        memo = NodeMemo(memo_store, name, func, node_inputs[name]) if memo_store and name in node_inputs else None
+        builder.add_node(FunctionNode(func, name, context, max_concurrency=limits.get(name), memo=memo), name)
+
+    add(input_validation_node, "input_validation")
+    add(domain_verification_node, "domain_verification")
+    add(perplexity_handoff_node, "perplexity_handoff")
+    add(tavily_handoff_node, "tavily_handoff")
+    add(integration_node, "integration")
+    add(gap_fill_node, "gap_fill")
+    add(synthesis_node, "synthesis")
+    add(final_validation_node, "final_validation")
+    add(artifact_node, "artifact")
 
     builder.add_edge("input_validation", "domain_verification")
-    builder.add_edge("domain_verification", "perplexity_handoff")
-    builder.add_edge("domain_verification", "tavily_handoff")
+    # Speculative branches start alongside verification and wait for it themselves.
+    research_source = "input_validation" if config.speculative_research else "domain_verification"
+    builder.add_edge(research_source, "perplexity_handoff")
+    builder.add_edge(research_source, "tavily_handoff")
 
     condition = all_dependencies_complete(["perplexity_handoff", "tavily_handoff"])
     builder.add_edge("perplexity_handoff", "integration", condition=condition)
@@ -59,12 +154,158 @@ def build_workflow() -> Tuple[Any, WorkflowContext]:
     builder.add_edge("final_validation", "artifact")
 
     builder.set_entry_point("input_validation")
-    builder.set_execution_timeout(3600)
+    builder.set_execution_timeout(EXECUTION_TIMEOUT)
+    builder.set_hook_providers([CheckpointHooks(context)])
 
     return builder.build(), context
 
 
-def run_workflow(input_payload: Dict[str, Any]) -> Dict[str, Any]:
-    graph, context = build_workflow()
-    result = graph(input_payload)
-    return {"status": result.status, "context": context.data}
+class WorkflowPool:
+    """Keeps built graphs warm for reuse by long-lived processes.
+
+    A graph resets its own state on every invocation, so a released graph can
+    be handed to the next run once its context is cleared. Each graph serves
+    one run at a time.
+    """
+
+    def __init__(self, node_concurrency: Optional[Dict[str, int]] = None, size: int = 0) -> None:
+        self.node_concurrency = node_concurrency
+        self._idle = [build_workflow(node_concurrency) for _ in range(size)]
+
+    def acquire(self) -> Tuple[Any, WorkflowContext]:
+        if self._idle:
+            graph, context = self._idle.pop()
+            context.data.clear()
+            context.node_results.clear()
+            return graph, context
+        return build_workflow(self.node_concurrency)
+
+    def release(self, graph: Any, context: WorkflowContext) -> None:
+        self._idle.append((graph, context))
+
+
+def node_timings(result: Any) -> List[Dict[str, Any]]:
+    """Per-node timing table from a graph result, in execution order."""
+
+    return [
+        {
+            "node": node.node_id,
+            "status": result.results[node.node_id].status.value,
+            "duration_ms": result.results[node.node_id].execution_time,
+        }
+        for node in result.execution_order
+    ]
+
+
+async def run_workflow_async(
+    input_payload: Optional[Dict[str, Any]],
+    node_concurrency: Optional[Dict[str, int]] = None,
+    pool: Optional[WorkflowPool] = None,
+    trace: Optional[bool] = None,
+    run_id: Optional[str] = None,
+    resume: bool = False,
+) -> Dict[str, Any]:
+    """Run the workflow, or with ``resume`` continue ``run_id`` from its checkpoint."""
+
+    config = load_config()
+    store = CheckpointStore(config.checkpoint_dir)
+    saved = None
+    if resume:
+        saved = store.load(run_id) if run_id else None
+        if saved is None:
+            raise ValueError(f"No checkpoint found for run {run_id!r}")
+        input_payload = saved["input"]
+    run_id = run_id or uuid.uuid4().hex
+
+    tracer = Tracer(run_id) if (config.trace_enabled if trace is None else trace) else None
+    token = activate(tracer) if tracer is not None else None
+    run_token = activate_run(store, run_id, input_payload) if config.checkpoint_enabled else None
+    memo_token = begin_run()
+    await asyncio.to_thread(maybe_collect_blob_dirs, config.blob_dir, config.checkpoint_dir, config.blob_ttl)
+    blobs = BlobStore(run_blob_dir(config.blob_dir, run_id), config.blob_memory_budget, config.blob_min_bytes)
+    blob_token = activate_store(blobs)
+    budget = RunBudget.from_input(config, input_payload or {}) if config.budget_enabled else None
+    budget_token = activate_budget(budget) if budget is not None else None
+    speculation = Speculation() if config.speculative_research else None
+    speculation_token = activate_speculation(speculation) if speculation is not None else None
+    compaction = SeenContent()
+    compaction_token = activate_compaction(compaction)
+    sources = new_registry(config) if config.source_registry_enabled else None
+    sources_token = activate_sources(sources) if sources is not None else None
+    if speculation is not None and saved is not None and VERIFICATION_NODE in saved.get("context", {}):
+        speculation.verified.set()
+    graph, context = pool.acquire() if pool is not None else build_workflow(node_concurrency)
+    graph.execution_timeout = budget.total_seconds + config.budget_grace_seconds if budget else EXECUTION_TIMEOUT
+    try:
+        if saved is not None:
+            restore(graph, context, saved)
+        context.set("run_id", run_id)
+        result = await graph.invoke_async(input_payload)
+        output = {
+            "run_id": run_id,
+            "status": result.status,
+            # A pooled context is cleared on reuse, so hand back a detached copy.
+            "context": dict(context.data) if pool is not None else context.data,
+            "timings": node_timings(result),
+        }
+        if budget is not None:
+            output["budget"] = budget.summary()
+        if speculation is not None:
+            output["speculation"] = speculation.summary()
+        output["compaction"] = compaction.summary()
+        if sources is not None:
+            output["sources"] = sources.stats()
+        if result.status == Status.COMPLETED:
+            store.delete(run_id)
+            blobs.release_persisted()
+    finally:
+        if sources_token is not None:
+            deactivate_sources(sources_token)
+        deactivate_compaction(compaction_token)
+        if speculation_token is not None:
+            deactivate_speculation(speculation_token)
+        if budget_token is not None:
+            deactivate_budget(budget_token)
+        deactivate_store(blob_token)
+        end_run(memo_token)
+        if run_token is not None:
+            deactivate_run(run_token)
+        if token is not None:
+            deactivate(token)
+        if pool is not None:
+            pool.release(graph, context)
+        if tracer is not None:
+            trace_path = tracer.write(config.trace_dir, config.trace_format)
+
+    if tracer is not None:
+        output["timings"] = tracer.node_timings()
+        output["trace_path"] = trace_path
+    return output
+
+
+def run_workflow(
+    input_payload: Optional[Dict[str, Any]],
+    trace: Optional[bool] = None,
+    run_id: Optional[str] = None,
+    resume: bool = False,
+) -> Dict[str, Any]:
+    """Blocking wrapper around ``run_workflow_async``.
+
+    Called from inside a running event loop (a notebook, an async service),
+    the workflow runs on its own loop in a helper thread and this call blocks
+    until it finishes; async callers should await ``run_workflow_async``.
+    """
+
+    async def run() -> Dict[str, Any]:
+        try:
+            return await run_workflow_async(input_payload, trace=trace, run_id=run_id, resume=resume)
+        finally:
+            await aclose_clients()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    call_context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-workflow") as executor:
+        return executor.submit(call_context.run, asyncio.run, run()).result()
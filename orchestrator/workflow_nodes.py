@@ -1,16 +1,26 @@
 """Workflow node implementations for the graph orchestration."""
 
+import asyncio
 import json
-from typing import Any, Dict
+import re
+import uuid
+from typing import Any, Dict, Optional
 
-from orchestrator.agents.perplexity_agent import run_perplexity_agent
+from orchestrator.agents.perplexity_agent import PERPLEXITY_REQUIRED_KEYS, run_perplexity_research
 from orchestrator.agents.tavily_agent import run_tavily_agent
+from orchestrator.artifacts import write_json_async, write_text_async
+from orchestrator.blobs import offload
+from orchestrator.budget import mark_partial
 from orchestrator.config import load_config
 from orchestrator.context import WorkflowContext
-from orchestrator.report import render_html_report
+from orchestrator.gap_fill import fill_gaps, merge_gap_fill, plan_gap_queries
+from orchestrator.report import iter_html_report
 from orchestrator.schemas import MasterInput, validate_required_keys
-from orchestrator.tools.tavily import tavily_extract, tavily_search
-from orchestrator.utils import ensure_dir, utc_timestamp
+from orchestrator.speculation import research_branch
+from orchestrator.tools.case_index import index_case_studies
+from orchestrator.tools.sources import SourceRegistry, current_sources
+from orchestrator.tools.tavily import tavily_extract_async
+from orchestrator.utils import utc_timestamp
 
 
 def input_validation_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
@@ -20,7 +30,20 @@ def input_validation_node(task: Any, context: WorkflowContext) -> Dict[str, Any]
     return {"validated_input": validated.model_dump()}
 
 
-def domain_verification_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
+def _predicted_identity(validated_input: Dict[str, Any]) -> Dict[str, Any]:
+    """The verification fields the research handoffs read, as known before verification."""
+
+    return {
+        "target_domain": validated_input.get("target_domain"),
+        "official_company_name": validated_input.get("company_name_hint") or "Unknown",
+        "industry_preliminary": "Unknown",
+        "disambiguation_required": False,
+        "similar_companies": [],
+        "exclusion_list": [],
+    }
+
+
+async def domain_verification_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
     config = load_config()
     validated_input = context.get("input", {})
     target_domain = validated_input.get("target_domain")
@@ -29,21 +52,16 @@ def domain_verification_node(task: Any, context: WorkflowContext) -> Dict[str, A
     if not url.startswith("http"):
         url = f"https://{target_domain}"
 
-    extract_result = tavily_extract(config=config, url=url)
+    extract_result = await tavily_extract_async(config=config, url=url)
 
     record = {
-        "target_domain": target_domain,
+        **_predicted_identity(validated_input),
         "domain_accessible": bool(extract_result.get("ok")),
-        "official_company_name": validated_input.get("company_name_hint") or "Unknown",
         "business_description": "Unknown",
         "headquarters": "Unknown",
-        "industry_preliminary": "Unknown",
-        "disambiguation_required": False,
-        "similar_companies": [],
-        "exclusion_list": [],
         "validation_confidence": "LOW" if not extract_result.get("ok") else "MEDIUM",
         "validation_timestamp": utc_timestamp(),
-        "raw_extract": extract_result,
+        "raw_extract": offload(extract_result),
     }
 
     scope = {
@@ -60,8 +78,7 @@ def domain_verification_node(task: Any, context: WorkflowContext) -> Dict[str, A
     return {"domain_verification": record, "research_scope": scope}
 
 
-def perplexity_handoff_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
-    domain_verification = context.get("domain_verification", {})
+def _run_perplexity_branch(domain_verification: Dict[str, Any]) -> Dict[str, Any]:
     handoff = {
         "agent": "Perplexity Sonar",
         "task": "General Business Intelligence Research",
@@ -87,13 +104,22 @@ def perplexity_handoff_node(task: Any, context: WorkflowContext) -> Dict[str, An
         ],
     }
 
-    result = run_perplexity_agent(handoff)
-    context.set("perplexity_report", result)
-    return {"perplexity_report": result}
+    return run_perplexity_research(handoff)
 
 
-def tavily_handoff_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
-    domain_verification = context.get("domain_verification", {})
+async def perplexity_handoff_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
+    predicted = _predicted_identity(context.get("input", {}))
+    _, result = await research_branch(context, predicted, _run_perplexity_branch)
+    context.set_blob("perplexity_report", result)
+    return {"perplexity_report": context.get_ref("perplexity_report")}
+
+
+def _known_industry(domain_verification: Dict[str, Any]) -> Optional[str]:
+    industry = domain_verification.get("industry_preliminary")
+    return None if industry in (None, "", "Unknown") else industry
+
+
+def _run_tavily_branch(domain_verification: Dict[str, Any]) -> Dict[str, Any]:
     handoff = {
         "agent": "Tavily",
         "task": "AWS Case Study & Technical Intelligence Research",
@@ -118,18 +144,24 @@ def tavily_handoff_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
         ],
     }
 
-    result = run_tavily_agent(handoff)
-    context.set("tavily_report", result)
-    return {"tavily_report": result}
+    return run_tavily_agent(handoff)
+
+
+async def tavily_handoff_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
+    predicted = _predicted_identity(context.get("input", {}))
+    domain_verification, result = await research_branch(context, predicted, _run_tavily_branch)
+    await asyncio.to_thread(
+        index_case_studies, load_config(), result.get("aws_case_studies"), industry=_known_industry(domain_verification)
+    )
+    context.set_blob("tavily_report", result)
+    return {"tavily_report": context.get_ref("tavily_report")}
 
 
 def integration_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
     perplexity_report = context.get("perplexity_report", {})
     tavily_report = context.get("tavily_report", {})
 
-    perplexity_validation = validate_required_keys(
-        perplexity_report, ["research_metadata", "company_identity", "business_model"]
-    )
+    perplexity_validation = validate_required_keys(perplexity_report, PERPLEXITY_REQUIRED_KEYS)
     tavily_validation = validate_required_keys(
         tavily_report, ["research_metadata", "aws_case_studies", "industry_classification"]
     )
@@ -141,6 +173,7 @@ def integration_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
         "technical_intelligence": "Partial",
         "overall_confidence": "MEDIUM",
     }
+    completeness = mark_partial(completeness)
 
     context.set("completeness", completeness)
     return {
@@ -150,25 +183,36 @@ def integration_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
     }
 
 
-def gap_fill_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
+async def gap_fill_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
     config = load_config()
-    completeness = context.get("completeness", {})
-    notes = []
-
-    if completeness.get("aws_case_studies") != "Complete":
-        query = "AWS case study industry trends"
-        result = tavily_search(config=config, query=query, max_results=5)
-        notes.append({"gap": "aws_case_studies", "supplement": result})
+    completeness = dict(context.get("completeness", {}))
+    industry = _known_industry(context.get("domain_verification", {}))
+    queries = plan_gap_queries(
+        completeness,
+        context.get("domain_verification", {}),
+        context.get("perplexity_report", {}),
+        context.get("tavily_report", {}),
+        industry=industry,
+        max_queries=config.gap_fill_max_queries,
+    )
+    filled = await fill_gaps(config, queries, industry=industry)
 
+    for category, note in filled.items():
+        if note["results"] and completeness.get(category) != "Complete":
+            completeness[category] = "Supplemented"
+    notes = list(filled.values())
+    context.set("completeness", completeness)
     context.set("gap_fill_notes", notes)
-    return {"gap_fill_notes": notes}
+    return {"gap_fill_notes": notes, "completeness": completeness}
 
 
 def synthesis_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
     domain_verification = context.get("domain_verification", {})
     perplexity_report = context.get("perplexity_report", {})
     tavily_report = context.get("tavily_report", {})
-    completeness = context.get("completeness", {})
+    completeness = mark_partial(context.get("completeness", {}))
+    gap_fill_notes = context.get("gap_fill_notes", [])
+    registry = current_sources() or SourceRegistry()
 
     report_model = {
         "report_metadata": {
@@ -179,8 +223,9 @@ def synthesis_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
             "data_completeness": completeness.get("business_intelligence", "Partial"),
         },
         "domain_verification": domain_verification,
-        "perplexity_summary": perplexity_report,
-        "tavily_summary": tavily_report,
+        # Shared by reference; the full reports are only loaded when written out.
+        "perplexity_summary": context.get_ref("perplexity_report", {}),
+        "tavily_summary": context.get_ref("tavily_report", {}),
         "conflict_log": [],
         "report_sections": {
             "executive_summary": "Synthesis pending. Review business intelligence and AWS opportunities.",
@@ -188,17 +233,24 @@ def synthesis_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
                 "description": perplexity_report.get("company_identity", {}).get("description", ""),
             },
             "business_challenges_and_aws_opportunities": tavily_report.get("business_challenges", []),
-            "aws_case_studies": tavily_report.get("aws_case_studies", []),
+            "aws_case_studies": registry.dedupe(tavily_report.get("aws_case_studies", [])),
             "market_competitive_intelligence": perplexity_report.get("market_intelligence", {}),
             "technology_infrastructure": perplexity_report.get("technology_footprint", {}),
             "leadership": perplexity_report.get("leadership_team", []),
             "recent_developments": perplexity_report.get("recent_developments", []),
             "strategic_recommendations": tavily_report.get("aws_recommendations", []),
             "methodology_confidence": completeness,
-            "sources": (perplexity_report.get("sources", []) + tavily_report.get("sources", [])),
+            "sources": registry.ranked_sources(
+                [
+                    ("perplexity", perplexity_report.get("sources", [])),
+                    ("tavily", tavily_report.get("sources", [])),
+                    ("gap_fill", [hit["url"] for note in gap_fill_notes for hit in note.get("results") or []]),
+                ]
+            ),
         },
     }
 
+    merge_gap_fill(report_model, gap_fill_notes, registry)
     context.set("report_model", report_model)
     return {"report_model": report_model}
 
@@ -216,28 +268,22 @@ def final_validation_node(task: Any, context: WorkflowContext) -> Dict[str, Any]
     return {"quality_report": quality_report}
 
 
-def artifact_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
+async def artifact_node(task: Any, context: WorkflowContext) -> Dict[str, Any]:
     config = load_config()
     report_model = context.get("report_model", {})
     quality_report = context.get("quality_report", {})
 
-    ensure_dir(config.report_output_dir)
-
     company = report_model.get("report_metadata", {}).get("validated_company_name", "report")
     safe_company = company.replace(" ", "_")
     timestamp = utc_timestamp().replace(" ", "_").replace(":", "-")
-    html_path = f"{config.report_output_dir}/{safe_company}_{timestamp}.html"
-    json_path = f"{config.report_output_dir}/{safe_company}_{timestamp}.json"
-
-    html = render_html_report(report_model)
-    with open(html_path, "w", encoding="utf-8") as handle:
-        handle.write(html)
-
-    with open(json_path, "w", encoding="utf-8") as handle:
-        json.dump(
-            {"report_model": report_model, "quality_report": quality_report},
-            handle,
-            indent=2,
-        )
+    # Concurrent runs can share a company name and a second; the run ID keeps their files apart.
+    run_id = re.sub(r"[^\w.-]", "_", context.get("run_id") or uuid.uuid4().hex)
+    html_path = f"{config.report_output_dir}/{safe_company}_{timestamp}_{run_id}.html"
+    json_path = f"{config.report_output_dir}/{safe_company}_{timestamp}_{run_id}.json"
+
+    html_path, json_path = await asyncio.gather(
+        write_text_async(config, html_path, iter_html_report(report_model)),
+        write_json_async(config, json_path, {"report_model": report_model, "quality_report": quality_report}),
+    )
 
     return {"html_report": html_path, "json_report": json_path}
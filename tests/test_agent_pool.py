@@ -0,0 +1,18 @@
+from strands import Agent
+
+from benchmarks.fake_model import FakeModel
+from orchestrator.agents.pool import AgentPool
+
+
+def test_returned_agent_is_reset():
+    model = FakeModel("perplexity")
+    pool = AgentPool("perplexity", lambda hooks: Agent(model=model, hooks=[hooks], callback_handler=None), 1)
+    with pool.lease([]) as first:
+        first.state.set("company", "example")
+        first.conversation_manager.removed_message_count = 7
+        first.messages.append({"role": "user", "content": [{"text": "hi"}]})
+    with pool.lease([]) as second:
+        assert second is first
+        assert second.state.get() == {}
+        assert second.conversation_manager.removed_message_count == 0
+        assert second.messages == []
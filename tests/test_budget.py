@@ -0,0 +1,27 @@
+import pytest
+
+from orchestrator.budget import parse_time_limit
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [
+        ("3h", 3 * 3600),
+        ("45 minutes", 45 * 60),
+        ("1h30m", 90 * 60),
+        ("1 hour 30 minutes", 90 * 60),
+        ("1.5 hours", 90 * 60),
+        ("20", 20 * 60),
+        (90, 90 * 60),
+        ("3-4 hours", 4 * 3600),
+        ("3 to 4 h", 4 * 3600),
+        ("2-3", 3 * 60),
+    ],
+)
+def test_parse_time_limit(value, seconds):
+    assert parse_time_limit(value) == seconds
+
+
+@pytest.mark.parametrize("value", [None, "", "abc", "500ms", "3h please", "3 days", "1h30", 0, -5, True])
+def test_parse_time_limit_rejects(value):
+    assert parse_time_limit(value) is None
@@ -0,0 +1,27 @@
+import asyncio
+import dataclasses
+
+from orchestrator import gap_fill
+from orchestrator.config import load_config
+from orchestrator.gap_fill import GapQuery, fill_gaps
+
+
+def test_fill_gaps_classifies_cancelled_and_failed_queries(monkeypatch):
+    async def run_query(config, gap, industry):
+        if gap.query == "slow":
+            await asyncio.sleep(60)
+        if gap.query == "cancelled":
+            raise asyncio.CancelledError()
+        if gap.query == "broken":
+            raise ValueError("boom")
+        return {"ok": True, "data": {"results": [{"url": "https://example.com/a", "title": "A"}]}}
+
+    monkeypatch.setattr(gap_fill, "_run_query", run_query)
+    config = dataclasses.replace(load_config(), gap_fill_deadline=0.1)
+    queries = [GapQuery("industry_analysis", query) for query in ("slow", "cancelled", "broken", "ok")]
+
+    filled = asyncio.run(fill_gaps(config, queries))
+
+    statuses = {entry["query"]: entry["status"] for entry in filled["industry_analysis"]["queries"]}
+    assert statuses == {"slow": "timed_out", "cancelled": "timed_out", "broken": "error", "ok": "network"}
+    assert [hit["url"] for hit in filled["industry_analysis"]["results"]] == ["https://example.com/a"]
@@ -0,0 +1,33 @@
+import time
+
+from orchestrator.worker import JobQueue
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.05, max_attempts=3)
+    [job_id] = queue.enqueue([{"input": "example.com"}])
+
+    first = queue.claim("worker-a")
+    assert first is not None and first.attempts == 1
+    assert queue.claim("worker-b") is None
+
+    time.sleep(0.1)
+    second = queue.claim("worker-b")
+    assert second is not None and second.id == job_id and second.attempts == 2
+
+    # The stale owner can no longer touch the job.
+    assert not queue.renew(job_id, "worker-a")
+    assert not queue.complete(job_id, "worker-a", "completed")
+    assert queue.complete(job_id, "worker-b", "completed", "out.json")
+    assert queue.get(job_id)["status"] == "completed"
+
+
+def test_lease_expiry_after_last_attempt_fails_the_job(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.05, max_attempts=1)
+    [job_id] = queue.enqueue([{"input": "example.com"}])
+    assert queue.claim("worker-a") is not None
+
+    time.sleep(0.1)
+    assert queue.claim("worker-b") is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed" and job["error"] == "lease expired"